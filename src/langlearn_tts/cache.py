@@ -0,0 +1,228 @@
+"""Content-addressed synthesis cache.
+
+Audio is keyed on a stable hash of every field that changes the rendered
+output (text, voice, language, rate, ElevenLabs voice settings, provider
+and model). A hit is therefore always safe to reuse, and changing any
+parameter is always a miss.
+
+Entries live under the cache root as ``<key[:2]>/<key>.mp3``. Output
+files are materialized from entries with a hard link where possible, so
+a cached clip costs no extra disk space in the output directory.
+
+Every store, hit and materialized output is recorded in an
+:class:`~langlearn_tts.index.AudioIndex` next to the entries. A hit
+also bumps the entry's mtime, which all hard links share, so files the
+index does not know about still carry their last access.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import uuid
+from collections.abc import Generator, Sequence
+from contextlib import contextmanager
+from pathlib import Path
+
+from langlearn_tts.index import AudioIndex, EntryMeta
+from langlearn_tts.types import SynthesisRequest, TTSProvider
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "SynthesisCache",
+    "composite_key",
+    "output_filename",
+    "pair_key",
+    "provider_model",
+    "request_key",
+]
+
+# Bump when the key layout or the rendered audio changes, so entries
+# written by older releases are never reused.
+_KEY_VERSION = 1
+
+_STAGING_DIR = ".tmp"
+_INDEX_FILE = "index.db"
+
+
+def _digest(payload: object) -> str:
+    blob = json.dumps(
+        payload, sort_keys=True, ensure_ascii=False, separators=(",", ":")
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def provider_model(provider: TTSProvider) -> str | None:
+    """Return the model a provider synthesizes with, if it has one.
+
+    Polly has no model concept; OpenAI and ElevenLabs keep theirs on the
+    instance (resolved from ``--model`` / ``TTS_MODEL`` at construction).
+    """
+    model = getattr(provider, "_model", None)
+    return model if isinstance(model, str) else None
+
+
+def request_key(request: SynthesisRequest, provider: TTSProvider) -> str:
+    """Stable cache key for a single synthesis request.
+
+    ``request.metadata`` is excluded: it only carries output placement
+    hints, which never change the audio.
+    """
+    return _digest(
+        {
+            "v": _KEY_VERSION,
+            "text": request.text,
+            "voice": request.voice or provider.default_voice,
+            "language": request.language,
+            "rate": request.rate,
+            "stability": request.stability,
+            "similarity": request.similarity,
+            "style": request.style,
+            "speaker_boost": request.speaker_boost,
+            "provider": provider.name,
+            "model": provider_model(provider),
+        }
+    )
+
+
+def composite_key(kind: str, parts: Sequence[str], pause_ms: int) -> str:
+    """Cache key for stitched output built from other cache keys.
+
+    Args:
+        kind: Composite type (e.g. ``"pair"``, ``"batch"``).
+        parts: Ordered keys of the stitched segments.
+        pause_ms: Pause inserted between segments.
+    """
+    return _digest(
+        {"v": _KEY_VERSION, "kind": kind, "parts": list(parts), "pause_ms": pause_ms}
+    )
+
+
+def pair_key(
+    request_1: SynthesisRequest,
+    request_2: SynthesisRequest,
+    provider: TTSProvider,
+    pause_ms: int,
+) -> str:
+    """Cache key for a stitched ``[request_1] [pause] [request_2]`` pair."""
+    return composite_key(
+        "pair",
+        [request_key(request_1, provider), request_key(request_2, provider)],
+        pause_ms,
+    )
+
+
+def output_filename(key: str, prefix: str = "") -> str:
+    """Deterministic output filename for a cache key."""
+    return f"{prefix}{key[:16]}.mp3"
+
+
+def _link_or_copy(source: Path, dest: Path) -> None:
+    """Atomically place ``source`` at ``dest``, preferring a hard link.
+
+    The new file is staged next to ``dest`` and renamed over it, so an
+    existing ``dest`` is replaced rather than truncated. This matters
+    because ``dest`` may itself be a hard link to a cache entry.
+    """
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    staged = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        try:
+            os.link(source, staged)
+        except OSError:
+            shutil.copyfile(source, staged)
+        os.replace(staged, dest)
+    finally:
+        staged.unlink(missing_ok=True)
+
+
+class SynthesisCache:
+    """Directory-backed store of synthesized audio, keyed by request hash."""
+
+    def __init__(self, root: Path) -> None:
+        self._root = root
+        self._index = AudioIndex(root / _INDEX_FILE)
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    @property
+    def index(self) -> AudioIndex:
+        return self._index
+
+    @property
+    def staging_root(self) -> Path:
+        return self._root / _STAGING_DIR
+
+    def path_for(self, key: str) -> Path:
+        """Return where the entry for ``key`` is (or would be) stored."""
+        return self._root / key[:2] / f"{key}.mp3"
+
+    def key_for(self, path: Path) -> str | None:
+        """Return the key of a cache entry path, or None for other files."""
+        key = path.stem
+        if path.suffix == ".mp3" and len(key) == 64 and self.path_for(key) == path:
+            return key
+        return None
+
+    def get(self, key: str) -> Path | None:
+        """Return the entry path for ``key``, or None on a miss."""
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        logger.debug("Cache hit %s", key[:12])
+        self._index.touch(key)
+        return path
+
+    def put(self, key: str, source: Path, meta: EntryMeta | None = None) -> Path:
+        """Move a freshly rendered file into the cache.
+
+        ``source`` is consumed: it is renamed into place, so it should be
+        a staging path from :meth:`staging_path` or :meth:`staging_dir`.
+        ``meta`` describes the audio for the index.
+        """
+        path = self.path_for(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(source, path)
+        logger.info("Cached %s (%d bytes)", path, path.stat().st_size)
+        self._index.record(key, path, meta)
+        return path
+
+    def materialize(self, entry: Path, dest: Path) -> None:
+        """Expose a cache entry at an output path."""
+        if not (dest.exists() and os.path.samefile(entry, dest)):
+            _link_or_copy(entry, dest)
+        key = self.key_for(entry)
+        if key is not None:
+            self._index.record_output(dest, key)
+
+    @contextmanager
+    def staging_path(self) -> Generator[Path]:
+        """Yield a scratch file path on the cache filesystem.
+
+        Rendering into the staging area and then calling :meth:`put`
+        keeps partial files out of the cache and makes ``put`` a rename.
+        """
+        staging = self.staging_root
+        staging.mkdir(parents=True, exist_ok=True)
+        path = staging / f"{uuid.uuid4().hex}.mp3"
+        try:
+            yield path
+        finally:
+            path.unlink(missing_ok=True)
+
+    @contextmanager
+    def staging_dir(self) -> Generator[Path]:
+        """Yield a scratch directory on the cache filesystem."""
+        staging = self.staging_root
+        staging.mkdir(parents=True, exist_ok=True)
+        with tempfile.TemporaryDirectory(dir=staging) as tmp:
+            yield Path(tmp)
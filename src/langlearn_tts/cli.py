@@ -2,21 +2,27 @@
 
 from __future__ import annotations
 
+import csv
 import json
 import logging
 import os
 import platform
 import shutil
 import sys
-from collections.abc import Callable
+import time
+from collections.abc import Callable, Generator, Iterable, Iterator
+from contextlib import contextmanager
 from pathlib import Path
-from typing import cast
+from typing import TextIO, cast
 
 import click
 
-from langlearn_tts.output import default_output_dir
+from langlearn_tts.cache import SynthesisCache, output_filename, pair_key, request_key
+from langlearn_tts.core import TTSClient
+from langlearn_tts.eviction import CacheManager, EvictionPolicy, parse_size
+from langlearn_tts.output import default_cache_dir, default_output_dir
 from langlearn_tts.providers import DEFAULT_VOICES, auto_detect_provider, get_provider
-from punt_vox.core import TTSClient
+from langlearn_tts.voices import wait_for_refreshes
 from punt_vox.types import (
     MergeStrategy,
     SynthesisRequest,
@@ -28,6 +34,9 @@ from punt_vox.types import (
 
 logger = logging.getLogger(__name__)
 
+# How long a command waits at exit for a voice catalog refresh to be saved.
+_VOICE_REFRESH_WAIT_SECONDS = 10.0
+
 _PROVIDER_DISPLAY = {"elevenlabs": "ElevenLabs", "polly": "Polly", "openai": "OpenAI"}
 _VOICE_DEFAULTS = ", ".join(
     f"{DEFAULT_VOICES[k]} ({_PROVIDER_DISPLAY[k]})"
@@ -55,13 +64,34 @@ def _print_result(result: SynthesisResult) -> None:
     _emit(payload, f"{result.path}")
 
 
-def _print_results(results: list[SynthesisResult]) -> None:
-    if json_output_enabled:
-        payload = [result_to_dict(r) for r in results]
-        _emit(payload, "")
+def _print_results(
+    results: Iterable[tuple[int, SynthesisResult]], stream: bool = False
+) -> None:
+    """Print each ``(index, result)`` as soon as it arrives.
+
+    In JSON mode the array is written an element at a time, so long
+    streamed batches never hold every result in memory. With ``stream``,
+    each result is a JSON line of its own (NDJSON) carrying its input
+    index and the seconds elapsed since the batch started.
+    """
+    if stream:
+        start = time.monotonic()
+        for index, r in results:
+            line = {
+                "index": index,
+                **result_to_dict(r),
+                "elapsed_seconds": round(time.monotonic() - start, 3),
+            }
+            click.echo(json.dumps(line))
+        return
+    if not json_output_enabled:
+        for _, r in results:
+            _print_result(r)
         return
-    for r in results:
-        _print_result(r)
+    click.echo("[", nl=False)
+    for i, (_, r) in enumerate(results):
+        click.echo(f"{', ' if i else ''}{json.dumps(result_to_dict(r))}", nl=False)
+    click.echo("]")
 
 
 def _get_provider(ctx: click.Context) -> TTSProvider:
@@ -70,6 +100,13 @@ def _get_provider(ctx: click.Context) -> TTSProvider:
     return obj["provider"]
 
 
+def _get_client(ctx: click.Context, jobs: int = 1) -> TTSClient:
+    """Build a TTSClient from the provider and cache in the Click context."""
+    obj = cast("dict[str, object]", ctx.ensure_object(dict))  # pyright: ignore[reportUnknownMemberType]
+    cache = cast("SynthesisCache | None", obj.get("cache"))
+    return TTSClient(_get_provider(ctx), cache=cache, jobs=jobs)
+
+
 def _resolve_voice_and_language(
     provider: TTSProvider,
     voice: str | None,
@@ -98,6 +135,167 @@ def _resolve_voice_and_language(
     return voice, language
 
 
+_INPUT_FORMATS = {
+    ".json": "json",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".tab": "tsv",
+}
+
+
+def _input_format(input_file: Path, input_format: str | None) -> str:
+    """Pick the INPUT_FILE format: explicit, by extension, else JSON.
+
+    Standard input (``-``) defaults to JSONL.
+    """
+    if input_format is not None:
+        return input_format
+    if str(input_file) == "-":
+        return "jsonl"
+    return _INPUT_FORMATS.get(input_file.suffix.lower(), "json")
+
+
+@contextmanager
+def _open_input(input_file: Path) -> Generator[TextIO]:
+    if str(input_file) == "-":
+        yield sys.stdin
+        return
+    with input_file.open(encoding="utf-8", newline="") as stream:
+        yield stream
+
+
+def _read_records(
+    input_file: Path, input_format: str, columns: int
+) -> Iterator[tuple[str, object]]:
+    """Yield ``(location, record)`` from INPUT_FILE, one record at a time.
+
+    A JSON array is parsed whole. JSONL, CSV and TSV are read a line at a
+    time, so memory stays flat however long the file is; blank lines are
+    skipped. CSV/TSV rows yield their first column, or a list of their
+    first ``columns`` columns when ``columns`` > 1.
+    """
+    with _open_input(input_file) as stream:
+        if input_format == "json":
+            try:
+                raw = json.load(stream)
+            except json.JSONDecodeError as exc:
+                raise click.BadParameter("INPUT_FILE must contain valid JSON.") from exc
+            if not isinstance(raw, list):
+                raise click.BadParameter("INPUT_FILE must contain a JSON array.")
+            for i, item in enumerate(cast("list[object]", raw)):
+                yield f"Element {i}", item
+        elif input_format == "jsonl":
+            for number, line in enumerate(stream, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield f"Line {number}", json.loads(line)
+                except json.JSONDecodeError as exc:
+                    raise click.BadParameter(
+                        f"Line {number} is not valid JSON."
+                    ) from exc
+        else:
+            dialect = "excel-tab" if input_format == "tsv" else "excel"
+            reader = csv.reader(stream, dialect=dialect)
+            for row in reader:
+                if not any(cell.strip() for cell in row):
+                    continue
+                where = f"Line {reader.line_num}"
+                if len(row) < columns:
+                    raise click.BadParameter(
+                        f"{where} must have {columns} columns, got {len(row)}."
+                    )
+                yield where, row[0] if columns == 1 else row[:columns]
+
+
+def _read_texts(input_file: Path, input_format: str) -> Iterator[str]:
+    """Read the texts of a batch from INPUT_FILE (see :func:`_checked`)."""
+    return _checked(_read_records(input_file, input_format, 1), _text, input_format)
+
+
+def _read_pairs(input_file: Path, input_format: str) -> Iterator[tuple[str, str]]:
+    """Read the [text1, text2] pairs of a batch from INPUT_FILE."""
+    return _checked(_read_records(input_file, input_format, 2), _pair, input_format)
+
+
+def _checked[T](
+    records: Iterable[tuple[str, object]],
+    check: Callable[[str, object], T],
+    input_format: str,
+) -> Iterator[T]:
+    """Validate records with ``check`` as they are read.
+
+    A JSON array is already in memory, so every element is checked
+    before the first is yielded: a bad element fails the command before
+    any provider call. JSONL, CSV, TSV and standard input are checked a
+    record at a time, so a bad record further down a streamed file stops
+    the batch only when it is reached, after the records before it.
+    """
+    items = (check(where, item) for where, item in records)
+    if input_format == "json":
+        yield from list(items)
+    else:
+        yield from items
+
+
+def _text(where: str, item: object) -> str:
+    if not isinstance(item, str):
+        raise click.BadParameter(
+            f"{where} must be a string, got {type(item).__name__}."
+        )
+    return item
+
+
+def _pair(where: str, item: object) -> tuple[str, str]:
+    if not isinstance(item, list) or len(cast("list[object]", item)) != 2:
+        raise click.BadParameter(
+            f"{where} must be a [text1, text2] pair, got {item!r}."
+        )
+    text_1, text_2 = cast("list[object]", item)
+    if not isinstance(text_1, str) or not isinstance(text_2, str):
+        raise click.BadParameter(f"{where} must contain strings, got {item!r}.")
+    return text_1, text_2
+
+
+_input_format_option = click.option(
+    "--format",
+    "input_format",
+    default=None,
+    type=click.Choice(["json", "jsonl", "csv", "tsv"]),
+    help=(
+        "INPUT_FILE format. Default: from the extension (.jsonl/.ndjson, "
+        ".csv, .tsv), else json; jsonl for standard input."
+    ),
+)
+
+_stream_option = click.option(
+    "--stream",
+    is_flag=True,
+    default=False,
+    help=(
+        "Write one JSON line per result as soon as it is ready, in completion "
+        "order, with its input index and elapsed seconds."
+    ),
+)
+
+_input_file_argument = click.argument(
+    "input_file", type=click.Path(exists=True, allow_dash=True, path_type=Path)
+)
+
+
+_jobs_option = click.option(
+    "--jobs",
+    "-j",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    envvar="TTS_JOBS",
+    help="Synthesize up to N items at once. Output order is unchanged.",
+)
+
+
 def _voice_settings_options[F: Callable[..., object]](fn: F) -> F:
     """Shared ElevenLabs voice-settings options for synthesis commands."""
     for decorator in reversed(
@@ -148,6 +346,12 @@ def _voice_settings_options[F: Callable[..., object]](fn: F) -> F:
     envvar="TTS_MODEL",
     help="Model name (e.g. eleven_v3, tts-1, tts-1-hd). Provider-specific.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    default=False,
+    help="Always call the provider instead of reusing cached audio.",
+)
 @click.pass_context
 def main(
     ctx: click.Context,
@@ -155,6 +359,7 @@ def main(
     json_output: bool,
     provider_name: str | None,
     model: str | None,
+    no_cache: bool,
 ) -> None:
     """langlearn-tts: Text-to-speech for language learning."""
     global json_output_enabled
@@ -162,6 +367,9 @@ def main(
     _configure_logging(verbose)
     ctx.ensure_object(dict)
     ctx.obj["provider"] = get_provider(provider_name, model=model)
+    ctx.obj["cache"] = None if no_cache else SynthesisCache(default_cache_dir())
+    # A stale catalog is refreshed on a daemon thread; let it finish saving.
+    ctx.call_on_close(lambda: wait_for_refreshes(_VOICE_REFRESH_WAIT_SECONDS))
 
 
 @main.command()
@@ -224,10 +432,10 @@ def synthesize(
     )
 
     if output is None:
-        output = default_output_dir() / f"{voice}_{text[:20].replace(' ', '_')}.mp3"
+        key = request_key(request, provider)
+        output = default_output_dir() / output_filename(key, prefix=f"{voice}_")
 
-    client = TTSClient(provider)
-    result = client.synthesize(request, output)
+    result = _get_client(ctx).synthesize(request, output)
     _print_result(result)
 
 
@@ -270,8 +478,11 @@ def synthesize(
     type=int,
     help="Pause between segments in ms (used with --merge).",
 )
+@_jobs_option
+@_input_format_option
+@_stream_option
 @_voice_settings_options
-@click.argument("input_file", type=click.Path(exists=True, path_type=Path))
+@_input_file_argument
 @click.pass_context
 def synthesize_batch(
     ctx: click.Context,
@@ -281,38 +492,30 @@ def synthesize_batch(
     output_dir: Path | None,
     merge: bool,
     pause: int,
+    jobs: int,
+    input_format: str | None,
+    stream: bool,
     stability: float | None,
     similarity: float | None,
     style: float | None,
     speaker_boost: bool,
     input_file: Path,
 ) -> None:
-    """Synthesize a batch of texts from a JSON file.
+    """Synthesize a batch of texts from a file or standard input.
+
+    INPUT_FILE (``-`` for standard input) holds one text per record: a
+    JSON array of strings such as ["hello", "world"], JSONL with one JSON
+    string per line, or CSV/TSV with the text in the first column.
 
-    INPUT_FILE should contain a JSON array of strings, e.g.:
-    ["hello", "world", "good morning"]
+    JSONL, CSV and TSV are read and synthesized a line at a time, with
+    each path printed as soon as it is written, so very large inputs run
+    in constant memory. --merge has to collect every text first.
     """
     provider = _get_provider(ctx)
-    try:
-        raw = json.loads(input_file.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
-        raise click.BadParameter(
-            "INPUT_FILE must contain valid JSON (array of strings)."
-        ) from exc
-
-    if not isinstance(raw, list):
-        raise click.BadParameter("INPUT_FILE must contain a JSON array of strings.")
-
-    for i, item in enumerate(raw):  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
-        if not isinstance(item, str):
-            raise click.BadParameter(
-                f"Element {i} must be a string, got {type(item).__name__}."  # pyright: ignore[reportUnknownArgumentType]
-            )
-
+    texts = _read_texts(input_file, _input_format(input_file, input_format))
     voice, language = _resolve_voice_and_language(provider, voice, language)
-    texts = cast("list[str]", raw)
     boost = speaker_boost if speaker_boost else None
-    requests = [
+    requests = (
         SynthesisRequest(
             text=t,
             voice=voice,
@@ -324,15 +527,17 @@ def synthesize_batch(
             speaker_boost=boost,
         )
         for t in texts
-    ]
-    strategy = (
-        MergeStrategy.ONE_FILE_PER_BATCH if merge else MergeStrategy.ONE_FILE_PER_INPUT
     )
     out_dir = output_dir if output_dir is not None else default_output_dir()
 
-    client = TTSClient(provider)
-    results = client.synthesize_batch(requests, out_dir, strategy, pause)
-    _print_results(results)
+    client = _get_client(ctx, jobs=jobs)
+    if merge:
+        merged = client.synthesize_batch(
+            list(requests), out_dir, MergeStrategy.ONE_FILE_PER_BATCH, pause
+        )
+        _print_results(enumerate(merged), stream)
+    else:
+        _print_results(client.iter_batch(requests, out_dir, ordered=not stream), stream)
 
 
 @main.command("synthesize-pair")
@@ -427,9 +632,10 @@ def synthesize_pair(
     )
 
     if output is None:
-        output = default_output_dir() / f"pair_{text1[:10]}_{text2[:10]}.mp3"
+        key = pair_key(req1, req2, provider, pause)
+        output = default_output_dir() / output_filename(key, prefix="pair_")
 
-    client = TTSClient(provider)
+    client = _get_client(ctx)
     result = client.synthesize_pair(text1, req1, text2, req2, output, pause)
     _print_result(result)
 
@@ -484,8 +690,11 @@ def synthesize_pair(
     default=False,
     help="Merge all pair outputs into a single file.",
 )
+@_jobs_option
+@_input_format_option
+@_stream_option
 @_voice_settings_options
-@click.argument("input_file", type=click.Path(exists=True, path_type=Path))
+@_input_file_argument
 @click.pass_context
 def synthesize_pair_batch(
     ctx: click.Context,
@@ -497,45 +706,35 @@ def synthesize_pair_batch(
     pause: int,
     output_dir: Path | None,
     merge: bool,
+    jobs: int,
+    input_format: str | None,
+    stream: bool,
     stability: float | None,
     similarity: float | None,
     style: float | None,
     speaker_boost: bool,
     input_file: Path,
 ) -> None:
-    """Synthesize a batch of text pairs from a JSON file.
+    """Synthesize a batch of text pairs from a file or standard input.
+
+    INPUT_FILE (``-`` for standard input) holds one pair per record: a
+    JSON array of [text1, text2] pairs such as [["strong", "stark"]],
+    JSONL with one two-element array per line, or CSV/TSV with the texts
+    in the first two columns.
 
-    INPUT_FILE should contain a JSON array of [text1, text2] pairs:
-    [["strong", "stark"], ["house", "Haus"]]
+    JSONL, CSV and TSV are read and synthesized a line at a time, with
+    each path printed as soon as it is written, so very large inputs run
+    in constant memory. --merge has to collect every pair first.
     """
     provider = _get_provider(ctx)
-    try:
-        raw = json.loads(input_file.read_text(encoding="utf-8"))
-    except json.JSONDecodeError as exc:
-        raise click.BadParameter(
-            "INPUT_FILE must contain valid JSON (array of [text1, text2] pairs)."
-        ) from exc
-    if not isinstance(raw, list):
-        raise click.BadParameter(
-            "INPUT_FILE must contain a JSON array of [text1, text2] pairs."
-        )
-
-    for i, item in enumerate(raw):  # pyright: ignore[reportUnknownVariableType, reportUnknownArgumentType]
-        if not isinstance(item, list) or len(item) != 2:  # pyright: ignore[reportUnknownArgumentType]
-            raise click.BadParameter(
-                f"Element {i} must be a [text1, text2] pair, got {item!r}."
-            )
-        if not isinstance(item[0], str) or not isinstance(item[1], str):
-            raise click.BadParameter(f"Element {i} must contain strings, got {item!r}.")
-
+    raw_pairs = _read_pairs(input_file, _input_format(input_file, input_format))
     voice1, lang1 = _resolve_voice_and_language(provider, voice1, lang1)
     voice2, lang2 = _resolve_voice_and_language(provider, voice2, lang2)
-    raw_pairs = cast("list[list[str]]", raw)
     boost = speaker_boost if speaker_boost else None
-    pairs: list[tuple[SynthesisRequest, SynthesisRequest]] = [
+    pairs = (
         (
             SynthesisRequest(
-                text=p[0],
+                text=text_1,
                 voice=voice1,
                 language=lang1,
                 rate=rate,
@@ -545,7 +744,7 @@ def synthesize_pair_batch(
                 speaker_boost=boost,
             ),
             SynthesisRequest(
-                text=p[1],
+                text=text_2,
                 voice=voice2,
                 language=lang2,
                 rate=rate,
@@ -555,17 +754,20 @@ def synthesize_pair_batch(
                 speaker_boost=boost,
             ),
         )
-        for p in raw_pairs
-    ]
-
-    strategy = (
-        MergeStrategy.ONE_FILE_PER_BATCH if merge else MergeStrategy.ONE_FILE_PER_INPUT
+        for text_1, text_2 in raw_pairs
     )
     out_dir = output_dir if output_dir is not None else default_output_dir()
 
-    client = TTSClient(provider)
-    results = client.synthesize_pair_batch(pairs, out_dir, strategy, pause)
-    _print_results(results)
+    client = _get_client(ctx, jobs=jobs)
+    if merge:
+        merged = client.synthesize_pair_batch(
+            list(pairs), out_dir, MergeStrategy.ONE_FILE_PER_BATCH, pause
+        )
+        _print_results(enumerate(merged), stream)
+    else:
+        _print_results(
+            client.iter_pair_batch(pairs, out_dir, pause, ordered=not stream), stream
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -909,3 +1111,154 @@ def prompt_show(name: str) -> None:
         )
     text = (_PROMPTS_DIR / f"{name}.md").read_text(encoding="utf-8")
     click.echo(_extract_instructions(text))
+
+
+def _cache_manager(max_bytes: int = 0, policy: str = "lru") -> CacheManager:
+    return CacheManager(
+        SynthesisCache(default_cache_dir()),
+        default_output_dir(),
+        max_bytes,
+        EvictionPolicy(policy),
+    )
+
+
+@main.group("cache")
+def cache_group() -> None:
+    """Manage the synthesis cache and its size budget."""
+
+
+@cache_group.command("prune")
+@click.option(
+    "--max-size",
+    required=True,
+    envvar="TTS_CACHE_MAX_SIZE",
+    help="Byte budget for audio output and cache, e.g. 500M or 2G.",
+)
+@click.option(
+    "--policy",
+    type=click.Choice([p.value for p in EvictionPolicy]),
+    default=EvictionPolicy.LRU.value,
+    show_default=True,
+    envvar="TTS_CACHE_POLICY",
+    help="Evict least recently (lru) or least frequently (lfu) used audio.",
+)
+def cache_prune(max_size: str, policy: str) -> None:
+    """Evict unpinned audio until the directories fit the budget."""
+    try:
+        max_bytes = parse_size(max_size)
+    except ValueError as exc:
+        raise click.BadParameter(str(exc), param_hint="--max-size") from exc
+
+    manager = _cache_manager(max_bytes, policy)
+    report = manager.sweep()
+    evicted_files, evicted_bytes = report.evicted_files, report.evicted_bytes
+    while report.limited:
+        report = manager.sweep()
+        evicted_files += report.evicted_files
+        evicted_bytes += report.evicted_bytes
+
+    payload = {
+        "evicted_files": evicted_files,
+        "evicted_bytes": evicted_bytes,
+        "remaining_bytes": report.remaining_bytes,
+    }
+    _emit(
+        payload,
+        f"Evicted {evicted_files} files ({evicted_bytes} bytes); "
+        f"{report.remaining_bytes} bytes remain.",
+    )
+
+
+@cache_group.command("pin")
+@click.option("--voice", default=None, help="Voice the texts are synthesized with.")
+@click.option(
+    "--language",
+    "--lang",
+    default=None,
+    help="ISO 639-1 language code (e.g. de, ko). Auto-selects voice if omitted.",
+)
+@click.option(
+    "--rate",
+    default=90,
+    show_default=True,
+    type=int,
+    help="Speech rate the texts are synthesized at.",
+)
+@click.option(
+    "--unpin",
+    is_flag=True,
+    default=False,
+    help="Make the texts evictable again.",
+)
+@_input_format_option
+@_input_file_argument
+@click.pass_context
+def cache_pin(
+    ctx: click.Context,
+    voice: str | None,
+    language: str | None,
+    rate: int,
+    unpin: bool,
+    input_format: str | None,
+    input_file: Path,
+) -> None:
+    """Protect a vocabulary list from cache eviction.
+
+    INPUT_FILE lists texts in any format synthesize-batch accepts.
+    Pinning covers the provider audio for each text, so clips, pairs
+    and merged files built from them are rebuilt without API calls.
+    """
+    provider = _get_provider(ctx)
+    texts = _read_texts(input_file, _input_format(input_file, input_format))
+    voice, language = _resolve_voice_and_language(provider, voice, language)
+    keys = [
+        request_key(
+            SynthesisRequest(text=t, voice=voice, language=language, rate=rate),
+            provider,
+        )
+        for t in texts
+    ]
+
+    manager = _cache_manager()
+    if unpin:
+        count = manager.unpin(keys)
+        _emit({"unpinned": count}, f"Unpinned {count} texts.")
+    else:
+        count = manager.pin(keys)
+        _emit({"pinned": count}, f"Pinned {count} texts.")
+
+
+@cache_group.command("find")
+@click.argument("text")
+@click.option("--voice", default=None, help="Only audio in this voice.")
+@click.option(
+    "--language",
+    "--lang",
+    default=None,
+    help="Only audio in this ISO 639-1 language.",
+)
+@click.option("--rate", default=None, type=int, help="Only audio at this rate.")
+def cache_find(
+    text: str, voice: str | None, language: str | None, rate: int | None
+) -> None:
+    """List cached audio for TEXT, in any voice unless --voice is given."""
+    index = SynthesisCache(default_cache_dir()).index
+    entries = index.find(text, language=language, rate=rate, voice=voice)
+    payload = [
+        {
+            "path": str(e.path),
+            "voice": e.voice,
+            "language": e.language,
+            "rate": e.rate,
+            "provider": e.provider,
+            "model": e.model,
+            "duration_ms": e.duration_ms,
+            "hits": e.hits,
+        }
+        for e in entries
+    ]
+    lines = [
+        f"{e.path}  {e.voice} {e.language} rate={e.rate} {e.duration_ms}ms"
+        for e in entries
+    ]
+    _emit(payload, "\n".join(lines) if lines else "Not cached.")
@@ -0,0 +1,237 @@
+"""Prewarmed ffmpeg processes for decoding and encoding stitched audio.
+
+Starting ffmpeg (exec, dynamic linking, codec registration) takes tens
+of milliseconds, far longer than decoding a one-word clip or encoding a
+pair. The ffmpeg command line cannot take a second job once started, so
+instead of one long-lived process, :class:`CodecPool` keeps a few
+processes started ahead of time, each already blocked reading its input
+from a pipe. A job takes one of them and replacements are started on a
+background thread, so their startup overlaps the current job rather than
+delaying the next one.
+
+Decoders turn any audio file ffmpeg reads into 16-bit PCM; encoders turn
+16-bit PCM into MP3. Both are keyed by sample rate and channel count,
+which are fixed on the command line. Each encoder writes to its own
+temporary file, so ffmpeg can seek back to fill in the Xing/Info header
+(which records the encoder delay for gapless playback), and the file is
+moved into place when the job is done. :func:`decode_pcm` and
+:func:`encode_mp3` use a pool shared by the whole process; idle
+processes are killed at interpreter exit.
+"""
+
+from __future__ import annotations
+
+import atexit
+import contextlib
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+from collections import deque
+from collections.abc import Generator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Literal
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_POOL_SIZE", "CodecPool", "decode_pcm", "encode_mp3"]
+
+DEFAULT_POOL_SIZE = 2
+
+type _Kind = Literal["decode", "encode"]
+type _Key = tuple[_Kind, int, int]
+
+
+@dataclass(frozen=True)
+class _Worker:
+    process: subprocess.Popen[bytes]
+    output: Path | None = None
+    """The encoder's temporary output file; None for decoders."""
+
+
+class CodecPool:
+    """Prewarmed ffmpeg decoders and encoders.
+
+    Args:
+        size: Idle processes kept ready per kind and format.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE) -> None:
+        self._size = size
+        self._lock = threading.Lock()
+        self._idle: dict[_Key, deque[_Worker]] = {}
+        self._starting: dict[_Key, int] = {}
+        self._generation = 0
+
+    def decode(self, data: bytes, frame_rate: int, channels: int) -> bytes:
+        """Decode an encoded audio file's bytes to 16-bit PCM.
+
+        The input format is detected by ffmpeg; the output is resampled
+        and remixed to ``frame_rate`` and ``channels``.
+
+        Raises:
+            RuntimeError: If ffmpeg fails to decode ``data``.
+        """
+        process = self._take(("decode", frame_rate, channels)).process
+        pcm, stderr = process.communicate(data)
+        if process.returncode != 0:
+            msg = f"ffmpeg failed to decode audio: {stderr.decode().strip()}"
+            raise RuntimeError(msg)
+        return pcm
+
+    @contextmanager
+    def encode(
+        self, output_path: Path, frame_rate: int, channels: int
+    ) -> Generator[IO[bytes]]:
+        """Encode the 16-bit PCM written to the yielded stream as an MP3.
+
+        The MP3 is moved to ``output_path`` once the block exits and the
+        encoder has finished; nothing is written there on failure.
+
+        Raises:
+            RuntimeError: If ffmpeg fails to encode the output.
+        """
+        worker = self._take(("encode", frame_rate, channels))
+        process, staged = worker.process, worker.output
+        assert process.stdin is not None  # stdin=PIPE
+        assert process.stderr is not None  # stderr=PIPE
+        assert staged is not None  # encoders write a file
+        try:
+            try:
+                with contextlib.suppress(BrokenPipeError):
+                    yield process.stdin
+                    process.stdin.close()  # end of input
+            except BaseException:
+                process.kill()
+                raise
+            finally:
+                with contextlib.suppress(BrokenPipeError):
+                    process.stdin.close()
+                stderr = process.stderr.read()
+                process.stderr.close()
+                process.wait()
+            if process.returncode != 0:
+                detail = stderr.decode().strip()
+                msg = f"ffmpeg failed to encode {output_path}: {detail}"
+                raise RuntimeError(msg)
+            output_path.parent.mkdir(parents=True, exist_ok=True)
+            shutil.move(staged, output_path)
+        finally:
+            staged.unlink(missing_ok=True)
+
+    def close(self) -> None:
+        """Kill all idle processes. The pool refills on its next use."""
+        with self._lock:
+            idle = [p for queue in self._idle.values() for p in queue]
+            self._idle.clear()
+            self._generation += 1
+        for worker in idle:
+            _kill(worker)
+
+    # -- Private helpers --------------------------------------------------
+
+    def _take(self, key: _Key) -> _Worker:
+        """Return a started process for ``key`` and top up the idle ones.
+
+        Nothing is spawned while the lock is held: top-ups start on a
+        background thread, and a process for this job (only needed when
+        none is idle) is spawned after the lock is released.
+        """
+        with self._lock:
+            idle = self._idle.setdefault(key, deque())
+            worker = idle.popleft() if idle else None
+            missing = self._size - len(idle) - self._starting.get(key, 0)
+            generation = self._generation
+            if missing > 0:
+                self._starting[key] = self._starting.get(key, 0) + missing
+        if missing > 0:
+            threading.Thread(
+                target=self._refill,
+                args=(key, missing, generation),
+                name="langlearn-tts-codec",
+                daemon=True,
+            ).start()
+        return worker or _spawn(key)
+
+    def _refill(self, key: _Key, count: int, generation: int) -> None:
+        for _ in range(count):
+            try:
+                worker = _spawn(key)
+            except OSError as exc:
+                logger.warning("Could not start ffmpeg: %s", exc)
+                worker = None
+            with self._lock:
+                self._starting[key] -= 1
+                if worker is not None and generation == self._generation:
+                    self._idle.setdefault(key, deque()).append(worker)
+                    worker = None
+            if worker is not None:
+                _kill(worker)  # the pool was closed while it started
+
+
+def decode_pcm(data: bytes, frame_rate: int, channels: int) -> bytes:
+    """Decode audio bytes to 16-bit PCM on the shared :class:`CodecPool`.
+
+    Raises:
+        RuntimeError: If ffmpeg fails to decode ``data``.
+    """
+    return _pool.decode(data, frame_rate, channels)
+
+
+@contextmanager
+def encode_mp3(
+    output_path: Path, frame_rate: int, channels: int
+) -> Generator[IO[bytes]]:
+    """Encode 16-bit PCM to ``output_path`` on the shared :class:`CodecPool`.
+
+    Raises:
+        RuntimeError: If ffmpeg fails to encode the output.
+    """
+    with _pool.encode(output_path, frame_rate, channels) as pcm:
+        yield pcm
+
+
+# -- Private helpers ------------------------------------------------------
+
+
+def _spawn(key: _Key) -> _Worker:
+    from pydub import AudioSegment  # pyright: ignore[reportMissingTypeStubs]
+
+    kind, frame_rate, channels = key
+    pcm = ["-f", "s16le", "-ar", str(frame_rate), "-ac", str(channels)]
+    output = None
+    if kind == "decode":
+        args = ["-i", "pipe:0", *pcm, "pipe:1"]
+    else:
+        fd, name = tempfile.mkstemp(prefix="langlearn-tts-", suffix=".mp3")
+        os.close(fd)
+        output = Path(name)
+        args = [*pcm, "-i", "pipe:0", "-y", "-f", "mp3", name]
+    logger.debug("Starting ffmpeg to %s (%d Hz, %d ch)", kind, frame_rate, channels)
+    process = subprocess.Popen(
+        [
+            str(AudioSegment.converter),  # pyright: ignore[reportUnknownMemberType, reportUnknownArgumentType]
+            "-loglevel",
+            "error",
+            *args,
+        ],
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE if output is None else subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    return _Worker(process, output)
+
+
+def _kill(worker: _Worker) -> None:
+    worker.process.kill()
+    worker.process.communicate()
+    if worker.output is not None:
+        worker.output.unlink(missing_ok=True)
+
+
+_pool = CodecPool()
+atexit.register(_pool.close)
@@ -0,0 +1,437 @@
+"""Bounded, order-preserving concurrency for batch synthesis.
+
+Provider calls are network-bound, so a small thread pool cuts a batch's
+wall-clock time to roughly that of its slowest item. Results always come
+back in input order, whatever order the calls finish in.
+
+:class:`SingleFlight` collapses concurrent calls for the same key into
+one, so a burst of identical requests costs a single provider call.
+
+Work on worker threads cannot be interrupted from outside, so it is
+cancelled cooperatively: code run under :func:`cancellable` calls
+:func:`check_cancelled` between items and before each provider call,
+and stops with ``CancelledError`` once its :class:`Cancellation` is set.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import os
+import threading
+from collections import deque
+from collections.abc import (
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    Sequence,
+)
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    CancelledError,
+    Future,
+    ThreadPoolExecutor,
+    wait,
+)
+from contextlib import asynccontextmanager, contextmanager
+
+__all__ = [
+    "Cancellation",
+    "RequestGate",
+    "SingleFlight",
+    "cancellable",
+    "check_cancelled",
+    "default_jobs",
+    "gather_ordered",
+    "imap_completed",
+    "imap_ordered",
+    "map_ordered",
+]
+
+
+class Cancellation:
+    """A flag telling work on worker threads to stop at its next check."""
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self) -> None:
+        self._event.set()
+
+
+_cancellation: contextvars.ContextVar[Cancellation | None] = contextvars.ContextVar(
+    "langlearn_tts_cancellation", default=None
+)
+
+
+@contextmanager
+def cancellable(cancellation: Cancellation) -> Generator[None]:
+    """Run the enclosed block under ``cancellation``.
+
+    The flag is a context variable, so :func:`check_cancelled` sees it in
+    ``asyncio.to_thread`` and :func:`map_ordered` workers started here.
+    """
+    token = _cancellation.set(cancellation)
+    try:
+        yield
+    finally:
+        _cancellation.reset(token)
+
+
+def check_cancelled() -> None:
+    """Stop the current work if its :class:`Cancellation` has been set.
+
+    Raises:
+        concurrent.futures.CancelledError: If the work was cancelled.
+    """
+    cancellation = _cancellation.get()
+    if cancellation is not None and cancellation.cancelled:
+        raise CancelledError("Request cancelled")
+
+
+def default_jobs() -> int:
+    """Resolve the batch concurrency from ``TTS_JOBS`` (default 1).
+
+    Raises:
+        ValueError: If ``TTS_JOBS`` is not a positive integer.
+    """
+    raw = os.environ.get("TTS_JOBS")
+    if not raw:
+        return 1
+    try:
+        jobs = int(raw)
+    except ValueError:
+        jobs = 0
+    if jobs < 1:
+        msg = f"TTS_JOBS must be a positive integer, got {raw!r}"
+        raise ValueError(msg)
+    return jobs
+
+
+def map_ordered[T, R](
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    jobs: int,
+    key: Callable[[T], Hashable] | None = None,
+    on_result: Callable[[R], None] | None = None,
+) -> list[R]:
+    """Apply ``fn`` to ``items`` on up to ``jobs`` threads, in input order.
+
+    Args:
+        fn: Function to apply to each item.
+        items: Items to process.
+        jobs: Maximum number of concurrent calls. 1 runs inline.
+        key: Optional grouping key. Items with equal keys (e.g. the same
+            output path) run one after another on the same thread, in
+            input order, so they never race each other.
+        on_result: Optional callback, called on the calling thread with
+            each result in input order as soon as it and every earlier
+            result are ready, while later items are still running.
+
+    Returns:
+        ``[fn(item) for item in items]``. If any call raises, the first
+        exception in input order is re-raised once in-flight calls end;
+        calls not yet started are cancelled.
+
+    Each call runs in a copy of the caller's context, so context
+    variables (such as the rate limiter's priority) carry over. Items not
+    yet started are skipped once the work is cancelled.
+    """
+
+    def call(item: T) -> R:
+        check_cancelled()
+        return fn(item)
+
+    if jobs <= 1 or len(items) <= 1:
+        inline: list[R] = []
+        for item in items:
+            result = call(item)
+            if on_result is not None:
+                on_result(result)
+            inline.append(result)
+        return inline
+
+    groups: dict[Hashable, list[int]] = {}
+    for i, item in enumerate(items):
+        groups.setdefault(key(item) if key is not None else i, []).append(i)
+
+    results: dict[int, R] = {}
+    changed = threading.Condition()
+
+    def run_group(indices: list[int]) -> None:
+        try:
+            for i in indices:
+                result = call(items[i])
+                with changed:
+                    results[i] = result
+                    changed.notify_all()
+        finally:
+            with changed:
+                changed.notify_all()
+
+    workers = min(jobs, len(groups))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(contextvars.copy_context().run, run_group, indices)
+            for indices in groups.values()
+        ]
+        try:
+            if on_result is not None:
+                _emit_in_order(results, changed, futures, len(items), on_result)
+            for future in futures:
+                future.result()
+        except BaseException:
+            executor.shutdown(cancel_futures=True)
+            raise
+    return [results[i] for i in range(len(items))]
+
+
+def _emit_in_order[R](
+    results: dict[int, R],
+    changed: threading.Condition,
+    futures: list[Future[None]],
+    count: int,
+    on_result: Callable[[R], None],
+) -> None:
+    """Hand ``results`` to ``on_result`` in index order as they arrive.
+
+    Stops early if a worker fails; the caller re-raises its exception.
+    """
+
+    index = 0
+
+    def ready() -> bool:
+        return index in results or any(
+            f.done() and f.exception() is not None for f in futures
+        )
+
+    for index in range(count):
+        with changed:
+            changed.wait_for(ready)
+            if index not in results:
+                return
+            result = results[index]
+        on_result(result)
+
+
+def imap_ordered[T, R](
+    fn: Callable[[T], R], items: Iterable[T], jobs: int
+) -> Iterator[R]:
+    """Lazily apply ``fn`` to ``items`` on up to ``jobs`` threads, in input order.
+
+    The streaming counterpart of :func:`map_ordered`, for inputs too long
+    to hold in memory. ``items`` is consumed on the calling thread at
+    most ``2 * jobs`` items ahead of the last result yielded, so memory
+    stays flat however many items there are.
+
+    Yields:
+        ``fn(item)`` for each item, in input order. If a call raises, its
+        exception is re-raised in input order; calls not yet started are
+        cancelled, as they are if the caller stops iterating early.
+    """
+
+    def call(item: T) -> R:
+        check_cancelled()
+        return fn(item)
+
+    if jobs <= 1:
+        for item in items:
+            yield call(item)
+        return
+
+    pending: deque[Future[R]] = deque()
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        try:
+            for item in items:
+                pending.append(
+                    executor.submit(contextvars.copy_context().run, call, item)
+                )
+                if len(pending) >= 2 * jobs:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def imap_completed[T, R](
+    fn: Callable[[T], R], items: Iterable[T], jobs: int
+) -> Iterator[tuple[int, R]]:
+    """Lazily apply ``fn`` to ``items`` on up to ``jobs`` threads, as calls finish.
+
+    Like :func:`imap_ordered`, with the same read-ahead bound, but each
+    result is yielded as soon as its call finishes, with the item's
+    input index, so a slow item never holds back faster ones behind it.
+
+    Yields:
+        ``(index, fn(items[index]))`` in completion order. If a call
+        raises, its exception is re-raised as soon as it is seen; calls
+        not yet started are cancelled, as they are if the caller stops
+        iterating early.
+    """
+
+    def call(item: T) -> R:
+        check_cancelled()
+        return fn(item)
+
+    if jobs <= 1:
+        for index, item in enumerate(items):
+            yield index, call(item)
+        return
+
+    pending: dict[Future[R], int] = {}
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        try:
+            for index, item in enumerate(items):
+                future = executor.submit(contextvars.copy_context().run, call, item)
+                pending[future] = index
+                if len(pending) >= 2 * jobs:
+                    yield from _pop_completed(pending)
+            while pending:
+                yield from _pop_completed(pending)
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _pop_completed[R](pending: dict[Future[R], int]) -> Iterator[tuple[int, R]]:
+    """Wait for at least one of ``pending`` and yield what finished, by index."""
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in sorted(done, key=pending.__getitem__):
+        yield pending.pop(future), future.result()
+
+
+async def gather_ordered[T, R](
+    fn: Callable[[T], Awaitable[R]],
+    items: Sequence[T],
+    key: Callable[[T], Hashable] | None = None,
+) -> list[R]:
+    """Await ``fn`` over ``items`` concurrently, returning results in input order.
+
+    The coroutine counterpart of :func:`map_ordered`, without a worker
+    bound: callers pace themselves (e.g. with a rate limiter). Items with
+    equal keys run one after another, in input order. If any call raises,
+    the others are cancelled and that exception is re-raised.
+    """
+    groups: dict[Hashable, list[int]] = {}
+    for i, item in enumerate(items):
+        groups.setdefault(key(item) if key is not None else i, []).append(i)
+
+    async def run_group(indices: list[int]) -> list[tuple[int, R]]:
+        return [(i, await fn(items[i])) for i in indices]
+
+    tasks = [asyncio.ensure_future(run_group(g)) for g in groups.values()]
+    try:
+        done = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        raise
+    results = dict(pair for group in done for pair in group)
+    return [results[i] for i in range(len(items))]
+
+
+class RequestGate:
+    """Bounded admission for async requests: a few run, a few more wait.
+
+    Up to ``running`` requests hold the gate at once and up to ``queued``
+    more wait their turn in arrival order. A request arriving when the
+    queue is full is rejected at once, so a saturated server fails fast
+    with a clear error instead of piling up work nobody may wait for.
+
+    Must be used from one event loop at a time.
+    """
+
+    def __init__(self, running: int, queued: int) -> None:
+        self._running = running
+        self._queued = queued
+        self._slots = asyncio.Semaphore(running)
+        self._waiting = 0
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncGenerator[None]:
+        """Hold a slot for the enclosed block, waiting if all are taken.
+
+        Raises:
+            RuntimeError: If ``running`` requests are in progress and
+                ``queued`` more are already waiting.
+        """
+        if self._slots.locked() and self._waiting >= self._queued:
+            msg = (
+                f"Server busy: {self._running} requests running and "
+                f"{self._waiting} waiting. Try again shortly."
+            )
+            raise RuntimeError(msg)
+        self._waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self._waiting -= 1
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+
+class _Call[R]:
+    """One in-flight call and the outcome its waiters share."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: R | None = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight[R]:
+    """Run at most one call per key at a time; concurrent callers share it.
+
+    The first caller for a key runs the function; callers arriving while
+    it is in flight block and receive the same result, or the same
+    exception. Once the call returns the key is forgotten, so later
+    calls run again (by then the result is usually cached). If the first
+    caller's work is cancelled, waiting callers run the call themselves
+    rather than share the cancellation.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call[R]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], R]) -> R:
+        """Return ``fn()``, sharing one call among concurrent callers of ``key``."""
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                leader = call is None
+                if call is None:
+                    call = _Call[R]()
+                    self._calls[key] = call
+            if leader:
+                break
+            call.done.wait()
+            if isinstance(call.error, CancelledError):
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result  # type: ignore[return-value]  # pyright: ignore[reportReturnType]
+
+        try:
+            result = fn()
+            call.result = result
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return result
@@ -1,7 +1,736 @@
-"""Core synthesis orchestration — re-exported from punt-vox."""
+"""Core synthesis orchestration — re-exported from punt-vox.
+
+TTSClient subclass adds the content-addressed synthesis cache shared by
+the CLI and MCP server, with segment-level reuse inside pairs and merges,
+bounded concurrency for batches, and single-flight coalescing of
+identical requests that are in flight at the same time.
+
+:func:`stitch_audio` joins compatible MP3 segments frame by frame
+instead of re-encoding them, and streams anything else through one
+encoder, so merges of any length run in bounded memory.
+"""
 
 from __future__ import annotations
 
-from punt_vox.core import TTSClient, split_text, stitch_audio
+import contextvars
+import dataclasses
+import logging
+import tempfile
+import threading
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, cast
+
+from langlearn_tts import mp3
+from langlearn_tts.cache import (
+    SynthesisCache,
+    composite_key,
+    pair_key,
+    provider_model,
+    request_key,
+)
+from langlearn_tts.codec import decode_pcm, encode_mp3
+from langlearn_tts.concurrency import (
+    SingleFlight,
+    check_cancelled,
+    imap_completed,
+    imap_ordered,
+    map_ordered,
+)
+from langlearn_tts.index import EntryMeta
+from langlearn_tts.output import staged_output
+from langlearn_tts.types import (
+    AudioProviderId,
+    MergeStrategy,
+    SynthesisRequest,
+    SynthesisResult,
+    TTSProvider,
+    generate_filename,
+)
+from punt_vox.core import TRAILING_SILENCE_MS, TTSClient as _TTSClient, split_text
+
+__all__ = ["BatchProgress", "TTSClient", "split_text", "stitch_audio"]
+
+logger = logging.getLogger(__name__)
+
+# Process-wide, so concurrent tool calls and batch workers share one
+# provider call per cache entry (or per uncached output file).
+_entry_flights = SingleFlight[Path]()
+_output_flights = SingleFlight[SynthesisResult]()
+
+
+def stitch_audio(segments: list[Path], output_path: Path, pause_ms: int = 500) -> None:
+    """Concatenate MP3 files with ``pause_ms`` of silence between each.
+
+    Segments sharing a sample rate and channel count (the usual case:
+    one provider, one output format) are joined frame by frame by
+    :func:`langlearn_tts.mp3.concat`, with no decoding or re-encoding.
+    Anything else is decoded and re-encoded once. Either way the output
+    ends with punt-vox's trailing silence.
+
+    Raises:
+        FileNotFoundError: If any segment file does not exist.
+        ValueError: If segments list is empty.
+    """
+    if not segments:
+        msg = "segments must not be empty"
+        raise ValueError(msg)
+    if mp3.concat(segments, output_path, pause_ms, TRAILING_SILENCE_MS):
+        logger.info(
+            "Stitched %d segments by frame copy → %s", len(segments), output_path
+        )
+        return
+    _reencode_audio(segments, output_path, pause_ms)
+
+
+def _reencode_audio(segments: list[Path], output_path: Path, pause_ms: int) -> None:
+    """Decode segments one at a time into a single streaming MP3 encoder.
+
+    punt-vox joins ``AudioSegment`` objects with ``+``, which copies the
+    whole result so far on every append and holds every decoded segment
+    at once. Here one ffmpeg process encodes raw 16-bit PCM from its
+    stdin: each segment is decoded, converted to the first segment's
+    rate and channel count, written to the pipe and released before the
+    next is read, with pauses written as zeroed samples. Time is linear
+    and memory constant in the number of segments. The encoder and the
+    MP3 decoders are prewarmed processes from :mod:`langlearn_tts.codec`,
+    so no stitch waits on ffmpeg startup.
+
+    Raises:
+        FileNotFoundError: If any segment file does not exist.
+        RuntimeError: If ffmpeg fails to encode the output.
+    """
+    from pydub import AudioSegment  # pyright: ignore[reportMissingTypeStubs]
+
+    for path in segments:
+        if not path.exists():
+            msg = f"Segment not found: {path}"
+            raise FileNotFoundError(msg)
+
+    def pydub_pcm(path: Path) -> tuple[bytes, int, int]:
+        segment = cast("Any", AudioSegment.from_file(str(path)))  # pyright: ignore[reportUnknownMemberType]
+        rate, chans = int(segment.frame_rate), int(segment.channels)
+        segment = (
+            segment.set_frame_rate(frame_rate or rate)
+            .set_channels(channels or chans)
+            .set_sample_width(2)
+        )
+        return bytes(segment.raw_data), rate, chans
+
+    def pcm(path: Path) -> bytes:
+        """Decode MP3 on a prewarmed ffmpeg, anything else through pydub."""
+        data = path.read_bytes()
+        if mp3.stream_format(data) is None:
+            return pydub_pcm(path)[0]
+        return decode_pcm(data, frame_rate, channels)
+
+    frame_rate = channels = 0
+    decoded: list[bytes] = []  # popped, so no segment outlives its write
+    fmt = mp3.stream_format(segments[0].read_bytes())
+    if fmt is None:
+        first, frame_rate, channels = pydub_pcm(segments[0])
+        decoded.append(first)
+        del first
+    else:
+        frame_rate, channels = fmt
+    frame_width = 2 * channels
+
+    def silence(ms: int) -> bytes:
+        return bytes(round(ms * frame_rate / 1000) * frame_width)
+
+    pause = silence(pause_ms)
+    with encode_mp3(output_path, frame_rate, channels) as encoder:
+        for i, path in enumerate(segments):
+            encoder.write(decoded.pop() if decoded else pcm(path))
+            last = i == len(segments) - 1
+            encoder.write(silence(TRAILING_SILENCE_MS) if last else pause)
+    logger.info("Stitched %d segments → %s", len(segments), output_path)
+
+
+# Provider calls made on behalf of the batch item being tracked, if any.
+_item_misses: contextvars.ContextVar[list[str] | None] = contextvars.ContextVar(
+    "langlearn_tts_item_misses", default=None
+)
+
+
+@dataclass(frozen=True)
+class BatchProgress:
+    """How far a batch has got, reported each time an item finishes.
+
+    Attributes:
+        completed: Items finished so far.
+        total: Items in the batch. For a merged batch these are its
+            segments (texts or pairs).
+        cache_hits: Finished items that needed no provider call.
+        current: Text of the item that just finished.
+    """
+
+    completed: int
+    total: int
+    cache_hits: int
+    current: str
+
+
+class _ProgressTracker:
+    """Counts finished batch items and hands each update to a callback."""
+
+    def __init__(
+        self,
+        total: int,
+        on_progress: Callable[[BatchProgress], None] | None,
+        cached: bool,
+    ) -> None:
+        self._total = total
+        self._on_progress = on_progress
+        self._cached = cached
+        self._lock = threading.Lock()
+        self._completed = 0
+        self._hits = 0
+
+    def track[T, R](
+        self, fn: Callable[[T], R], describe: Callable[[T], str]
+    ) -> Callable[[T], R]:
+        """Wrap a per-item function to report progress when it returns."""
+        if self._on_progress is None:
+            return fn
+
+        def run(item: T) -> R:
+            misses: list[str] = []
+            token = _item_misses.set(misses)
+            try:
+                result = fn(item)
+            finally:
+                _item_misses.reset(token)
+            self._advance(describe(item), hit=self._cached and not misses)
+            return result
+
+        return run
+
+    def finish(self, current: str) -> None:
+        """Account for items that finished without passing through :meth:`track`.
+
+        That is every item when a merged output was cached whole (all
+        hits), or was built by punt-vox without the cache.
+        """
+        if self._completed == 0:
+            for _ in range(self._total):
+                self._advance(current, hit=self._cached)
+
+    def _advance(self, current: str, *, hit: bool) -> None:
+        if self._on_progress is None:
+            return
+        # Under the lock, so the callback sees ``completed`` go up by one.
+        with self._lock:
+            self._completed += 1
+            self._hits += hit
+            self._on_progress(
+                BatchProgress(self._completed, self._total, self._hits, current)
+            )
+
+
+def _pair_filename(pair: tuple[SynthesisRequest, SynthesisRequest]) -> str:
+    """Output name punt-vox gives a pair in a non-merged pair batch."""
+    return generate_filename(f"{pair[0].text}_{pair[1].text}", prefix="pair_")
+
+
+def _request_text(request: SynthesisRequest) -> str:
+    return request.text
+
+
+def _pair_text(pair: tuple[SynthesisRequest, SynthesisRequest]) -> str:
+    return f"{pair[0].text} | {pair[1].text}"
+
+
+def _notified(
+    results: list[SynthesisResult],
+    on_result: Callable[[SynthesisResult], None] | None,
+) -> list[SynthesisResult]:
+    """Pass finished ``results`` to ``on_result`` in order, then return them."""
+    if on_result is not None:
+        for result in results:
+            on_result(result)
+    return results
+
+
+class TTSClient(_TTSClient):
+    """punt-vox TTSClient with an optional synthesis cache.
+
+    Without a cache every call goes to the provider, as in punt-vox.
+    With one, every provider call produces a *segment* entry keyed by
+    :func:`request_key`, and every output (padded clip, pair, merged
+    batch) is a composite entry stitched from segments. A new pair or
+    merged review file therefore costs API calls only for texts that
+    were never synthesized before, with the same voice and settings.
+
+    Batch methods run up to ``jobs`` provider calls at once and return
+    results in input order. Concurrent calls for the same audio, from
+    any client in the process, wait on a single provider call.
+    """
+
+    def __init__(
+        self,
+        provider: TTSProvider,
+        cache: SynthesisCache | None = None,
+        jobs: int = 1,
+    ) -> None:
+        super().__init__(provider)
+        self._cache = cache
+        self._jobs = jobs
+
+    def synthesize(
+        self, request: SynthesisRequest, output_path: Path
+    ) -> SynthesisResult:
+        """Synthesize a single text, reusing cached audio when possible."""
+        cache = self._cache
+        if cache is None:
+            return _output_flights.do(
+                (request_key(request, self._provider), output_path),
+                lambda: self._synthesize_uncached(request, output_path),
+            )
+
+        key = composite_key("clip", [request_key(request, self._provider)], 0)
+        entry = self._stitched(
+            cache,
+            key,
+            lambda: [self._segment(cache, request)],
+            0,
+            self._meta("clip", request.text, request),
+        )
+        cache.materialize(entry, output_path)
+        return SynthesisResult(
+            path=output_path,
+            text=request.text,
+            provider=AudioProviderId(self._provider.name),
+            voice=request.voice,
+            language=request.language,
+            metadata=request.metadata,
+        )
+
+    def synthesize_pair(
+        self,
+        text_1: str,
+        voice_1: SynthesisRequest,
+        text_2: str,
+        voice_2: SynthesisRequest,
+        output_path: Path,
+        pause_ms: int = 500,
+    ) -> SynthesisResult:
+        """Synthesize two texts stitched with a pause, reusing cached halves.
+
+        Both halves are requested from the provider at the same time, so
+        a pair costs one round trip of latency rather than two.
+        """
+        cache = self._cache
+        if cache is None:
+            return self._synthesize_pair_uncached(
+                text_1, voice_1, text_2, voice_2, output_path, pause_ms
+            )
+
+        entry = self._pair_entry(cache, voice_1, voice_2, pause_ms)
+        cache.materialize(entry, output_path)
+
+        voice_parts = [v for v in (voice_1.voice, voice_2.voice) if v]
+        return SynthesisResult(
+            path=output_path,
+            text=f"{text_1} | {text_2}",
+            provider=AudioProviderId(self._provider.name),
+            voice="+".join(voice_parts) if voice_parts else None,
+            language=voice_1.language,
+            metadata=voice_1.metadata,
+        )
+
+    def synthesize_batch(
+        self,
+        requests: list[SynthesisRequest],
+        output_dir: Path,
+        merge_strategy: MergeStrategy = MergeStrategy.ONE_FILE_PER_INPUT,
+        pause_ms: int = 500,
+        on_result: Callable[[SynthesisResult], None] | None = None,
+        on_progress: Callable[[BatchProgress], None] | None = None,
+    ) -> list[SynthesisResult]:
+        """Synthesize multiple texts, merging from cached segments if asked.
+
+        ``on_result`` is called with each result in input order as soon
+        as it is ready, e.g. to start playing the first file while the
+        rest are still being synthesized.
+
+        ``on_progress`` is called with a :class:`BatchProgress` each time
+        an item (or, when merging, a segment) finishes. It is called on
+        worker threads, in completion order, and must not block.
+        """
+        cache = self._cache
+        progress = _ProgressTracker(len(requests), on_progress, cache is not None)
+        if requests and merge_strategy == MergeStrategy.ONE_FILE_PER_INPUT:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            return map_ordered(
+                progress.track(
+                    lambda r: self.synthesize(
+                        r, output_dir / generate_filename(r.text)
+                    ),
+                    _request_text,
+                ),
+                requests,
+                self._jobs,
+                key=lambda r: r.text,
+                on_result=on_result,
+            )
+        if cache is None or not requests:
+            results = super().synthesize_batch(
+                requests, output_dir, merge_strategy, pause_ms
+            )
+            if requests:
+                progress.finish(requests[-1].text)
+            return _notified(results, on_result)
+
+        key = composite_key(
+            "batch", [request_key(r, self._provider) for r in requests], pause_ms
+        )
+        combined_text = " | ".join(r.text for r in requests)
+        entry = self._stitched(
+            cache,
+            key,
+            lambda: map_ordered(
+                progress.track(lambda r: self._segment(cache, r), _request_text),
+                requests,
+                self._jobs,
+            ),
+            pause_ms,
+            self._meta("batch", combined_text, requests[0]),
+        )
+        progress.finish(requests[-1].text)
+        out_path = output_dir / generate_filename(combined_text, prefix="batch_")
+        cache.materialize(entry, out_path)
+
+        first = requests[0]
+        result = SynthesisResult(
+            path=out_path,
+            text=combined_text,
+            provider=AudioProviderId(self._provider.name),
+            voice=first.voice,
+            language=first.language,
+            metadata=first.metadata,
+        )
+        return _notified([result], on_result)
+
+    def synthesize_pair_batch(
+        self,
+        pairs: list[tuple[SynthesisRequest, SynthesisRequest]],
+        output_dir: Path,
+        merge_strategy: MergeStrategy = MergeStrategy.ONE_FILE_PER_INPUT,
+        pause_ms: int = 500,
+        on_result: Callable[[SynthesisResult], None] | None = None,
+        on_progress: Callable[[BatchProgress], None] | None = None,
+    ) -> list[SynthesisResult]:
+        """Synthesize multiple pairs, merging from cached pairs if asked.
+
+        ``on_result`` and ``on_progress`` are called as in
+        :meth:`synthesize_batch`.
+        """
+        cache = self._cache
+        progress = _ProgressTracker(len(pairs), on_progress, cache is not None)
+        if pairs and merge_strategy == MergeStrategy.ONE_FILE_PER_INPUT:
+            output_dir.mkdir(parents=True, exist_ok=True)
+            return map_ordered(
+                progress.track(
+                    lambda p: self.synthesize_pair(
+                        p[0].text,
+                        p[0],
+                        p[1].text,
+                        p[1],
+                        output_dir / _pair_filename(p),
+                        pause_ms,
+                    ),
+                    _pair_text,
+                ),
+                pairs,
+                self._jobs,
+                key=_pair_filename,
+                on_result=on_result,
+            )
+        if cache is None or not pairs:
+            results = super().synthesize_pair_batch(
+                pairs, output_dir, merge_strategy, pause_ms
+            )
+            if pairs:
+                progress.finish(_pair_text(pairs[-1]))
+            return _notified(results, on_result)
+
+        key = composite_key(
+            "pairs",
+            [pair_key(r1, r2, self._provider, pause_ms) for r1, r2 in pairs],
+            pause_ms,
+        )
+        all_texts = " | ".join(f"{r1.text}-{r2.text}" for r1, r2 in pairs)
+        entry = self._stitched(
+            cache,
+            key,
+            lambda: map_ordered(
+                progress.track(
+                    lambda p: self._pair_entry(cache, p[0], p[1], pause_ms),
+                    _pair_text,
+                ),
+                pairs,
+                self._jobs,
+            ),
+            pause_ms,
+            self._meta("pairs", all_texts),
+        )
+        progress.finish(_pair_text(pairs[-1]))
+        out_path = output_dir / generate_filename(all_texts, prefix="pairs_")
+        cache.materialize(entry, out_path)
+
+        result = SynthesisResult(
+            path=out_path,
+            text=all_texts,
+            provider=AudioProviderId(self._provider.name),
+            voice="mixed",
+            metadata=pairs[0][0].metadata,
+        )
+        return _notified([result], on_result)
+
+    def iter_batch(
+        self,
+        requests: Iterable[SynthesisRequest],
+        output_dir: Path,
+        *,
+        ordered: bool = True,
+    ) -> Iterator[tuple[int, SynthesisResult]]:
+        """Synthesize texts to one file each, yielding results as they are ready.
+
+        Like :meth:`synthesize_batch` with ``ONE_FILE_PER_INPUT``, but
+        ``requests`` is read lazily and ``(index, result)`` pairs come
+        back while later items are still running, so a batch of any
+        length runs in constant memory. Results are yielded in input
+        order, or with ``ordered=False`` as each item finishes.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return self._iter(
+            lambda r: self.synthesize(r, output_dir / generate_filename(r.text)),
+            requests,
+            ordered,
+        )
+
+    def iter_pair_batch(
+        self,
+        pairs: Iterable[tuple[SynthesisRequest, SynthesisRequest]],
+        output_dir: Path,
+        pause_ms: int = 500,
+        *,
+        ordered: bool = True,
+    ) -> Iterator[tuple[int, SynthesisResult]]:
+        """Synthesize pairs to one file each, yielding results as they are ready.
+
+        The pair counterpart of :meth:`iter_batch`.
+        """
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return self._iter(
+            lambda p: self.synthesize_pair(
+                p[0].text,
+                p[0],
+                p[1].text,
+                p[1],
+                output_dir / _pair_filename(p),
+                pause_ms,
+            ),
+            pairs,
+            ordered,
+        )
+
+    # -- Private helpers --------------------------------------------------
+
+    def _iter[T](
+        self,
+        fn: Callable[[T], SynthesisResult],
+        items: Iterable[T],
+        ordered: bool,
+    ) -> Iterator[tuple[int, SynthesisResult]]:
+        if ordered:
+            return enumerate(imap_ordered(fn, items, self._jobs))
+        return imap_completed(fn, items, self._jobs)
+
+    def _segment(self, cache: SynthesisCache, request: SynthesisRequest) -> Path:
+        """Return the raw provider audio for a request, synthesizing on a miss.
+
+        Concurrent misses for the same key share one provider call.
+        """
+        key = request_key(request, self._provider)
+
+        def fetch() -> Path:
+            entry = cache.get(key)
+            if entry is None:
+                misses = _item_misses.get()
+                if misses is not None:
+                    misses.append(key)
+                with cache.staging_path() as staged:
+                    self._provider.synthesize(request, staged)
+                    entry = cache.put(
+                        key, staged, self._meta("segment", request.text, request)
+                    )
+            return entry
+
+        return _entry_flights.do((cache.root, key), fetch)
+
+    def _pair_entry(
+        self,
+        cache: SynthesisCache,
+        request_1: SynthesisRequest,
+        request_2: SynthesisRequest,
+        pause_ms: int,
+    ) -> Path:
+        """Return the stitched pair entry, building it from segments on a miss.
+
+        Missing halves are synthesized concurrently.
+        """
+        return self._stitched(
+            cache,
+            pair_key(request_1, request_2, self._provider, pause_ms),
+            lambda: map_ordered(
+                lambda r: self._segment(cache, r), [request_1, request_2], jobs=2
+            ),
+            pause_ms,
+            self._meta("pair", f"{request_1.text} | {request_2.text}", request_1),
+        )
+
+    def _synthesize_uncached(
+        self, request: SynthesisRequest, output_path: Path
+    ) -> SynthesisResult:
+        """punt-vox's synthesis, padded by frame copy instead of a re-encode."""
+        with tempfile.TemporaryDirectory() as tmp:
+            raw = Path(tmp) / "raw.mp3"
+            result = self._provider.synthesize(request, raw)
+            with staged_output(output_path) as staged:
+                stitch_audio([raw], staged, 0)
+        return dataclasses.replace(result, path=output_path)
+
+    def _synthesize_pair_uncached(
+        self,
+        text_1: str,
+        voice_1: SynthesisRequest,
+        text_2: str,
+        voice_2: SynthesisRequest,
+        output_path: Path,
+        pause_ms: int,
+    ) -> SynthesisResult:
+        """punt-vox's pair synthesis, with both halves fetched concurrently."""
+        with tempfile.TemporaryDirectory() as tmp:
+            parts = [Path(tmp) / "part1.mp3", Path(tmp) / "part2.mp3"]
+            result_1, result_2 = map_ordered(
+                lambda i: self._provider.synthesize((voice_1, voice_2)[i], parts[i]),
+                [0, 1],
+                jobs=2,
+            )
+            with staged_output(output_path) as staged:
+                stitch_audio(parts, staged, pause_ms)
+
+        voice_parts = [v for v in (result_1.voice, result_2.voice) if v]
+        return SynthesisResult(
+            path=output_path,
+            text=f"{text_1} | {text_2}",
+            provider=result_1.provider,
+            voice="+".join(voice_parts) if voice_parts else None,
+            language=result_1.language,
+        )
+
+    def _synthesize_batch_merged(
+        self,
+        requests: list[SynthesisRequest],
+        output_dir: Path,
+        pause_ms: int,
+    ) -> list[SynthesisResult]:
+        """punt-vox's uncached merge, on this module's streaming stitcher."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f"seg_{i:04d}.mp3" for i in range(len(requests))]
+            results = map_ordered(
+                lambda i: self._provider.synthesize(requests[i], paths[i]),
+                range(len(requests)),
+                self._jobs,
+            )
+            combined_text = " | ".join(r.text for r in requests)
+            out_path = output_dir / generate_filename(combined_text, prefix="batch_")
+            with staged_output(out_path) as staged:
+                stitch_audio(paths, staged, pause_ms)
+
+        return [
+            SynthesisResult(
+                path=out_path,
+                text=combined_text,
+                provider=results[0].provider,
+                voice=results[0].voice or None,
+            )
+        ]
+
+    def _pair_batch_merged(
+        self,
+        pairs: list[tuple[SynthesisRequest, SynthesisRequest]],
+        output_dir: Path,
+        pause_ms: int,
+    ) -> list[SynthesisResult]:
+        """punt-vox's uncached pair merge, on the streaming stitcher."""
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f"pair_{i:04d}.mp3" for i in range(len(pairs))]
+            results = map_ordered(
+                lambda i: self.synthesize_pair(
+                    pairs[i][0].text,
+                    pairs[i][0],
+                    pairs[i][1].text,
+                    pairs[i][1],
+                    paths[i],
+                    pause_ms,
+                ),
+                range(len(pairs)),
+                self._jobs,
+            )
+            all_texts = " | ".join(f"{r1.text}-{r2.text}" for r1, r2 in pairs)
+            out_path = output_dir / generate_filename(all_texts, prefix="pairs_")
+            with staged_output(out_path) as staged:
+                stitch_audio(paths, staged, pause_ms)
+
+        return [
+            SynthesisResult(
+                path=out_path,
+                text=all_texts,
+                provider=results[0].provider,
+                voice="mixed",
+            )
+        ]
+
+    def _meta(
+        self, kind: str, text: str, request: SynthesisRequest | None = None
+    ) -> EntryMeta:
+        """Describe a cache entry for the index."""
+        return EntryMeta(
+            kind=kind,
+            text=text,
+            voice=(request.voice or self._provider.default_voice) if request else None,
+            language=request.language if request else None,
+            rate=request.rate if request else None,
+            provider=self._provider.name,
+            model=provider_model(self._provider),
+        )
+
+    @staticmethod
+    def _stitched(
+        cache: SynthesisCache,
+        key: str,
+        segments: Callable[[], list[Path]],
+        pause_ms: int,
+        meta: EntryMeta,
+    ) -> Path:
+        """Return a composite entry, stitching it from ``segments`` on a miss.
+
+        ``segments`` is only called on a miss, so a cached composite never
+        touches its parts.
+        """
+
+        def fetch() -> Path:
+            entry = cache.get(key)
+            if entry is None:
+                parts = segments()
+                check_cancelled()
+                with cache.staging_path() as staged:
+                    stitch_audio(parts, staged, pause_ms)
+                    entry = cache.put(key, staged, meta)
+            return entry
 
-__all__ = ["TTSClient", "split_text", "stitch_audio"]
+        return _entry_flights.do((cache.root, key), fetch)
@@ -0,0 +1,406 @@
+"""Size-budgeted eviction for the audio output and cache directories.
+
+The output directory (``TTS_OUTPUT_DIR``) and the synthesis cache grow
+with every new clip. :class:`CacheManager` keeps them under a byte
+budget by deleting the least recently (LRU) or least frequently (LFU)
+used audio first.
+
+Files are grouped by inode: a cache entry and the output files
+hard-linked to it share their bytes, so they are counted once and
+evicted together. Pinned cache keys (e.g. a curriculum's core
+vocabulary) are never evicted. Pins protect segment entries, the raw
+provider audio: clips, pairs and merges built from pinned segments may
+be evicted, but rebuilding them costs no API calls.
+
+Sweeps read their candidates from the cache's
+:class:`~langlearn_tts.index.AudioIndex`: each entry with its recorded
+outputs, its size, hit count and last access. They touch no directory,
+so a sweep costs the same with 100 files or 100,000. Every
+``reconcile_every`` sweeps (and on the first) the managed directories
+are walked instead. The walk drops index rows whose files are gone and
+finds audio the index does not know about, such as uncached outputs.
+Those files fall back to their mtime and count as never hit. Their
+total size is carried into the sweeps that follow.
+
+Only files under the managed directories are ever deleted: outputs the
+index recorded elsewhere (an explicit ``-o`` path) are left alone. A
+path is unlinked only while it is still the inode it was counted as, so
+an output overwritten since it was recorded survives.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any, cast
+
+from langlearn_tts.cache import SynthesisCache
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["CacheManager", "EvictionPolicy", "EvictionReport", "parse_size"]
+
+_PINS_FILE = "pins.json"
+
+# Staging files older than this are leftovers from crashed processes.
+_STALE_STAGING_SECONDS = 3600.0
+
+# Delay between sweeps while a backlog is being worked off.
+_BACKLOG_DELAY_SECONDS = 1.0
+
+_SIZE_RE = re.compile(r"^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(?:i?b)?\s*$", re.IGNORECASE)
+_SIZE_UNITS: dict[str, int] = {
+    "": 1,
+    "k": 1024,
+    "m": 1024**2,
+    "g": 1024**3,
+    "t": 1024**4,
+}
+
+
+def parse_size(raw: str) -> int:
+    """Parse a byte size such as ``500M``, ``2GB`` or ``1.5GiB``.
+
+    Raises:
+        ValueError: If the string is not a number with an optional
+            K/M/G/T suffix.
+    """
+    match = _SIZE_RE.match(raw)
+    if match is None:
+        msg = f"Invalid size '{raw}'. Expected a number with optional K/M/G/T suffix."
+        raise ValueError(msg)
+    number, unit = match.groups()
+    return int(float(number) * _SIZE_UNITS[unit.lower()])
+
+
+class EvictionPolicy(StrEnum):
+    """Order in which unpinned audio is evicted."""
+
+    LRU = "lru"
+    LFU = "lfu"
+
+
+@dataclass(frozen=True)
+class EvictionReport:
+    """Outcome of a single eviction sweep."""
+
+    total_bytes: int
+    evicted_files: int
+    evicted_bytes: int
+    limited: bool = False
+    """True when the per-sweep eviction limit stopped the sweep early."""
+
+    @property
+    def remaining_bytes(self) -> int:
+        return self.total_bytes - self.evicted_bytes
+
+
+@dataclass
+class _Inode:
+    size: int
+    last_access: float
+    paths: list[Path] = field(default_factory=lambda: [])
+    keys: list[str] = field(default_factory=lambda: [])
+    hits: int = 0
+    identity: tuple[int, int] | None = None
+    """``(st_dev, st_ino)`` when known; index rows leave it to :meth:`_evict`."""
+
+
+def _write_json(path: Path, payload: object) -> None:
+    """Write JSON atomically so concurrent readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staged = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    staged.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+    os.replace(staged, path)
+
+
+def _identity(path: Path) -> tuple[int, int] | None:
+    """Return ``(st_dev, st_ino)`` for ``path``, or None if it is gone."""
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_dev, st.st_ino
+
+
+def _read_json(path: Path) -> Any:  # pyright: ignore[reportExplicitAny]
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+class CacheManager:
+    """Keeps the audio output and cache directories under a byte budget.
+
+    A sweep evicts down to ``low_water`` times the budget, at most
+    ``max_evictions`` inodes at a time, so each pass stays short. Files
+    accessed within ``grace_seconds`` are skipped: they may be segments
+    of a stitch in progress. Every ``reconcile_every`` sweeps, starting
+    with the first, the directories are walked rather than read from the
+    index. :meth:`start` runs sweeps on a daemon thread, so eviction
+    never blocks synthesis.
+    """
+
+    def __init__(
+        self,
+        cache: SynthesisCache,
+        output_dir: Path,
+        max_bytes: int,
+        policy: EvictionPolicy = EvictionPolicy.LRU,
+        *,
+        grace_seconds: float = 300.0,
+        max_evictions: int = 500,
+        low_water: float = 0.9,
+        reconcile_every: int = 60,
+    ) -> None:
+        self._cache = cache
+        self._output_dir = output_dir
+        self._max_bytes = max_bytes
+        self._policy = policy
+        self._grace_seconds = grace_seconds
+        self._max_evictions = max_evictions
+        self._low_water = low_water
+        self._reconcile_every = max(reconcile_every, 1)
+        self._sweeps = 0
+        self._untracked_bytes = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    # -- Pinning ----------------------------------------------------------
+
+    def pinned(self) -> frozenset[str]:
+        """Return the pinned cache keys.
+
+        Read from disk on every call, so pins added by another process
+        (e.g. ``langlearn-tts cache pin``) apply to a running server.
+        """
+        raw = _read_json(self._cache.root / _PINS_FILE)
+        if not isinstance(raw, list):
+            return frozenset()
+        return frozenset(k for k in cast("list[object]", raw) if isinstance(k, str))
+
+    def pin(self, keys: Iterable[str]) -> int:
+        """Protect cache keys from eviction. Returns how many were new."""
+        with self._lock:
+            current = self.pinned()
+            updated = current | frozenset(keys)
+            _write_json(self._cache.root / _PINS_FILE, sorted(updated))
+        return len(updated) - len(current)
+
+    def unpin(self, keys: Iterable[str]) -> int:
+        """Allow cache keys to be evicted again. Returns how many were pinned."""
+        with self._lock:
+            current = self.pinned()
+            updated = current - frozenset(keys)
+            _write_json(self._cache.root / _PINS_FILE, sorted(updated))
+        return len(current) - len(updated)
+
+    # -- Sweeping ---------------------------------------------------------
+
+    def sweep(self) -> EvictionReport:
+        """Run one incremental eviction pass."""
+        with self._lock:
+            self._remove_stale_staging()
+            if self._sweeps % self._reconcile_every == 0:
+                inodes = self._reconcile()
+                total = sum(inode.size for inode in inodes)
+            else:
+                inodes = self._indexed()
+                total = sum(inode.size for inode in inodes) + self._untracked_bytes
+            self._sweeps += 1
+            if total <= self._max_bytes:
+                return EvictionReport(total, 0, 0)
+            return self._evict(inodes, total)
+
+    def start(self, interval: float = 60.0) -> None:
+        """Sweep every ``interval`` seconds on a background daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(interval,),
+            name="langlearn-tts-eviction",
+            daemon=True,
+        )
+        self._thread.start()
+        logger.info(
+            "Cache eviction started: budget=%d bytes, policy=%s",
+            self._max_bytes,
+            self._policy,
+        )
+
+    def stop(self) -> None:
+        """Stop the background thread and wait for the current sweep."""
+        thread = self._thread
+        if thread is None:
+            return
+        self._stop.set()
+        thread.join()
+        self._thread = None
+
+    # -- Private helpers --------------------------------------------------
+
+    def _run(self, interval: float) -> None:
+        while not self._stop.is_set():
+            delay = interval
+            try:
+                if self.sweep().limited:
+                    delay = _BACKLOG_DELAY_SECONDS
+            except OSError:
+                logger.exception("Cache eviction sweep failed")
+            self._stop.wait(delay)
+
+    def _evict(self, inodes: list[_Inode], total: int) -> EvictionReport:
+        pinned = self.pinned()
+        cutoff = time.time() - self._grace_seconds
+        candidates = [
+            inode
+            for inode in inodes
+            if inode.last_access < cutoff and pinned.isdisjoint(inode.keys)
+        ]
+        if self._policy == EvictionPolicy.LFU:
+            candidates.sort(key=lambda i: (i.hits, i.last_access))
+        else:
+            candidates.sort(key=lambda i: i.last_access)
+
+        target = int(self._max_bytes * self._low_water)
+        remaining = total
+        evicted: list[_Inode] = []
+        for inode in candidates:
+            if remaining <= target or len(evicted) >= self._max_evictions:
+                break
+            identity = inode.identity or _identity(inode.paths[0])
+            if identity is None:
+                continue  # deleted behind our back; reconcile drops the row
+            for path in inode.paths:
+                # A recorded output may since have been replaced by another file.
+                if _identity(path) == identity:
+                    path.unlink(missing_ok=True)
+            remaining -= inode.size
+            evicted.append(inode)
+            if not inode.keys:
+                self._untracked_bytes = max(self._untracked_bytes - inode.size, 0)
+
+        index = self._cache.index
+        index.remove(k for inode in evicted for k in inode.keys)
+        index.remove_outputs(p for inode in evicted for p in inode.paths)
+        evicted_files = len(evicted)
+
+        limited = remaining > target and evicted_files >= self._max_evictions
+        logger.info(
+            "Evicted %d files (%d bytes); %d of %d budget bytes in use",
+            evicted_files,
+            total - remaining,
+            remaining,
+            self._max_bytes,
+        )
+        return EvictionReport(total, evicted_files, total - remaining, limited)
+
+    def _roots(self) -> list[Path]:
+        roots = [self._output_dir]
+        if not self._cache.root.is_relative_to(self._output_dir):
+            roots.append(self._cache.root)
+        return roots
+
+    def _indexed(self) -> list[_Inode]:
+        """Group indexed entries with their outputs, without touching disk.
+
+        Outputs are hard links to their entry, so each group is one inode.
+        Outputs recorded outside the managed roots are not ours to evict.
+        """
+        roots = [root.absolute() for root in self._roots()]
+        return [
+            _Inode(
+                entry.size,
+                entry.last_access,
+                [
+                    entry.path,
+                    *(
+                        path
+                        for path in outputs
+                        if any(path.absolute().is_relative_to(r) for r in roots)
+                    ),
+                ],
+                [entry.key],
+                entry.hits,
+            )
+            for entry, outputs in self._cache.index.entries_with_outputs()
+        ]
+
+    def _reconcile(self) -> list[_Inode]:
+        """Walk the managed roots and bring the index in line with them."""
+        index = self._cache.index
+        usage = index.usage()
+        inodes = self._scan(usage)
+
+        # Forget index rows whose files were deleted behind our back.
+        live_keys = {k for inode in inodes for k in inode.keys}
+        index.remove(usage.keys() - live_keys)
+        self._untracked_bytes = sum(i.size for i in inodes if not i.keys)
+        logger.debug(
+            "Reconciled index: %d inodes, %d untracked bytes",
+            len(inodes),
+            self._untracked_bytes,
+        )
+        return inodes
+
+    def _scan(self, usage: dict[str, tuple[int, float]]) -> list[_Inode]:
+        """Group every MP3 under the managed roots by inode."""
+        staging = self._cache.staging_root
+        by_inode: dict[tuple[int, int], _Inode] = {}
+        for root in self._roots():
+            for dirpath, dirnames, filenames in os.walk(root):
+                current = Path(dirpath)
+                if current / staging.name == staging:
+                    dirnames[:] = [d for d in dirnames if d != staging.name]
+                for name in filenames:
+                    if not name.endswith(".mp3"):
+                        continue
+                    path = current / name
+                    try:
+                        st = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    identity = (st.st_dev, st.st_ino)
+                    inode = by_inode.setdefault(
+                        identity,
+                        _Inode(st.st_size, st.st_mtime, identity=identity),
+                    )
+                    inode.paths.append(path)
+                    key = self._cache.key_for(path)
+                    if key is not None:
+                        inode.keys.append(key)
+                        if key in usage:
+                            hits, last_access = usage[key]
+                            inode.hits += hits
+                            inode.last_access = max(inode.last_access, last_access)
+        return list(by_inode.values())
+
+    def _remove_stale_staging(self) -> None:
+        staging = self._cache.staging_root
+        if not staging.is_dir():
+            return
+        cutoff = time.time() - _STALE_STAGING_SECONDS
+        for child in staging.iterdir():
+            try:
+                if child.stat().st_mtime >= cutoff:
+                    continue
+            except FileNotFoundError:
+                continue
+            if child.is_dir():
+                shutil.rmtree(child, ignore_errors=True)
+            else:
+                child.unlink(missing_ok=True)
@@ -0,0 +1,283 @@
+"""SQLite index of synthesized audio.
+
+Every cache entry is recorded with what it contains (text, voice,
+language, rate, provider, model), its duration and byte size, when it
+was created and how often it was used. Output files materialized from
+an entry are recorded against its key. The cache, eviction and
+reporting all read from here instead of walking the audio directories;
+eviction walks them only in an occasional reconcile pass, to find files
+the index does not know about.
+
+The database runs in WAL mode, so the CLI and a running MCP server can
+read and write it concurrently.
+"""
+
+from __future__ import annotations
+
+import logging
+import sqlite3
+import threading
+import time
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
+
+from langlearn_tts.mp3 import duration_ms
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["AudioIndex", "EntryMeta", "IndexEntry"]
+
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    path TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    text TEXT,
+    voice TEXT,
+    language TEXT,
+    rate INTEGER,
+    provider TEXT,
+    model TEXT,
+    duration_ms INTEGER,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS entries_by_text ON entries (text, language, rate);
+CREATE INDEX IF NOT EXISTS entries_by_access ON entries (last_access);
+CREATE TABLE IF NOT EXISTS outputs (
+    path TEXT PRIMARY KEY,
+    key TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS outputs_by_key ON outputs (key);
+"""
+
+_ENTRY_COLUMNS = (
+    "key, path, kind, text, voice, language, rate, provider, model, "
+    "duration_ms, size, created_at, last_access, hits"
+)
+
+
+@dataclass(frozen=True)
+class EntryMeta:
+    """What a cache entry contains, as recorded in the index."""
+
+    kind: str = "segment"
+    text: str | None = None
+    voice: str | None = None
+    language: str | None = None
+    rate: int | None = None
+    provider: str | None = None
+    model: str | None = None
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """One indexed cache entry."""
+
+    key: str
+    path: Path
+    kind: str
+    text: str | None
+    voice: str | None
+    language: str | None
+    rate: int | None
+    provider: str | None
+    model: str | None
+    duration_ms: int | None
+    size: int
+    created_at: float
+    last_access: float
+    hits: int
+
+
+def _entry(row: sqlite3.Row) -> IndexEntry:
+    return IndexEntry(
+        key=row["key"],
+        path=Path(row["path"]),
+        kind=row["kind"],
+        text=row["text"],
+        voice=row["voice"],
+        language=row["language"],
+        rate=row["rate"],
+        provider=row["provider"],
+        model=row["model"],
+        duration_ms=row["duration_ms"],
+        size=row["size"],
+        created_at=row["created_at"],
+        last_access=row["last_access"],
+        hits=row["hits"],
+    )
+
+
+class AudioIndex:
+    """Persistent index of cache entries and the outputs linked to them.
+
+    One connection is shared by all threads of a process and serialized
+    with a lock; other processes coordinate through SQLite's WAL locking.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def record(self, key: str, path: Path, meta: EntryMeta | None = None) -> None:
+        """Record a newly stored entry, replacing any previous row."""
+        meta = meta if meta is not None else EntryMeta()
+        now = time.time()
+        self._execute(
+            f"INSERT OR REPLACE INTO entries ({_ENTRY_COLUMNS}) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)",
+            (
+                key,
+                str(path),
+                meta.kind,
+                meta.text,
+                meta.voice,
+                meta.language,
+                meta.rate,
+                meta.provider,
+                meta.model,
+                duration_ms(path),
+                path.stat().st_size,
+                now,
+                now,
+            ),
+        )
+
+    def touch(self, key: str) -> None:
+        """Count a cache hit on ``key``."""
+        self._execute(
+            "UPDATE entries SET hits = hits + 1, last_access = ? WHERE key = ?",
+            (time.time(), key),
+        )
+
+    def record_output(self, path: Path, key: str) -> None:
+        """Record that the output file at ``path`` holds entry ``key``."""
+        self._execute(
+            "INSERT OR REPLACE INTO outputs (path, key, created_at) VALUES (?, ?, ?)",
+            (str(path), key, time.time()),
+        )
+
+    def get(self, key: str) -> IndexEntry | None:
+        """Return the indexed entry for ``key``, if any."""
+        rows = self._query(
+            f"SELECT {_ENTRY_COLUMNS} FROM entries WHERE key = ?", (key,)
+        )
+        return _entry(rows[0]) if rows else None
+
+    def find(
+        self,
+        text: str,
+        *,
+        language: str | None = None,
+        rate: int | None = None,
+        voice: str | None = None,
+        kind: str = "segment",
+    ) -> list[IndexEntry]:
+        """Return entries for ``text``, optionally narrowed by the other fields.
+
+        ``find("Haus", language="de", rate=85)`` answers "do we already
+        have Haus in German at rate 85, from any voice?".
+        """
+        sql = f"SELECT {_ENTRY_COLUMNS} FROM entries WHERE text = ? AND kind = ?"
+        params: list[object] = [text, kind]
+        for column, value in (("language", language), ("rate", rate), ("voice", voice)):
+            if value is not None:
+                sql += f" AND {column} = ?"
+                params.append(value)
+        sql += " ORDER BY last_access DESC"
+        return [_entry(row) for row in self._query(sql, tuple(params))]
+
+    def outputs(self, key: str) -> list[Path]:
+        """Return the recorded output files materialized from ``key``."""
+        rows = self._query("SELECT path FROM outputs WHERE key = ?", (key,))
+        return [Path(row["path"]) for row in rows]
+
+    def entries_with_outputs(self) -> list[tuple[IndexEntry, list[Path]]]:
+        """Return every entry with the output files recorded against it."""
+        columns = ", ".join(f"e.{c}" for c in _ENTRY_COLUMNS.split(", "))
+        rows = self._query(
+            f"SELECT {columns}, o.path AS output FROM entries e "
+            "LEFT JOIN outputs o ON o.key = e.key ORDER BY e.key",
+            (),
+        )
+        grouped: dict[str, tuple[IndexEntry, list[Path]]] = {}
+        for row in rows:
+            key = row["key"]
+            if key not in grouped:
+                grouped[key] = (_entry(row), [])
+            if row["output"] is not None:
+                grouped[key][1].append(Path(row["output"]))
+        return list(grouped.values())
+
+    def usage(self) -> dict[str, tuple[int, float]]:
+        """Return ``(hits, last_access)`` for every indexed key."""
+        rows = self._query("SELECT key, hits, last_access FROM entries", ())
+        return {row["key"]: (row["hits"], row["last_access"]) for row in rows}
+
+    def remove(self, keys: Iterable[str]) -> None:
+        """Forget entries and their recorded outputs."""
+        batch = [(key,) for key in keys]
+        if not batch:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("DELETE FROM entries WHERE key = ?", batch)
+                conn.executemany("DELETE FROM outputs WHERE key = ?", batch)
+
+    def remove_outputs(self, paths: Iterable[Path]) -> None:
+        """Forget output files that no longer exist."""
+        batch = [(str(path),) for path in paths]
+        if not batch:
+            return
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.executemany("DELETE FROM outputs WHERE path = ?", batch)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # -- Private helpers --------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database on first use. Caller must hold the lock."""
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10.0, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != _SCHEMA_VERSION:
+                with conn:
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+                logger.debug("Initialized audio index at %s", self._path)
+            self._conn = conn
+        return self._conn
+
+    def _execute(self, sql: str, params: tuple[object, ...]) -> None:
+        with self._lock:
+            conn = self._connect()
+            with conn:
+                conn.execute(sql, params)
+
+    def _query(self, sql: str, params: tuple[object, ...]) -> list[sqlite3.Row]:
+        with self._lock:
+            return self._connect().execute(sql, params).fetchall()
@@ -0,0 +1,224 @@
+"""Background jobs for long MCP batch exports.
+
+A tutor's end-of-session export can take longer than an MCP client is
+willing to wait for one tool call. :class:`JobQueue` accepts a batch,
+returns a job ID at once, and runs the batch on a worker thread; the
+client polls for status and fetches the result when it is done.
+
+Each job is persisted as ``<root>/<job id>.json``, written atomically on
+every state change. Jobs that were queued or running when the server
+stopped are re-queued on the next start (the synthesis cache makes the
+re-run cheap for items already done). Finished jobs are kept for
+``retention_seconds`` so a client can still collect the result.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field
+from enum import StrEnum
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["DEFAULT_RETENTION_SECONDS", "Job", "JobQueue", "JobStatus"]
+
+DEFAULT_RETENTION_SECONDS = 7 * 24 * 60 * 60
+
+type JobRunner = Callable[[str, dict[str, Any]], str]  # pyright: ignore[reportExplicitAny]
+
+
+class JobStatus(StrEnum):
+    """Lifecycle of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    @property
+    def finished(self) -> bool:
+        return self in (JobStatus.DONE, JobStatus.FAILED)
+
+
+@dataclass
+class Job:
+    """One submitted batch: which tool to run, with what, and how it went."""
+
+    id: str
+    tool: str
+    arguments: dict[str, Any]  # pyright: ignore[reportExplicitAny]
+    status: JobStatus = JobStatus.QUEUED
+    created_at: float = field(default_factory=time.time)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: str | None = None
+    error: str | None = None
+
+    def summary(self) -> dict[str, object]:
+        """Everything but the arguments and result, for status reports."""
+        return {
+            "job_id": self.id,
+            "tool": self.tool,
+            "status": str(self.status),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class JobQueue:
+    """Persistent FIFO of jobs, run one at a time on a worker thread.
+
+    Each job is a batch whose items already run concurrently (up to
+    ``TTS_JOBS``), so running jobs one after another keeps provider load
+    at the configured level however many are submitted.
+
+    Args:
+        root: Directory holding one JSON file per job.
+        runner: Called as ``runner(tool, arguments)`` on the worker
+            thread; its return value becomes the job's result. An
+            exception marks the job failed with its message.
+        retention_seconds: How long finished jobs are kept.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        runner: JobRunner,
+        retention_seconds: float = DEFAULT_RETENTION_SECONDS,
+    ) -> None:
+        self._root = root
+        self._runner = runner
+        self._retention_seconds = retention_seconds
+        self._lock = threading.Lock()
+        self._jobs: dict[str, Job] = {}
+        self._pending: queue.Queue[str | None] = queue.Queue()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def root(self) -> Path:
+        return self._root
+
+    def submit(self, tool: str, arguments: dict[str, Any]) -> Job:  # pyright: ignore[reportExplicitAny]
+        """Persist and enqueue a new job."""
+        job = Job(id=uuid.uuid4().hex, tool=tool, arguments=arguments)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._save(job)
+        self._pending.put(job.id)
+        logger.info("Queued job %s (%s)", job.id, tool)
+        return job
+
+    def get(self, job_id: str) -> Job:
+        """Return a job by ID.
+
+        Raises:
+            ValueError: If no such job exists (or it has expired).
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is None:
+            msg = f"Unknown job {job_id!r}."
+            raise ValueError(msg)
+        return job
+
+    def start(self) -> None:
+        """Load persisted jobs, re-queue unfinished ones and start the worker."""
+        if self._thread is not None:
+            return
+        for job in self._load():
+            if not job.status.finished:
+                job.status = JobStatus.QUEUED
+                job.started_at = None
+                self._pending.put(job.id)
+        self._thread = threading.Thread(
+            target=self._run, name="langlearn-tts-jobs", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Stop the worker after its current job.
+
+        Jobs still queued stay persisted and resume on the next start.
+        """
+        if self._thread is None:
+            return
+        self._pending.put(None)
+        self._thread.join(timeout)
+        self._thread = None
+
+    # -- Private helpers --------------------------------------------------
+
+    def _run(self) -> None:
+        while (job_id := self._pending.get()) is not None:
+            with self._lock:
+                job = self._jobs.get(job_id)
+                if job is None or job.status != JobStatus.QUEUED:
+                    continue
+                job.status = JobStatus.RUNNING
+                job.started_at = time.time()
+                self._save(job)
+            try:
+                result = self._runner(job.tool, job.arguments)
+            except Exception as exc:  # the job records any failure
+                logger.warning("Job %s failed: %s", job.id, exc)
+                self._finish(
+                    job, JobStatus.FAILED, error=str(exc) or type(exc).__name__
+                )
+            else:
+                self._finish(job, JobStatus.DONE, result=result)
+
+    def _finish(
+        self,
+        job: Job,
+        status: JobStatus,
+        *,
+        result: str | None = None,
+        error: str | None = None,
+    ) -> None:
+        with self._lock:
+            job.status = status
+            job.result = result
+            job.error = error
+            job.finished_at = time.time()
+            self._save(job)
+        logger.info("Job %s %s", job.id, status)
+
+    def _load(self) -> list[Job]:
+        """Read persisted jobs, dropping expired and unreadable ones."""
+        now = time.time()
+        loaded: list[Job] = []
+        for path in sorted(self._root.glob("*.json")):
+            try:
+                raw = json.loads(path.read_text(encoding="utf-8"))
+                job = Job(**raw)
+                job.status = JobStatus(job.status)
+            except (OSError, ValueError, KeyError, TypeError) as exc:
+                logger.warning("Ignoring unreadable job file %s: %s", path, exc)
+                continue
+            finished_at = job.finished_at
+            if finished_at is not None and now - finished_at > self._retention_seconds:
+                path.unlink(missing_ok=True)
+                continue
+            loaded.append(job)
+        loaded.sort(key=lambda job: job.created_at)
+        with self._lock:
+            return [self._jobs.setdefault(job.id, job) for job in loaded]
+
+    def _save(self, job: Job) -> None:
+        """Write a job file atomically. Caller must hold the lock."""
+        self._root.mkdir(parents=True, exist_ok=True)
+        path = self._root / f"{job.id}.json"
+        staged = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        staged.write_text(json.dumps(asdict(job), sort_keys=True), encoding="utf-8")
+        os.replace(staged, path)
@@ -0,0 +1,254 @@
+"""MP3 frame-header parsing and frame-level concatenation.
+
+Reads MPEG audio frame headers directly, so durations are known without
+decoding or spawning ffmpeg. Only the header of each frame is inspected.
+
+:func:`concat` joins MP3 files by copying their frames, with silent
+frames for the pauses, so stitching never decodes or re-encodes audio.
+"""
+
+from __future__ import annotations
+
+import functools
+from collections.abc import Sequence
+from pathlib import Path
+
+__all__ = ["concat", "duration_ms", "stream_format"]
+
+# Bitrates in kbit/s for Layer III, indexed by the header's bitrate index.
+_BITRATES_V1 = (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320)
+_BITRATES_V2 = (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160)
+
+# Sample rates per MPEG version bits (0 = 2.5, 2 = 2, 3 = 1).
+_SAMPLE_RATES = {
+    0: (11025, 12000, 8000),
+    2: (22050, 24000, 16000),
+    3: (44100, 48000, 32000),
+}
+
+# Encoders that write the LAME extension after the Xing/Info header.
+_LAME_ENCODERS = (b"LAME", b"Lavc", b"Lavf")
+
+_ID3V1_SIZE = 128
+
+
+def _skip_id3v2(data: bytes) -> int:
+    if len(data) < 10 or data[:3] != b"ID3":
+        return 0
+    size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+    footer = 10 if data[5] & 0x10 else 0
+    return 10 + size + footer
+
+
+def _frame_info(header: bytes) -> tuple[int, int, int] | None:
+    """Return ``(frame_length, samples, sample_rate)`` for a Layer III header."""
+    if header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version = (header[1] >> 3) & 0x03
+    layer = (header[1] >> 1) & 0x03
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x03
+    if version == 1 or layer != 1 or rate_index == 3:
+        return None
+    if bitrate_index in (0, 15):
+        return None
+    padding = (header[2] >> 1) & 0x01
+    sample_rate = _SAMPLE_RATES[version][rate_index]
+    if version == 3:
+        bitrate = _BITRATES_V1[bitrate_index] * 1000
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+    bitrate = _BITRATES_V2[bitrate_index] * 1000
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate
+
+
+def _info_frame_gap(frame: bytes) -> int | None:
+    """Inspect a possible Xing/Info header frame, which carries no audio.
+
+    Returns None for an ordinary audio frame. Otherwise returns the
+    encoder delay plus padding, in samples, from the LAME extension
+    (0 if absent): decoders trim these so the clip plays gaplessly.
+    """
+    for tag in (b"Xing", b"Info"):
+        offset = frame.find(tag)
+        if offset != -1:
+            break
+    else:
+        return 0 if b"VBRI" in frame else None
+
+    flags = int.from_bytes(frame[offset + 4 : offset + 8], "big")
+    lame = offset + 8
+    for bit, size in ((0x1, 4), (0x2, 4), (0x4, 100), (0x8, 4)):
+        if flags & bit:
+            lame += size
+    gap = frame[lame + 21 : lame + 24]
+    if frame[lame : lame + 4] not in _LAME_ENCODERS or len(gap) != 3:
+        return 0
+    delay = (gap[0] << 4) | (gap[1] >> 4)
+    padding = ((gap[1] & 0x0F) << 8) | gap[2]
+    return delay + padding
+
+
+def duration_ms(path: Path) -> int | None:
+    """Return the playing time of an MP3 file, or None if it has no frames.
+
+    Bytes that are not a valid Layer III frame header are skipped, so
+    leading junk or a truncated final frame does not abort the scan.
+    """
+    data = path.read_bytes()
+    pos = _skip_id3v2(data)
+    samples = 0
+    sample_rate = 0
+    gap = 0
+    first = True
+    while pos + 4 <= len(data):
+        info = _frame_info(data[pos : pos + 4])
+        if info is None:
+            pos += 1
+            continue
+        length, frame_samples, sample_rate = info
+        info_gap = _info_frame_gap(data[pos : pos + length]) if first else None
+        if info_gap is None:
+            samples += frame_samples
+        else:
+            gap = info_gap
+        first = False
+        pos += length
+    if samples == 0:
+        return None
+    return round(max(samples - gap, 0) * 1000 / sample_rate)
+
+
+def stream_format(data: bytes) -> tuple[int, int] | None:
+    """Return ``(sample_rate, channels)`` of MP3 data.
+
+    Only the frame after any ID3v2 tag is read. Returns None unless the
+    data starts with a valid Layer III frame there, so WAV and other
+    formats are never mistaken for MP3.
+    """
+    pos = _skip_id3v2(data)
+    header = data[pos : pos + 4]
+    if len(header) < 4:
+        return None
+    info = _frame_info(header)
+    if info is None:
+        return None
+    return info[2], _layout(header)[2]
+
+
+def _audio_runs(data: bytes) -> tuple[list[tuple[int, int]], int]:
+    """Locate the audio frames in ``data``.
+
+    Returns:
+        ``(runs, gap)``: the ``(start, end)`` byte ranges of the audio
+        frames, adjacent frames forming one range, and the encoder delay
+        plus padding in samples from the Xing/Info header (0 without
+        one). ID3v2 and ID3v1 tags, the header frame and any bytes
+        between frames are left out of the ranges.
+    """
+    pos = _skip_id3v2(data)
+    end = len(data)
+    if end - pos >= _ID3V1_SIZE and data[end - _ID3V1_SIZE : end - 125] == b"TAG":
+        end -= _ID3V1_SIZE
+    runs: list[tuple[int, int]] = []
+    gap = 0
+    first = True
+    while pos + 4 <= end:
+        info = _frame_info(data[pos : pos + 4])
+        if info is None or pos + info[0] > end:
+            pos += 1
+            continue
+        length = info[0]
+        info_gap = _info_frame_gap(data[pos : pos + length]) if first else None
+        if info_gap is not None:
+            gap = info_gap
+        elif runs and runs[-1][1] == pos:
+            runs[-1] = (runs[-1][0], pos + length)
+        else:
+            runs.append((pos, pos + length))
+        first = False
+        pos += length
+    return runs, gap
+
+
+def _layout(header: bytes) -> tuple[int, int, int]:
+    """Return ``(MPEG version, sample-rate index, channels)`` of a frame."""
+    channels = 1 if header[3] >> 6 == 3 else 2
+    return (header[1] >> 3) & 0x03, (header[2] >> 2) & 0x03, channels
+
+
+@functools.cache
+def _silent_frame(header: bytes) -> bytes:
+    """Encode one frame of silence in the format of ``header``.
+
+    All-zero side information means no main data and no coded values, so
+    any Layer III decoder outputs silence. The frame has no CRC and no
+    padding byte, and leaves nothing in the bit reservoir.
+    """
+    silent = bytearray(header)
+    silent[1] |= 0x01
+    silent[2] &= 0xFD
+    info = _frame_info(bytes(silent))
+    assert info is not None  # header is a valid frame header
+    return bytes(silent) + bytes(info[0] - 4)
+
+
+def concat(
+    segments: Sequence[Path],
+    output_path: Path,
+    pause_ms: int = 0,
+    trailing_ms: int = 0,
+) -> bool:
+    """Join MP3 files frame by frame, with silence between them.
+
+    Audio frames are copied as they are. ID3 tags and Xing/Info header
+    frames, which describe a single file, are dropped. Each pause (and
+    the trailing silence) is a run of silent frames in the segments'
+    format. Decoders can no longer trim the encoder delay and padding
+    the header recorded, so each run is shortened by that of the
+    segment before it; the total length matches a decoded stitch to
+    within a frame (26 ms at 44.1 kHz).
+
+    Returns:
+        True once ``output_path`` is written. False, writing nothing,
+        if a segment has no MP3 frames or segments differ in sample rate
+        or channel count; the caller should then decode and re-encode.
+
+    Raises:
+        FileNotFoundError: If a segment does not exist.
+    """
+    # Two passes, so only one segment is held in memory at a time however
+    # many are merged: check every layout first, then copy frames.
+    parts: list[tuple[list[tuple[int, int]], int]] = []
+    reference = b""
+    for path in segments:
+        data = path.read_bytes()
+        runs, gap = _audio_runs(data)
+        if not runs:
+            return False
+        header = data[runs[0][0] : runs[0][0] + 4]
+        if not reference:
+            reference = header
+        elif _layout(header) != _layout(reference):
+            return False
+        parts.append((runs, gap))
+    if not parts:
+        return False
+
+    silence = _silent_frame(reference)
+    info = _frame_info(reference)
+    assert info is not None  # reference is the first frame found
+    _, frame_samples, sample_rate = info
+
+    def silent(ms: int, gap: int) -> bytes:
+        samples = ms * sample_rate / 1000 - gap
+        return silence * max(round(samples / frame_samples), 0)
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("wb") as out:
+        for i, (path, (runs, gap)) in enumerate(zip(segments, parts, strict=True)):
+            view = memoryview(path.read_bytes())
+            for start, end in runs:
+                out.write(view[start:end])
+            last = i == len(parts) - 1
+            out.write(silent(trailing_ms if last else pause_ms, gap))
+    return True
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import asyncio
 import os
+import uuid
+from collections.abc import AsyncIterable, Generator, Iterable
+from contextlib import contextmanager
 from pathlib import Path
 
 from punt_vox.types import AudioRequest as SynthesisRequest, generate_filename
@@ -24,6 +28,19 @@ def default_output_dir() -> Path:
     return Path.home() / "langlearn-audio"
 
 
+def default_cache_dir() -> Path:
+    """Resolve the synthesis cache directory from environment or fallback.
+
+    Resolution order: ``TTS_CACHE_DIR`` env var → ``<output dir>/.cache``.
+    Keeping the cache under the output directory by default puts both on
+    one filesystem, so cached clips are hard-linked rather than copied.
+    """
+    env_dir = os.environ.get("TTS_CACHE_DIR")
+    if env_dir:
+        return expand_path(env_dir)
+    return default_output_dir() / ".cache"
+
+
 def resolve_output_path(request: SynthesisRequest) -> Path:
     """Resolve output path for a synthesis request."""
     metadata = request.metadata
@@ -40,3 +57,46 @@ def resolve_output_path(request: SynthesisRequest) -> Path:
 
     path.parent.mkdir(parents=True, exist_ok=True)
     return path
+
+
+# Bytes requested per read when copying a provider's audio stream.
+STREAM_CHUNK_BYTES = 64 * 1024
+
+
+@contextmanager
+def staged_output(path: Path) -> Generator[Path]:
+    """Yield a scratch path beside ``path``; move it into place on success.
+
+    Anyone reading ``path`` sees the previous file or the complete new
+    one, never a partial write. The scratch file is removed if the block
+    raises.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    staged = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        yield staged
+        os.replace(staged, path)
+    finally:
+        staged.unlink(missing_ok=True)
+
+
+def write_chunks(path: Path, chunks: Iterable[bytes]) -> None:
+    """Append ``chunks`` to ``path`` as they arrive, one in memory at a time."""
+    with path.open("wb") as f:
+        for chunk in chunks:
+            f.write(chunk)
+
+
+async def write_chunks_async(path: Path, chunks: AsyncIterable[bytes]) -> None:
+    """Like :func:`write_chunks` for an async stream, without blocking the loop.
+
+    The file is created, written and closed on worker threads, one chunk
+    at a time, so a slow disk never stalls other requests on the loop.
+    """
+    await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+    f = await asyncio.to_thread(path.open, "wb")
+    try:
+        async for chunk in chunks:
+            await asyncio.to_thread(f.write, chunk)
+    finally:
+        await asyncio.to_thread(f.close)
@@ -0,0 +1,86 @@
+"""Sequential audio playback for ``auto_play``.
+
+Files are played one after another on a background thread. A batch can
+start playing its first item while later items are still being
+synthesized, and clips never talk over each other.
+
+Clips queued at :attr:`~langlearn_tts.ratelimit.Priority.INTERACTIVE`
+jump ahead of any batch clips still waiting, so a single ``synthesize``
+plays as soon as the current clip ends rather than after the rest of a
+batch.
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import queue
+import subprocess
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+from langlearn_tts.ratelimit import Priority
+
+logger = logging.getLogger(__name__)
+
+__all__ = ["AudioPlayer"]
+
+
+class AudioPlayer:
+    """Plays queued audio files one at a time, each after the last has finished.
+
+    Files play by priority, then in the order queued. The file playing
+    is never cut short.
+
+    Args:
+        command: Player command; the file path is appended. Defaults to
+            macOS ``afplay``.
+    """
+
+    def __init__(self, command: Sequence[str] = ("afplay",)) -> None:
+        self._command = list(command)
+        self._queue: queue.PriorityQueue[tuple[Priority, int, Path]] = (
+            queue.PriorityQueue()
+        )
+        self._order = itertools.count()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def play(self, path: Path, level: Priority = Priority.INTERACTIVE) -> None:
+        """Queue ``path`` to play after everything queued at ``level`` or above.
+
+        Args:
+            path: Audio file to play.
+            level: ``INTERACTIVE`` files play before queued ``BATCH`` ones.
+        """
+        self._queue.put((level, next(self._order), path))
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name="langlearn-tts-player", daemon=True
+                )
+                self._thread.start()
+
+    def wait(self) -> None:
+        """Block until every queued file has played."""
+        self._queue.join()
+
+    # -- Private helpers --------------------------------------------------
+
+    def _run(self) -> None:
+        while True:
+            _, _, path = self._queue.get()
+            try:
+                subprocess.run(
+                    [*self._command, str(path)],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                    check=False,
+                )
+            except FileNotFoundError:
+                logger.warning(
+                    "%s not found — auto-play requires macOS", self._command[0]
+                )
+            finally:
+                self._queue.task_done()
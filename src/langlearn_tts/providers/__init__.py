@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import os
+import threading
 from typing import TYPE_CHECKING
 
 from punt_vox.providers import DEFAULT_VOICES, format_voice_hint
@@ -13,10 +14,23 @@ if TYPE_CHECKING:
 __all__ = [
     "DEFAULT_VOICES",
     "auto_detect_provider",
+    "clear_shared_providers",
     "format_voice_hint",
     "get_provider",
+    "shared_provider",
 ]
 
+# Environment that provider clients read at construction: credentials,
+# regions, endpoints and the model. A change invalidates shared instances.
+_ENV_PREFIXES = ("AWS_", "OPENAI_", "ELEVENLABS_")
+_ENV_KEYS = frozenset({"TTS_PROVIDER", "TTS_MODEL"})
+
+type _Fingerprint = tuple[tuple[str, str], ...]
+type _RegistryKey = tuple[str, tuple[tuple[str, str | None], ...]]
+
+_shared: dict[_RegistryKey, tuple[_Fingerprint, TTSProvider]] = {}
+_shared_lock = threading.Lock()
+
 
 def auto_detect_provider() -> str:
     """Detect the provider from environment.
@@ -38,7 +52,8 @@ def get_provider(name: str | None = None, **kwargs: str | None) -> TTSProvider:
 
     Returns langlearn-tts subclasses (not punt-vox base classes) so that
     ``generate_audio``/``generate_audios`` use langlearn-specific output
-    path resolution (``~/langlearn-audio``).
+    path resolution (``~/langlearn-audio``). The provider's voice catalog
+    is seeded from its on-disk snapshot (see :mod:`langlearn_tts.voices`).
 
     Args:
         name: Provider name (e.g. 'polly', 'openai'). If None, auto-detects.
@@ -53,13 +68,62 @@ def get_provider(name: str | None = None, **kwargs: str | None) -> TTSProvider:
     from langlearn_tts.providers.elevenlabs import ElevenLabsProvider
     from langlearn_tts.providers.openai import OpenAIProvider
     from langlearn_tts.providers.polly import PollyProvider
+    from langlearn_tts.voices import warm_voice_catalog
 
     resolved = name.lower() if name is not None else auto_detect_provider()
+    provider: TTSProvider
     if resolved == "polly":
-        return PollyProvider(**kwargs)  # type: ignore[arg-type]
-    if resolved == "openai":
-        return OpenAIProvider(**kwargs)  # type: ignore[arg-type]
-    if resolved == "elevenlabs":
-        return ElevenLabsProvider(**kwargs)
-    msg = f"Unknown provider {resolved!r}. Choose from: polly, openai, elevenlabs."
-    raise ValueError(msg)
+        provider = PollyProvider(**kwargs)  # type: ignore[arg-type]
+    elif resolved == "openai":
+        provider = OpenAIProvider(**kwargs)  # type: ignore[arg-type]
+    elif resolved == "elevenlabs":
+        provider = ElevenLabsProvider(**kwargs)
+    else:
+        msg = f"Unknown provider {resolved!r}. Choose from: polly, openai, elevenlabs."
+        raise ValueError(msg)
+    warm_voice_catalog(provider)
+    return provider
+
+
+def shared_provider(name: str | None = None, **kwargs: str | None) -> TTSProvider:
+    """Return a process-lifetime provider instance, creating it on first use.
+
+    Instances are keyed by provider name and options, so repeated calls
+    reuse the same boto3 / OpenAI / ElevenLabs client and its warm
+    keep-alive connections. An instance is replaced when the provider
+    environment (credentials, region, endpoint, model) has changed since
+    it was created.
+
+    Args:
+        name: Provider name (e.g. 'polly', 'openai'). If None, auto-detects.
+        **kwargs: Provider-specific options (e.g. model='tts-1-hd').
+
+    Raises:
+        ValueError: If the provider name is not registered.
+    """
+    resolved = name.lower() if name is not None else auto_detect_provider()
+    key: _RegistryKey = (resolved, tuple(sorted(kwargs.items())))
+    fingerprint = _env_fingerprint()
+    with _shared_lock:
+        entry = _shared.get(key)
+        if entry is not None and entry[0] == fingerprint:
+            return entry[1]
+        provider = get_provider(resolved, **kwargs)
+        _shared[key] = (fingerprint, provider)
+        return provider
+
+
+def clear_shared_providers() -> None:
+    """Drop every shared provider instance."""
+    with _shared_lock:
+        _shared.clear()
+
+
+def _env_fingerprint() -> _Fingerprint:
+    return tuple(
+        sorted(
+            (k, v)
+            for k, v in os.environ.items()
+            if k.startswith(_ENV_PREFIXES) or k in _ENV_KEYS
+        )
+    )
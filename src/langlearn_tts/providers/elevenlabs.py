@@ -1,26 +1,72 @@
 """ElevenLabs TTS provider — re-exported from punt-vox.
 
 Subclass overrides generate_audio/generate_audios to use
-langlearn-tts output path resolution (~/langlearn-audio default).
+langlearn-tts output path resolution (~/langlearn-audio default);
+generate_audios runs up to ``TTS_JOBS`` requests at once. Every API call
+is paced by the shared per-provider limiter (``TTS_RATE_LIMITS``).
+The audio stream is written to a staged file and renamed into place when
+complete.
+
+:class:`AsyncElevenLabsProvider` is the same provider on the SDK's async
+client, for callers that run many requests from one event loop. It shares
+the sync provider's voice catalog (and its on-disk snapshot) and voice
+settings.
 """
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import logging
+import os
+import tempfile
 from collections.abc import Sequence
+from pathlib import Path
+from typing import Any
 
-from langlearn_tts.output import resolve_output_path
-from langlearn_tts.types import SynthesisRequest, SynthesisResult
+import punt_vox.providers.elevenlabs as _vox_elevenlabs
+from langlearn_tts.cache import provider_model
+from langlearn_tts.concurrency import default_jobs, gather_ordered, map_ordered
+from langlearn_tts.core import stitch_audio
+from langlearn_tts.output import (
+    resolve_output_path,
+    staged_output,
+    write_chunks_async,
+)
+from langlearn_tts.ratelimit import limiter_for
+from langlearn_tts.types import AudioProviderId, SynthesisRequest, SynthesisResult
+from langlearn_tts.voices import (
+    VoiceCatalog,
+    catalog_path,
+    elevenlabs_voices,
+    merge_voices,
+)
+from punt_vox.core import split_text
 from punt_vox.providers.elevenlabs import (
+    _DEFAULT_CHAR_LIMIT,  # pyright: ignore[reportPrivateUsage]
+    _DEFAULT_MODEL,  # pyright: ignore[reportPrivateUsage]
+    _MODEL_CHAR_LIMITS,  # pyright: ignore[reportPrivateUsage]
+    _VOICE_ID_RE,  # pyright: ignore[reportPrivateUsage]
     VOICES,
     ElevenLabsProvider as _ElevenLabsProvider,
 )
+from punt_vox.types import VoiceNotFoundError
+
+logger = logging.getLogger(__name__)
 
-__all__ = ["VOICES", "ElevenLabsProvider"]
+__all__ = ["VOICES", "AsyncElevenLabsProvider", "ElevenLabsProvider"]
 
 
 class ElevenLabsProvider(_ElevenLabsProvider):
     """ElevenLabs TTS provider with langlearn-tts output path resolution."""
 
+    def synthesize(
+        self, request: SynthesisRequest, output_path: Path
+    ) -> SynthesisResult:
+        with staged_output(output_path) as staged:
+            result = super().synthesize(request, staged)
+        return dataclasses.replace(result, path=output_path)
+
     def generate_audio(self, request: SynthesisRequest) -> SynthesisResult:
         output_path = resolve_output_path(request)
         return self.synthesize(request, output_path)
@@ -28,4 +74,189 @@ class ElevenLabsProvider(_ElevenLabsProvider):
     def generate_audios(
         self, requests: Sequence[SynthesisRequest]
     ) -> list[SynthesisResult]:
-        return [self.generate_audio(request) for request in requests]
+        paths = [resolve_output_path(request) for request in requests]
+        return map_ordered(
+            lambda item: self.synthesize(*item),
+            list(zip(requests, paths, strict=True)),
+            default_jobs(),
+            key=lambda item: item[1],
+        )
+
+    def _single_synthesize(
+        self,
+        text: str,
+        output_path: Path,
+        voice_id: str,
+        request: SynthesisRequest,
+    ) -> None:
+        """punt-vox's single API call, under its own limiter slot.
+
+        Long text is split into chunks of one call each, so each chunk is
+        paced on its own.
+        """
+        with limiter_for(self.name, provider_model(self)).acquire():
+            super()._single_synthesize(text, output_path, voice_id, request)
+
+
+class AsyncElevenLabsProvider:
+    """ElevenLabs TTS on ``elevenlabs.AsyncElevenLabs``.
+
+    Model selection, voice resolution and output match
+    :class:`ElevenLabsProvider`, but synthesis methods are coroutines.
+    All requests from an instance share the client's HTTP connection
+    pool, so many can be in flight from one event loop without a thread
+    each. Each API call draws from the same rate limiter (and so the
+    same plan concurrency cap) as the sync provider.
+
+    This is not a :class:`~langlearn_tts.types.TTSProvider`; the sync
+    ``TTSClient`` cannot drive it.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        client: Any | None = None,  # pyright: ignore[reportExplicitAny]
+    ) -> None:
+        self._model = model or os.environ.get("TTS_MODEL") or _DEFAULT_MODEL
+        if client is not None:
+            self._client: Any = client  # pyright: ignore[reportExplicitAny]
+        else:
+            from elevenlabs import AsyncElevenLabs  # pyright: ignore[reportMissingTypeStubs]
+
+            self._client = AsyncElevenLabs()  # pyright: ignore[reportUnknownMemberType]
+        self._catalog = VoiceCatalog(self, catalog_path(self.name))
+        self._catalog_seeded = False
+        self._voices_lock = asyncio.Lock()
+
+    @property
+    def name(self) -> str:
+        return "elevenlabs"
+
+    @property
+    def default_voice(self) -> str:
+        return "matilda"
+
+    async def synthesize(
+        self, request: SynthesisRequest, output_path: Path
+    ) -> SynthesisResult:
+        """Synthesize text to an MP3 file using ElevenLabs."""
+        resolved_voice = request.voice or self.default_voice
+        voice_id = await self.resolve_voice(resolved_voice)
+        char_limit = _MODEL_CHAR_LIMITS.get(self._model, _DEFAULT_CHAR_LIMIT)
+
+        with staged_output(output_path) as staged:
+            if len(request.text) > char_limit:
+                await self._chunked_synthesize(
+                    request.text, staged, voice_id, request, char_limit
+                )
+            else:
+                await self._single_synthesize(request.text, staged, voice_id, request)
+
+        logger.info("Wrote %s", output_path)
+        display_voice = (
+            resolved_voice
+            if _VOICE_ID_RE.match(resolved_voice)
+            else resolved_voice.lower()
+        )
+        return SynthesisResult(
+            path=output_path,
+            text=request.text,
+            provider=AudioProviderId.elevenlabs,
+            voice=display_voice,
+            language=request.language,
+            metadata=request.metadata,
+        )
+
+    async def generate_audio(self, request: SynthesisRequest) -> SynthesisResult:
+        return await self.synthesize(request, resolve_output_path(request))
+
+    async def generate_audios(
+        self, requests: Sequence[SynthesisRequest]
+    ) -> list[SynthesisResult]:
+        """Synthesize all requests concurrently, returning results in order."""
+        paths = [resolve_output_path(request) for request in requests]
+        return await gather_ordered(
+            lambda item: self.synthesize(*item),
+            list(zip(requests, paths, strict=True)),
+            key=lambda item: item[1],
+        )
+
+    async def resolve_voice(self, name: str, language: str | None = None) -> str:
+        """Resolve a voice name or raw voice ID to a voice ID.
+
+        Names are looked up in punt-vox's shared ``VOICES`` catalog. An
+        unknown name seeds it from the on-disk snapshot, then fetches the
+        account's voices unless the catalog is already loaded in full.
+        """
+        if _VOICE_ID_RE.match(name):
+            return name
+        key = name.lower()
+        if key not in VOICES:
+            await self._load_voices(key)
+        if key in VOICES:
+            return VOICES[key]
+        raise VoiceNotFoundError(name, sorted(k for k in VOICES if " - " not in k))
+
+    # -- Private helpers --------------------------------------------------
+
+    async def _load_voices(self, key: str) -> None:
+        """Fill ``VOICES`` for ``key``: snapshot first, then the API once."""
+        async with self._voices_lock:
+            if not self._catalog_seeded:
+                self._catalog_seeded = True
+                await asyncio.to_thread(self._catalog.load)
+            if key in VOICES or _vox_elevenlabs._voices_loaded:  # pyright: ignore[reportPrivateUsage]
+                return
+            async with limiter_for(self.name, self._model).acquire_async():
+                response: Any = await self._client.voices.get_all()  # pyright: ignore[reportExplicitAny]
+            merge_voices(self.name, elevenlabs_voices(response))
+            await asyncio.to_thread(self._catalog.save)
+
+    async def _chunked_synthesize(
+        self,
+        text: str,
+        output_path: Path,
+        voice_id: str,
+        request: SynthesisRequest,
+        char_limit: int,
+    ) -> None:
+        """Synthesize chunks concurrently, then stitch them off the loop."""
+        chunks = split_text(text, char_limit)
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f"chunk_{i:04d}.mp3" for i in range(len(chunks))]
+            await asyncio.gather(
+                *(
+                    self._single_synthesize(chunk, path, voice_id, request)
+                    for chunk, path in zip(chunks, paths, strict=True)
+                )
+            )
+            await asyncio.to_thread(stitch_audio, paths, output_path, 0)
+
+    async def _single_synthesize(
+        self,
+        text: str,
+        output_path: Path,
+        voice_id: str,
+        request: SynthesisRequest,
+    ) -> None:
+        kwargs: dict[str, Any] = {  # pyright: ignore[reportExplicitAny]
+            "voice_id": voice_id,
+            "text": text,
+            "model_id": self._model,
+            "output_format": "mp3_44100_128",
+        }
+        # punt-vox's builder reads only the request, never the provider.
+        voice_settings = _ElevenLabsProvider._build_voice_settings(self, request)  # type: ignore[arg-type]  # pyright: ignore[reportArgumentType, reportPrivateUsage]
+        if voice_settings is not None:
+            kwargs["voice_settings"] = voice_settings
+
+        async with limiter_for(self.name, self._model).acquire_async():
+            logger.info(
+                "API call: provider=elevenlabs, voice=%s, chars=%d",
+                voice_id,
+                len(text),
+            )
+            await write_chunks_async(
+                output_path, self._client.text_to_speech.stream(**kwargs)
+            )
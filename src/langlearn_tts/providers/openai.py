@@ -1,23 +1,63 @@
 """OpenAI TTS provider — re-exported from punt-vox.
 
 Subclass overrides generate_audio/generate_audios to use
-langlearn-tts output path resolution (~/langlearn-audio default).
+langlearn-tts output path resolution (~/langlearn-audio default);
+generate_audios runs up to ``TTS_JOBS`` requests at once. Every API call
+is paced by the shared per-provider limiter (``TTS_RATE_LIMITS``).
+Responses are streamed to a staged file and renamed into place when
+complete.
+
+:class:`AsyncOpenAIProvider` is the same provider on the SDK's async
+client, for callers that run many requests from one event loop.
 """
 
 from __future__ import annotations
 
+import asyncio
+import dataclasses
+import logging
+import os
+import tempfile
 from collections.abc import Sequence
+from pathlib import Path
+
+import openai
+
+from langlearn_tts.cache import provider_model
+from langlearn_tts.concurrency import default_jobs, gather_ordered, map_ordered
+from langlearn_tts.core import stitch_audio
+from langlearn_tts.output import (
+    STREAM_CHUNK_BYTES,
+    resolve_output_path,
+    staged_output,
+    write_chunks,
+    write_chunks_async,
+)
+from langlearn_tts.ratelimit import limiter_for
+from langlearn_tts.types import AudioProviderId, SynthesisRequest, SynthesisResult
+from punt_vox.core import split_text
+from punt_vox.providers.openai import (
+    _MAX_CHARS,  # pyright: ignore[reportPrivateUsage]
+    VOICES,
+    OpenAIProvider as _OpenAIProvider,
+)
+from punt_vox.types import VoiceNotFoundError
 
-from langlearn_tts.output import resolve_output_path
-from langlearn_tts.types import SynthesisRequest, SynthesisResult
-from punt_vox.providers.openai import VOICES, OpenAIProvider as _OpenAIProvider
+logger = logging.getLogger(__name__)
 
-__all__ = ["VOICES", "OpenAIProvider"]
+__all__ = ["VOICES", "AsyncOpenAIProvider", "OpenAIProvider"]
 
 
 class OpenAIProvider(_OpenAIProvider):
     """OpenAI TTS provider with langlearn-tts output path resolution."""
 
+    def synthesize(
+        self, request: SynthesisRequest, output_path: Path
+    ) -> SynthesisResult:
+        with staged_output(output_path) as staged:
+            result = super().synthesize(request, staged)
+        return dataclasses.replace(result, path=output_path)
+
     def generate_audio(self, request: SynthesisRequest) -> SynthesisResult:
         output_path = resolve_output_path(request)
         return self.synthesize(request, output_path)
@@ -25,4 +65,152 @@ class OpenAIProvider(_OpenAIProvider):
     def generate_audios(
         self, requests: Sequence[SynthesisRequest]
     ) -> list[SynthesisResult]:
-        return [self.generate_audio(request) for request in requests]
+        paths = [resolve_output_path(request) for request in requests]
+        return map_ordered(
+            lambda item: self.synthesize(*item),
+            list(zip(requests, paths, strict=True)),
+            default_jobs(),
+            key=lambda item: item[1],
+        )
+
+    def _single_synthesize(
+        self,
+        text: str,
+        output_path: Path,
+        voice: str,
+        speed: float,
+    ) -> None:
+        """Stream a single chunk's audio to a file as it arrives.
+
+        Each call is one API request, so each takes its own limiter slot;
+        long text split into chunks is paced chunk by chunk.
+        """
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        with (
+            limiter_for(self.name, provider_model(self)).acquire(),
+            self._client.audio.speech.with_streaming_response.create(
+                model=self._model,
+                voice=voice,
+                input=text,
+                speed=speed,
+                response_format="mp3",
+            ) as response,
+        ):
+            logger.info(
+                "API call: provider=openai, voice=%s, chars=%d", voice, len(text)
+            )
+            write_chunks(output_path, response.iter_bytes(STREAM_CHUNK_BYTES))
+
+
+class AsyncOpenAIProvider:
+    """OpenAI TTS on ``openai.AsyncOpenAI``.
+
+    Voices, rate mapping and output match :class:`OpenAIProvider`, but
+    synthesis methods are coroutines. All requests from an instance share
+    the client's HTTP connection pool, so hundreds can be in flight from
+    one event loop without a thread each. Each API call draws from the
+    same rate limiter as the sync provider.
+
+    This is not a :class:`~langlearn_tts.types.TTSProvider`; the sync
+    ``TTSClient`` cannot drive it.
+    """
+
+    def __init__(
+        self,
+        *,
+        model: str | None = None,
+        client: openai.AsyncOpenAI | None = None,
+    ) -> None:
+        self._model = model or os.environ.get("TTS_MODEL") or "tts-1"
+        self._client = client or openai.AsyncOpenAI()
+
+    @property
+    def name(self) -> str:
+        return "openai"
+
+    @property
+    def default_voice(self) -> str:
+        return "nova"
+
+    async def synthesize(
+        self, request: SynthesisRequest, output_path: Path
+    ) -> SynthesisResult:
+        """Synthesize text to an MP3 file using OpenAI TTS."""
+        voice = self.resolve_voice(request.voice or self.default_voice)
+        rate = request.rate if request.rate is not None else 90
+        speed = max(0.25, min(4.0, rate / 100))
+
+        with staged_output(output_path) as staged:
+            if len(request.text) > _MAX_CHARS:
+                await self._chunked_synthesize(request.text, staged, voice, speed)
+            else:
+                await self._single_synthesize(request.text, staged, voice, speed)
+
+        logger.info("Wrote %s", output_path)
+        return SynthesisResult(
+            path=output_path,
+            text=request.text,
+            provider=AudioProviderId.openai,
+            voice=voice,
+            language=request.language,
+            metadata=request.metadata,
+        )
+
+    async def generate_audio(self, request: SynthesisRequest) -> SynthesisResult:
+        return await self.synthesize(request, resolve_output_path(request))
+
+    async def generate_audios(
+        self, requests: Sequence[SynthesisRequest]
+    ) -> list[SynthesisResult]:
+        """Synthesize all requests concurrently, returning results in order."""
+        paths = [resolve_output_path(request) for request in requests]
+        return await gather_ordered(
+            lambda item: self.synthesize(*item),
+            list(zip(requests, paths, strict=True)),
+            key=lambda item: item[1],
+        )
+
+    def resolve_voice(self, name: str, language: str | None = None) -> str:
+        """Resolve a voice name, case-insensitive. Voices are multilingual."""
+        key = name.lower()
+        if key in VOICES:
+            return VOICES[key]
+        raise VoiceNotFoundError(name, sorted(VOICES))
+
+    # -- Private helpers --------------------------------------------------
+
+    async def _single_synthesize(
+        self, text: str, output_path: Path, voice: str, speed: float
+    ) -> None:
+        async with (
+            limiter_for(self.name, self._model).acquire_async(),
+            self._client.audio.speech.with_streaming_response.create(
+                model=self._model,
+                voice=voice,
+                input=text,
+                speed=speed,
+                response_format="mp3",
+            ) as response,
+        ):
+            logger.info(
+                "API call: provider=openai, voice=%s, chars=%d", voice, len(text)
+            )
+            await write_chunks_async(
+                output_path, response.iter_bytes(STREAM_CHUNK_BYTES)
+            )
+
+    async def _chunked_synthesize(
+        self, text: str, output_path: Path, voice: str, speed: float
+    ) -> None:
+        """Synthesize chunks concurrently, then stitch them off the loop."""
+        chunks = split_text(text, _MAX_CHARS)
+        logger.debug("Chunked %d chars into %d parts", len(text), len(chunks))
+        with tempfile.TemporaryDirectory() as tmp:
+            paths = [Path(tmp) / f"chunk_{i:04d}.mp3" for i in range(len(chunks))]
+            await asyncio.gather(
+                *(
+                    self._single_synthesize(chunk, path, voice, speed)
+                    for chunk, path in zip(chunks, paths, strict=True)
+                )
+            )
+            await asyncio.to_thread(stitch_audio, paths, output_path, 0)
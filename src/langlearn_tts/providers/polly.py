@@ -1,27 +1,88 @@
 """AWS Polly TTS provider — re-exported from punt-vox.
 
 Subclass overrides generate_audio/generate_audios to use
-langlearn-tts output path resolution (~/langlearn-audio default).
+langlearn-tts output path resolution (~/langlearn-audio default);
+generate_audios runs up to ``TTS_JOBS`` requests at once. Every API call
+is paced by the shared per-provider limiter (``TTS_RATE_LIMITS``).
+Audio is streamed to a staged file and renamed into place when complete.
 """
 
 from __future__ import annotations
 
+import logging
 from collections.abc import Sequence
+from pathlib import Path
 
-from langlearn_tts.output import resolve_output_path
-from langlearn_tts.types import SynthesisRequest, SynthesisResult
+from langlearn_tts.cache import provider_model
+from langlearn_tts.concurrency import default_jobs, map_ordered
+from langlearn_tts.output import (
+    STREAM_CHUNK_BYTES,
+    resolve_output_path,
+    staged_output,
+    write_chunks,
+)
+from langlearn_tts.ratelimit import limiter_for
+from langlearn_tts.types import AudioProviderId, SynthesisRequest, SynthesisResult
 from punt_vox.providers.polly import (
     VOICES,
     PollyProvider as _PollyProvider,
     VoiceConfig,
+    _infer_iso_from_bcp47,  # pyright: ignore[reportPrivateUsage]
 )
 
+logger = logging.getLogger(__name__)
+
 __all__ = ["VOICES", "PollyProvider", "VoiceConfig"]
 
 
 class PollyProvider(_PollyProvider):
     """AWS Polly provider with langlearn-tts output path resolution."""
 
+    def synthesize(
+        self, request: SynthesisRequest, output_path: Path
+    ) -> SynthesisResult:
+        """Synthesize text to an MP3 file using AWS Polly.
+
+        Same request and result as punt-vox's provider, but the response
+        stream is copied to disk in chunks, so memory use does not grow
+        with clip length, and ``output_path`` only ever holds a complete
+        file.
+        """
+        resolved_voice = request.voice or self.default_voice
+        voice_cfg = self._resolve_voice_config(resolved_voice)
+        rate = request.rate if request.rate is not None else 100
+        ssml_text = f'<speak><prosody rate="{rate}%">{request.text}</prosody></speak>'
+        with (
+            staged_output(output_path) as staged,
+            limiter_for(self.name, provider_model(self)).acquire(),
+        ):
+            response = self._client.synthesize_speech(
+                Text=ssml_text,
+                TextType="ssml",
+                VoiceId=voice_cfg.voice_id,
+                LanguageCode=voice_cfg.language_code,
+                OutputFormat="mp3",
+                Engine=voice_cfg.engine,
+                SampleRate="22050",
+            )
+            logger.info(
+                "API call: provider=polly, voice=%s, chars=%d",
+                voice_cfg.voice_id,
+                len(request.text),
+            )
+            stream = response["AudioStream"]
+            write_chunks(staged, iter(lambda: stream.read(STREAM_CHUNK_BYTES), b""))
+        logger.info("Wrote %s", output_path)
+        language = request.language or _infer_iso_from_bcp47(voice_cfg.language_code)
+        return SynthesisResult(
+            path=output_path,
+            text=request.text,
+            provider=AudioProviderId.polly,
+            voice=voice_cfg.voice_id,
+            language=language,
+            metadata=request.metadata,
+        )
+
     def generate_audio(self, request: SynthesisRequest) -> SynthesisResult:
         output_path = resolve_output_path(request)
         return self.synthesize(request, output_path)
@@ -29,4 +90,10 @@ class PollyProvider(_PollyProvider):
     def generate_audios(
         self, requests: Sequence[SynthesisRequest]
     ) -> list[SynthesisResult]:
-        return [self.generate_audio(request) for request in requests]
+        paths = [resolve_output_path(request) for request in requests]
+        return map_ordered(
+            lambda item: self.synthesize(*item),
+            list(zip(requests, paths, strict=True)),
+            default_jobs(),
+            key=lambda item: item[1],
+        )
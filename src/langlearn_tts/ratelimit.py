@@ -0,0 +1,368 @@
+"""Per-provider request rate and concurrency limits.
+
+Concurrent batches hit provider quotas quickly: Polly throttles on
+transactions per second, OpenAI on requests per minute, and ElevenLabs
+rejects requests beyond the plan's concurrency. Every provider call
+goes through a :class:`RateLimiter` shared by the whole process, so
+batches run at the highest rate the quota sustains instead of failing
+with throttling errors.
+
+Limits come from ``TTS_RATE_LIMITS``, a ``;``-separated list of
+``provider[:model]=spec`` entries. A spec is a comma-separated mix of
+``N/s``, ``N/m`` or ``N/h`` (request rate), ``burst=N`` and
+``concurrency=N``::
+
+    TTS_RATE_LIMITS="polly=80/s; openai:tts-1-hd=100/m; elevenlabs=concurrency=5"
+
+A ``provider:model`` entry takes precedence over a plain ``provider``
+entry, which replaces the built-in default for that provider.
+
+Calls are admitted by :class:`Priority`. A live ``synthesize`` call from
+the tutor runs at ``INTERACTIVE``; batch items run at ``BATCH`` (see
+:func:`priority`) and fill whatever capacity interactive calls leave.
+Batch calls never start while an interactive call is waiting, and they
+leave a concurrency slot and a couple of tokens in reserve, so a student
+waiting on one word is not queued behind a review export.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import math
+import os
+import threading
+import time
+from collections.abc import AsyncGenerator, Generator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from enum import IntEnum
+
+from langlearn_tts.concurrency import check_cancelled
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_RATE_LIMITS",
+    "Priority",
+    "RateLimit",
+    "RateLimiter",
+    "clear_rate_limiters",
+    "current_priority",
+    "limiter_for",
+    "parse_rate_limit",
+    "priority",
+    "rate_limits_from_env",
+]
+
+_UNITS = {"s": 1.0, "m": 60.0, "h": 3600.0}
+
+# How often an async caller re-checks for a free concurrency slot.
+_SLOT_POLL_SECONDS = 0.01
+
+# Longest a blocked sync caller goes without checking for cancellation.
+_CANCEL_POLL_SECONDS = 0.1
+
+# Tokens batch calls leave in the bucket: enough for both halves of a pair.
+_INTERACTIVE_TOKENS = 2
+
+
+class Priority(IntEnum):
+    """Admission order for provider calls and playback; lower values go first."""
+
+    INTERACTIVE = 0
+    BATCH = 1
+
+
+_priority: ContextVar[Priority] = ContextVar(
+    "langlearn_tts_priority", default=Priority.INTERACTIVE
+)
+
+
+def current_priority() -> Priority:
+    """Priority of provider calls made from the current context."""
+    return _priority.get()
+
+
+@contextmanager
+def priority(level: Priority) -> Generator[None]:
+    """Make provider calls in the enclosed block at ``level``.
+
+    The level is a context variable, so it follows the work into
+    ``asyncio.to_thread`` and :func:`~langlearn_tts.concurrency.map_ordered`
+    workers.
+    """
+    token = _priority.set(level)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A request rate and concurrency limit.
+
+    Attributes:
+        rate: Requests per second, or None for no rate limit.
+        burst: Requests that may start back to back before ``rate``
+            applies. Defaults to one second's worth of ``rate``.
+        concurrency: Requests in flight at once, or None for no cap.
+    """
+
+    rate: float | None = None
+    burst: int | None = None
+    concurrency: int | None = None
+
+    @property
+    def capacity(self) -> int:
+        """Size of the token bucket."""
+        if self.burst is not None:
+            return self.burst
+        return max(1, math.floor(self.rate)) if self.rate else 1
+
+
+# Conservative defaults: the lowest quota each provider grants by default
+# (Polly neural voices, OpenAI tier 1, the ElevenLabs free plan).
+DEFAULT_RATE_LIMITS: dict[str, RateLimit] = {
+    "polly": RateLimit(rate=8.0),
+    "openai": RateLimit(rate=50 / 60, burst=3),
+    "elevenlabs": RateLimit(concurrency=2),
+}
+
+
+def parse_rate_limit(spec: str) -> RateLimit:
+    """Parse a spec like ``"80/s"`` or ``"100/m,burst=5,concurrency=4"``.
+
+    Raises:
+        ValueError: If the spec is malformed or a value is not positive.
+    """
+    rate: float | None = None
+    burst: int | None = None
+    concurrency: int | None = None
+    for raw in spec.split(","):
+        part = raw.strip().lower()
+        try:
+            if "/" in part:
+                count, unit = part.split("/", 1)
+                rate = float(count) / _UNITS[unit.strip()]
+                if rate <= 0:
+                    raise ValueError(part)
+            elif part.startswith("burst="):
+                burst = _positive_int(part.removeprefix("burst="))
+            elif part.startswith("concurrency="):
+                concurrency = _positive_int(part.removeprefix("concurrency="))
+            else:
+                raise ValueError(part)
+        except (KeyError, ValueError):
+            msg = (
+                f"Invalid rate limit {spec!r}: expected N/s, N/m, N/h, "
+                "burst=N or concurrency=N"
+            )
+            raise ValueError(msg) from None
+    return RateLimit(rate=rate, burst=burst, concurrency=concurrency)
+
+
+def rate_limits_from_env() -> dict[str, RateLimit]:
+    """Resolve limits from ``TTS_RATE_LIMITS`` over the built-in defaults.
+
+    Keys are provider names or ``provider:model``. An entry of ``none``
+    removes a provider's default limit.
+
+    Raises:
+        ValueError: If ``TTS_RATE_LIMITS`` is malformed.
+    """
+    limits = dict(DEFAULT_RATE_LIMITS)
+    raw = os.environ.get("TTS_RATE_LIMITS", "")
+    for entry in raw.split(";"):
+        if not entry.strip():
+            continue
+        name, sep, spec = entry.partition("=")
+        if not sep or not name.strip():
+            msg = f"Invalid TTS_RATE_LIMITS entry {entry.strip()!r}"
+            raise ValueError(msg)
+        name = name.strip().lower()
+        if spec.strip().lower() == "none":
+            limits[name] = RateLimit()
+        else:
+            limits[name] = parse_rate_limit(spec)
+    return limits
+
+
+class RateLimiter:
+    """Token bucket plus concurrency cap, safe to share between threads.
+
+    Callers are admitted by :func:`current_priority`. ``BATCH`` callers
+    wait while any ``INTERACTIVE`` caller does, may use all but a quarter
+    of the concurrency slots (at least one is kept back when there are
+    two or more), and leave ``_INTERACTIVE_TOKENS`` in the bucket.
+    """
+
+    def __init__(self, limit: RateLimit) -> None:
+        self._limit = limit
+        self._lock = threading.Lock()
+        self._changed = threading.Condition(self._lock)
+        self._tokens = float(limit.capacity)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._interactive_waiting = 0
+        concurrency = limit.concurrency
+        self._batch_slots = (
+            concurrency - max(1, concurrency // 4)
+            if concurrency is not None and concurrency > 1
+            else concurrency
+        )
+        self._batch_headroom = min(_INTERACTIVE_TOKENS, limit.capacity - 1)
+
+    @property
+    def limit(self) -> RateLimit:
+        return self._limit
+
+    @contextmanager
+    def acquire(self) -> Generator[None]:
+        """Hold a concurrency slot and spend one token for the enclosed call.
+
+        Blocks until both are available to the caller's priority. The
+        slot is released on exit; tokens refill continuously at
+        ``limit.rate``.
+
+        Raises:
+            concurrent.futures.CancelledError: If the caller's work is
+                cancelled (see :func:`~langlearn_tts.concurrency.cancellable`)
+                before it is admitted.
+        """
+        level = current_priority()
+        check_cancelled()
+        with self._changed:
+            self._enqueue(level)
+            try:
+                while (wait := self._try_admit(level)) > 0:
+                    self._changed.wait(min(wait, _CANCEL_POLL_SECONDS))
+                    check_cancelled()
+            finally:
+                self._dequeue(level)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def acquire_async(self) -> AsyncGenerator[None]:
+        """Async :meth:`acquire`: waits on the event loop, not a thread.
+
+        Sync and async callers draw from the same slots and tokens.
+        """
+        level = current_priority()
+        check_cancelled()
+        with self._lock:
+            self._enqueue(level)
+        try:
+            while True:
+                with self._lock:
+                    wait = self._try_admit(level)
+                if wait <= 0:
+                    break
+                await asyncio.sleep(_SLOT_POLL_SECONDS if wait == math.inf else wait)
+        finally:
+            with self._lock:
+                self._dequeue(level)
+        try:
+            yield
+        finally:
+            self._release()
+
+    # -- Private helpers --------------------------------------------------
+
+    def _enqueue(self, level: Priority) -> None:
+        if level is Priority.INTERACTIVE:
+            self._interactive_waiting += 1
+
+    def _dequeue(self, level: Priority) -> None:
+        if level is Priority.INTERACTIVE:
+            self._interactive_waiting -= 1
+            self._changed.notify_all()
+
+    def _release(self) -> None:
+        with self._changed:
+            self._in_flight -= 1
+            self._changed.notify_all()
+
+    def _try_admit(self, level: Priority) -> float:
+        """Take a slot and a token if ``level`` may start a call now.
+
+        Returns 0 once admitted, else seconds to wait before trying
+        again (``math.inf``: until a call finishes or an interactive
+        caller is admitted). Caller must hold the lock.
+        """
+        batch = level is Priority.BATCH
+        if batch and self._interactive_waiting:
+            return math.inf
+        slots = self._batch_slots if batch else self._limit.concurrency
+        if slots is not None and self._in_flight >= slots:
+            return math.inf
+        wait = self._reserve_token(self._batch_headroom if batch else 0)
+        if wait > 0:
+            logger.debug("Rate limited; waiting %.3fs", wait)
+            return wait
+        self._in_flight += 1
+        return 0.0
+
+    def _reserve_token(self, headroom: int) -> float:
+        """Spend a token, keeping ``headroom`` in the bucket; else seconds to wait.
+
+        Caller must hold the lock.
+        """
+        rate = self._limit.rate
+        if rate is None:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(
+            self._limit.capacity, self._tokens + (now - self._updated) * rate
+        )
+        self._updated = now
+        if self._tokens >= 1 + headroom:
+            self._tokens -= 1
+            return 0.0
+        return (1 + headroom - self._tokens) / rate
+
+
+_limiters: dict[tuple[str, str | None], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(provider: str, model: str | None = None) -> RateLimiter:
+    """Return the process-wide limiter for a provider name and model.
+
+    Every instance of the same provider and model, sync or async, shares
+    one limiter, so concurrent tool calls and batch workers draw from a
+    single quota. The limiter is replaced when ``TTS_RATE_LIMITS``
+    changes its limit.
+
+    Raises:
+        ValueError: If ``TTS_RATE_LIMITS`` is malformed.
+    """
+    limits = rate_limits_from_env()
+    limit = limits.get(f"{provider}:{model}") if model else None
+    if limit is None:
+        limit = limits.get(provider, RateLimit())
+    key = (provider, model)
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None or limiter.limit != limit:
+            limiter = RateLimiter(limit)
+            _limiters[key] = limiter
+        return limiter
+
+
+def clear_rate_limiters() -> None:
+    """Drop every shared limiter."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+def _positive_int(raw: str) -> int:
+    value = int(raw)
+    if value < 1:
+        raise ValueError(raw)
+    return value
@@ -1,24 +1,60 @@
-"""FastMCP server for langlearn-tts."""
+"""FastMCP server for langlearn-tts.
+
+Tools are async: each runs its provider calls and stitching on a worker
+thread, so the stdio event loop keeps serving other requests while a
+long batch is in progress. Batches too long for one tool call go through
+``submit_batch`` and run as background jobs (see :mod:`langlearn_tts.jobs`).
+
+Batch tools make their provider calls at :attr:`Priority.BATCH`, so
+single and pair calls go ahead of them at the rate limiter and stay
+responsive while an export runs.
+
+Synthesis tools pass a bounded admission gate (``TTS_MAX_REQUESTS``
+running, ``TTS_MAX_QUEUED`` waiting; a call beyond that fails with a
+"Server busy" error). When the client cancels a call or disconnects,
+its worker thread stops before the next batch item or provider call.
+
+Batch tools send MCP progress notifications (items done out of total,
+cache hits, last item) when the client asks for them with a progress
+token.
+"""
 
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import contextvars
+import functools
+import inspect
 import logging
-import subprocess
+import os
+from collections.abc import Callable, Coroutine
 from pathlib import Path
+from typing import Any
 
-from mcp.server.fastmcp import FastMCP
+import anyio
+from mcp.server.fastmcp import Context, FastMCP
 
 from langlearn_tts import __version__
+from langlearn_tts.cache import SynthesisCache, output_filename, pair_key, request_key
+from langlearn_tts.concurrency import (
+    Cancellation,
+    RequestGate,
+    cancellable,
+    default_jobs,
+)
+from langlearn_tts.core import BatchProgress, TTSClient
+from langlearn_tts.eviction import CacheManager, EvictionPolicy, parse_size
+from langlearn_tts.jobs import JobQueue, JobStatus
 from langlearn_tts.logging_config import configure_logging
-from langlearn_tts.output import default_output_dir, expand_path
-from langlearn_tts.providers import get_provider
-from langlearn_tts.types import AudioProviderId, SynthesisRequest
-from punt_vox.core import TTSClient
+from langlearn_tts.output import default_cache_dir, default_output_dir, expand_path
+from langlearn_tts.playback import AudioPlayer
+from langlearn_tts.providers import shared_provider
+from langlearn_tts.ratelimit import Priority, priority
+from langlearn_tts.types import SynthesisRequest, SynthesisResult
 from punt_vox.types import (
     MergeStrategy,
-    SynthesisResult,
     TTSProvider,
-    generate_filename,
     result_to_dict,
     validate_language,
 )
@@ -89,38 +125,207 @@ def _resolve_voice_and_language(
     return voice, language
 
 
-def _cached_result(
-    provider: TTSProvider, request: SynthesisRequest, output_path: Path
-) -> SynthesisResult:
-    """Build a cached AudioResult without calling the provider."""
-    provider_id = AudioProviderId(provider.name)
-    return SynthesisResult(
-        path=output_path,
-        text=request.text,
-        provider=provider_id,
-        voice=request.voice,
-        language=request.language,
-        metadata=request.metadata,
+@functools.cache
+def _synthesis_cache(root: Path) -> SynthesisCache:
+    """One cache (and index connection) per cache directory."""
+    return SynthesisCache(root)
+
+
+def _make_client(provider: TTSProvider) -> TTSClient:
+    """Build a TTSClient backed by the shared synthesis cache.
+
+    Batch tools synthesize up to ``TTS_JOBS`` items at once.
+    """
+    return TTSClient(
+        provider, cache=_synthesis_cache(default_cache_dir()), jobs=default_jobs()
+    )
+
+
+def _start_cache_manager() -> CacheManager | None:
+    """Start background cache eviction if ``TTS_CACHE_MAX_SIZE`` is set.
+
+    ``TTS_CACHE_POLICY`` selects ``lru`` (default) or ``lfu``.
+    """
+    max_size = os.environ.get("TTS_CACHE_MAX_SIZE")
+    if not max_size:
+        return None
+    policy = EvictionPolicy(os.environ.get("TTS_CACHE_POLICY", "lru").lower())
+    manager = CacheManager(
+        _synthesis_cache(default_cache_dir()),
+        default_output_dir(),
+        parse_size(max_size),
+        policy,
     )
+    manager.start()
+    return manager
 
 
-def _play_audio(path: Path) -> None:
-    """Play an audio file using macOS afplay (non-blocking).
+@functools.cache
+def _job_queue() -> JobQueue:
+    """The process's background job queue, started on first use.
 
-    Logs a warning and returns silently if afplay is not available
-    (e.g. on Linux or Windows).
+    Starting it resumes jobs left unfinished by a previous server run.
     """
+    jobs = JobQueue(default_cache_dir() / "jobs", _run_job)
+    jobs.start()
+    return jobs
+
+
+def _batch_tools() -> dict[str, Callable[..., str]]:
+    """Blocking bodies of the tools that ``submit_batch`` can run."""
+    return {
+        "synthesize_batch": inspect.unwrap(synthesize_batch),
+        "synthesize_pair_batch": inspect.unwrap(synthesize_pair_batch),
+    }
+
+
+def _run_job(tool: str, arguments: dict[str, Any]) -> str:  # pyright: ignore[reportExplicitAny]
+    return _batch_tools()[tool](**arguments)
+
+
+def _env_count(name: str, default: int, minimum: int) -> int:
+    raw = os.environ.get(name)
+    if not raw:
+        return default
     try:
-        subprocess.Popen(
-            ["afplay", str(path)],
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
+        value = int(raw)
+    except ValueError:
+        value = minimum - 1
+    if value < minimum:
+        msg = f"{name} must be an integer >= {minimum}, got {raw!r}"
+        raise ValueError(msg)
+    return value
+
+
+@functools.cache
+def _request_gate() -> RequestGate:
+    """Admission gate for synthesis tool calls.
+
+    ``TTS_MAX_REQUESTS`` (default 8) calls run at once and up to
+    ``TTS_MAX_QUEUED`` (default 32) more wait for a slot.
+    """
+    return RequestGate(
+        _env_count("TTS_MAX_REQUESTS", 8, minimum=1),
+        _env_count("TTS_MAX_QUEUED", 32, minimum=0),
+    )
+
+
+# The event loop serving the current tool call, seen from its worker thread.
+_tool_loop: contextvars.ContextVar[asyncio.AbstractEventLoop | None] = (
+    contextvars.ContextVar("langlearn_tts_tool_loop", default=None)
+)
+
+
+def _offloaded[**P, R](
+    fn: Callable[P, R],
+) -> Callable[P, Coroutine[Any, Any, R]]:  # pyright: ignore[reportExplicitAny]
+    """Turn a blocking tool body into a coroutine run on a worker thread.
+
+    The wrapper keeps ``fn``'s signature and docstring, which FastMCP
+    reads to build the tool schema. If the coroutine is cancelled (the
+    client sent ``notifications/cancelled`` or went away), the thread is
+    told to stop at its next cancellation check, and the coroutine still
+    waits for it to return before raising ``CancelledError``. A thread
+    cannot be interrupted, so this keeps :func:`_admitted`'s gate slot
+    held for as long as the work actually runs.
+    """
+
+    @functools.wraps(fn)
+    async def run(*args: P.args, **kwargs: P.kwargs) -> R:
+        cancellation = Cancellation()
+        loop_token = _tool_loop.set(asyncio.get_running_loop())
+        try:
+            # The task copies the context, and to_thread copies it on.
+            with cancellable(cancellation):
+                worker = asyncio.ensure_future(asyncio.to_thread(fn, *args, **kwargs))
+        finally:
+            _tool_loop.reset(loop_token)
+        try:
+            return await asyncio.shield(worker)
+        except asyncio.CancelledError:
+            cancellation.cancel()
+            logger.info("%s cancelled; stopping its remaining work", fn.__name__)
+            # MCP cancels through an anyio scope, which re-cancels the task
+            # on every loop turn; shield the wait so it sleeps until the
+            # thread returns. A plain task.cancel() is not re-delivered,
+            # so the loop only retries once per cancel.
+            with anyio.CancelScope(shield=True):
+                while not worker.done():
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await asyncio.wait({worker})
+            if not worker.cancelled():
+                worker.exception()  # retrieved; the cancellation wins
+            raise
+
+    return run
+
+
+def _admitted[**P, R](
+    fn: Callable[P, Coroutine[Any, Any, R]],  # pyright: ignore[reportExplicitAny]
+) -> Callable[P, Coroutine[Any, Any, R]]:  # pyright: ignore[reportExplicitAny]
+    """Run a tool coroutine only once :func:`_request_gate` admits it.
+
+    The slot is held until the coroutine returns; :func:`_offloaded`
+    tools return only once their worker thread has, even when cancelled.
+    """
+
+    @functools.wraps(fn)
+    async def run(*args: P.args, **kwargs: P.kwargs) -> R:
+        async with _request_gate().admit():
+            return await fn(*args, **kwargs)
+
+    return run
+
+
+@functools.cache
+def _audio_player() -> AudioPlayer:
+    return AudioPlayer()
+
+
+def _play_audio(path: Path, level: Priority = Priority.INTERACTIVE) -> None:
+    """Queue an audio file for playback with macOS afplay (non-blocking).
+
+    Files play one at a time; interactive files go ahead of batch files
+    still waiting, otherwise they play in the order queued. Logs a
+    warning if afplay is not available (e.g. on Linux or Windows).
+    """
+    _audio_player().play(path, level)
+
+
+def _play_result(result: SynthesisResult) -> None:
+    """Queue a batch item for playback behind any interactive files."""
+    _play_audio(result.path, Priority.BATCH)
+
+
+def _progress_reporter(
+    ctx: Context[Any, Any, Any] | None,  # pyright: ignore[reportExplicitAny]
+) -> Callable[[BatchProgress], None] | None:
+    """Forward batch progress from a tool's worker thread to its MCP client.
+
+    Returns None outside a client request, e.g. for background jobs.
+    Notifications are scheduled on the tool call's event loop without
+    waiting for them to be sent.
+    """
+    loop = _tool_loop.get()
+    if ctx is None or loop is None:
+        return None
+
+    def report(progress: BatchProgress) -> None:
+        message = (
+            f"{progress.completed}/{progress.total} done, "
+            f"{progress.cache_hits} from cache; last: {progress.current}"
+        )
+        asyncio.run_coroutine_threadsafe(
+            ctx.report_progress(progress.completed, progress.total, message),
+            loop,
         )
-    except FileNotFoundError:
-        logger.warning("afplay not found — auto-play requires macOS")
+
+    return report
 
 
 @mcp.tool()
+@_admitted
+@_offloaded
 def synthesize(
     text: str,
     voice: str | None = None,
@@ -175,7 +380,7 @@ def synthesize(
         JSON string with path, text, voice, and language fields.
     """
     _validate_voice_settings(stability, similarity, style)
-    provider = get_provider()
+    provider = shared_provider()
     voice, language = _resolve_voice_and_language(provider, voice, language)
     request = SynthesisRequest(
         text=text,
@@ -192,20 +397,18 @@ def synthesize(
     path = _resolve_output_path(
         output_path,
         dir_path,
-        f"{voice}_{text[:20].replace(' ', '_')}.mp3",
+        output_filename(request_key(request, provider), prefix=f"{voice}_"),
     )
 
-    client = TTSClient(provider)
-    if path.exists():
-        result = _cached_result(provider, request, path)
-    else:
-        result = client.synthesize(request, path)
+    result = _make_client(provider).synthesize(request, path)
     if auto_play:
         _play_audio(result.path)
     return str(result_to_dict(result))
 
 
 @mcp.tool()
+@_admitted
+@_offloaded
 def synthesize_batch(
     texts: list[str],
     voice: str | None = None,
@@ -219,6 +422,7 @@ def synthesize_batch(
     similarity: float | None = None,
     style: float | None = None,
     speaker_boost: bool | None = None,
+    ctx: Context[Any, Any, Any] | None = None,  # pyright: ignore[reportExplicitAny]
 ) -> str:
     """Synthesize multiple texts to MP3 files.
 
@@ -248,7 +452,7 @@ def synthesize_batch(
         text, voice, and language fields.
     """
     _validate_voice_settings(stability, similarity, style)
-    provider = get_provider()
+    provider = shared_provider()
     voice, language = _resolve_voice_and_language(provider, voice, language)
     requests = [
         SynthesisRequest(
@@ -267,40 +471,26 @@ def synthesize_batch(
         return str([])
     dir_path = _resolve_output_dir(output_dir)
 
-    client = TTSClient(provider)
-    results: list[SynthesisResult]
-    if merge:
-        combined_text = " | ".join(r.text for r in requests)
-        out_path = dir_path / generate_filename(combined_text, prefix="batch_")
-        if out_path.exists():
-            cached = SynthesisResult(
-                path=out_path,
-                text=combined_text,
-                provider=AudioProviderId(provider.name),
-                voice=voice,
-                language=language,
-                metadata=requests[0].metadata,
-            )
-            results = [cached]
-        else:
-            results = client.synthesize_batch(
-                requests, dir_path, MergeStrategy.ONE_FILE_PER_BATCH, pause_ms
-            )
-    else:
-        results = []
-        for req in requests:
-            out_path = dir_path / generate_filename(req.text)
-            if out_path.exists():
-                results.append(_cached_result(provider, req, out_path))
-            else:
-                results.append(client.synthesize(req, out_path))
-    if auto_play:
-        for r in results:
-            _play_audio(r.path)
+    strategy = (
+        MergeStrategy.ONE_FILE_PER_BATCH if merge else MergeStrategy.ONE_FILE_PER_INPUT
+    )
+    # Each file starts playing as soon as it and those before it are ready.
+    play = _play_result if auto_play else None
+    with priority(Priority.BATCH):
+        results = _make_client(provider).synthesize_batch(
+            requests,
+            dir_path,
+            strategy,
+            pause_ms,
+            on_result=play,
+            on_progress=_progress_reporter(ctx),
+        )
     return str([result_to_dict(r) for r in results])
 
 
 @mcp.tool()
+@_admitted
+@_offloaded
 def synthesize_pair(
     text1: str,
     text2: str,
@@ -350,7 +540,7 @@ def synthesize_pair(
         JSON string with path, text, voice, and language fields.
     """
     _validate_voice_settings(stability, similarity, style)
-    provider = get_provider()
+    provider = shared_provider()
     voice1, lang1 = _resolve_voice_and_language(provider, voice1, lang1)
     voice2, lang2 = _resolve_voice_and_language(provider, voice2, lang2)
     req1 = SynthesisRequest(
@@ -378,29 +568,19 @@ def synthesize_pair(
     path = _resolve_output_path(
         output_path,
         dir_path,
-        f"pair_{text1[:10]}_{text2[:10]}.mp3",
+        output_filename(pair_key(req1, req2, provider, pause_ms), prefix="pair_"),
     )
 
-    client = TTSClient(provider)
-    if path.exists():
-        voice_parts = [v for v in (voice1, voice2) if v]
-        combined_voice = "+".join(voice_parts) if voice_parts else None
-        result = SynthesisResult(
-            path=path,
-            text=f"{text1} | {text2}",
-            provider=AudioProviderId(provider.name),
-            voice=combined_voice,
-            language=lang1,
-            metadata=req1.metadata,
-        )
-    else:
-        result = client.synthesize_pair(text1, req1, text2, req2, path, pause_ms)
+    client = _make_client(provider)
+    result = client.synthesize_pair(text1, req1, text2, req2, path, pause_ms)
     if auto_play:
         _play_audio(result.path)
     return str(result_to_dict(result))
 
 
 @mcp.tool()
+@_admitted
+@_offloaded
 def synthesize_pair_batch(
     pairs: list[list[str]],
     voice1: str | None = None,
@@ -416,6 +596,7 @@ def synthesize_pair_batch(
     similarity: float | None = None,
     style: float | None = None,
     speaker_boost: bool | None = None,
+    ctx: Context[Any, Any, Any] | None = None,  # pyright: ignore[reportExplicitAny]
 ) -> str:
     """Synthesize multiple text pairs and stitch each into MP3 files.
 
@@ -448,7 +629,7 @@ def synthesize_pair_batch(
         JSON string with list of results.
     """
     _validate_voice_settings(stability, similarity, style)
-    provider = get_provider()
+    provider = shared_provider()
     voice1, lang1 = _resolve_voice_and_language(provider, voice1, lang1)
     voice2, lang2 = _resolve_voice_and_language(provider, voice2, lang2)
 
@@ -482,66 +663,109 @@ def synthesize_pair_batch(
 
     dir_path = _resolve_output_dir(output_dir)
 
-    client = TTSClient(provider)
-    results: list[SynthesisResult]
-    if merge:
-        all_texts = " | ".join(f"{r1.text}-{r2.text}" for r1, r2 in pair_requests)
-        out_path = dir_path / generate_filename(all_texts, prefix="pairs_")
-        if out_path.exists():
-            results = [
-                SynthesisResult(
-                    path=out_path,
-                    text=all_texts,
-                    provider=AudioProviderId(provider.name),
-                    voice="mixed",
-                    metadata=pair_requests[0][0].metadata,
-                )
-            ]
-        else:
-            results = client.synthesize_pair_batch(
-                pair_requests, dir_path, MergeStrategy.ONE_FILE_PER_BATCH, pause_ms
-            )
-    else:
-        results = []
-        for req_1, req_2 in pair_requests:
-            combined = f"{req_1.text}_{req_2.text}"
-            out_path = dir_path / generate_filename(combined, prefix="pair_")
-            if out_path.exists():
-                voice_parts = [v for v in (req_1.voice, req_2.voice) if v]
-                combined_voice = "+".join(voice_parts) if voice_parts else None
-                results.append(
-                    SynthesisResult(
-                        path=out_path,
-                        text=f"{req_1.text} | {req_2.text}",
-                        provider=AudioProviderId(provider.name),
-                        voice=combined_voice,
-                        language=req_1.language,
-                        metadata=req_1.metadata,
-                    )
-                )
-            else:
-                results.append(
-                    client.synthesize_pair(
-                        req_1.text,
-                        req_1,
-                        req_2.text,
-                        req_2,
-                        out_path,
-                        pause_ms,
-                    )
-                )
-    if auto_play:
-        for r in results:
-            _play_audio(r.path)
+    strategy = (
+        MergeStrategy.ONE_FILE_PER_BATCH if merge else MergeStrategy.ONE_FILE_PER_INPUT
+    )
+    # Each file starts playing as soon as it and those before it are ready.
+    play = _play_result if auto_play else None
+    with priority(Priority.BATCH):
+        results = _make_client(provider).synthesize_pair_batch(
+            pair_requests,
+            dir_path,
+            strategy,
+            pause_ms,
+            on_result=play,
+            on_progress=_progress_reporter(ctx),
+        )
     return str([result_to_dict(r) for r in results])
 
 
+@mcp.tool()
+@_offloaded
+def submit_batch(tool: str, arguments: dict[str, Any]) -> str:  # pyright: ignore[reportExplicitAny]
+    """Queue a large batch to run in the background and return a job ID.
+
+    Use for end-of-session review exports and other batches that may
+    take longer than a single tool call is allowed to run. Poll
+    job_status with the returned job_id until its status is "done" (or
+    "failed"), then fetch the output with job_result. Jobs survive a
+    server restart.
+
+    Args:
+        tool: The batch tool to run: 'synthesize_batch' or
+            'synthesize_pair_batch'.
+        arguments: The arguments that tool takes, e.g.
+            {"pairs": [["strong", "stark"]], "lang1": "en", "lang2": "de",
+            "merge": true}. auto_play is ignored; background jobs never
+            play audio.
+
+    Returns:
+        JSON string with job_id, tool, status and timestamps.
+    """
+    tools = _batch_tools()
+    body = tools.get(tool)
+    if body is None:
+        msg = f"Unknown batch tool {tool!r}. Choose from: {', '.join(sorted(tools))}."
+        raise ValueError(msg)
+    arguments = {**arguments, "auto_play": False}
+    try:
+        inspect.signature(body).bind(**arguments)
+    except TypeError as exc:
+        msg = f"Invalid arguments for {tool}: {exc}"
+        raise ValueError(msg) from None
+    return str(_job_queue().submit(tool, arguments).summary())
+
+
+@mcp.tool()
+@_offloaded
+def job_status(job_id: str) -> str:
+    """Report the status of a job started with submit_batch.
+
+    Args:
+        job_id: The job_id returned by submit_batch.
+
+    Returns:
+        JSON string with job_id, tool, status ("queued", "running",
+        "done" or "failed"), timestamps and, for failed jobs, the error.
+    """
+    return str(_job_queue().get(job_id).summary())
+
+
+@mcp.tool()
+@_offloaded
+def job_result(job_id: str) -> str:
+    """Return the output of a finished submit_batch job.
+
+    Args:
+        job_id: The job_id returned by submit_batch.
+
+    Returns:
+        The batch tool's own result: a JSON string with a list of
+        results, each containing path, text, voice, and language.
+    """
+    job = _job_queue().get(job_id)
+    if job.status == JobStatus.FAILED:
+        msg = f"Job {job_id} failed: {job.error}"
+        raise ValueError(msg)
+    if job.status != JobStatus.DONE or job.result is None:
+        msg = f"Job {job_id} is still {job.status}; poll job_status until done."
+        raise ValueError(msg)
+    return job.result
+
+
 def run_server() -> None:
     """Run the MCP server with stdio transport."""
     # MCP stdio servers must not write to stdout; stderr handler is safe.
     configure_logging(stderr_level="INFO")
     logger.info("Starting langlearn-tts MCP server")
-    mcp.run(transport="stdio")
+    manager = _start_cache_manager()
+    jobs = _job_queue()
+    try:
+        mcp.run(transport="stdio")
+    finally:
+        jobs.stop()
+        if manager is not None:
+            manager.stop()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,282 @@
+"""Persistent voice catalogs for Polly and ElevenLabs.
+
+punt-vox resolves voice names against module-level ``VOICES`` dicts that
+start empty in every process, so the first voice lookup of each CLI run
+or MCP server start pays for a ``describe_voices`` / ``voices.get_all``
+round trip. :class:`VoiceCatalog` snapshots those dicts to disk and
+seeds them on startup, so known voices resolve from local data.
+
+A snapshot older than its TTL is still used, and refreshed from the API
+on a background thread. A name missing from the snapshot falls through
+to punt-vox's own API lookup, so newly added voices keep working.
+
+Voice lookups run concurrently (batch workers, async tools) while a
+refresh is in flight. A refresh therefore fetches into a separate
+mapping and adds it to ``VOICES`` under :data:`_voices_lock` in a single
+update, keeping every existing entry. A lookup sees the catalog before
+or after the update, never a half-loaded one. Short-lived processes
+call :func:`wait_for_refreshes` before exiting, so a refresh started on
+the way in is saved rather than killed with its daemon thread.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from collections.abc import Mapping
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Protocol, cast
+
+import punt_vox.providers.elevenlabs as _elevenlabs
+import punt_vox.providers.polly as _polly
+from langlearn_tts.output import default_cache_dir
+from punt_vox.providers.polly import VoiceConfig
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "DEFAULT_TTL_SECONDS",
+    "VoiceCatalog",
+    "catalog_path",
+    "elevenlabs_voices",
+    "merge_voices",
+    "wait_for_refreshes",
+    "warm_voice_catalog",
+]
+
+DEFAULT_TTL_SECONDS = 24 * 60 * 60
+
+_CATALOG_VERSION = 1
+
+# Providers whose punt-vox module keeps a lazily loaded VOICES dict.
+_MODULES: dict[str, ModuleType] = {"polly": _polly, "elevenlabs": _elevenlabs}
+
+# Serializes changes to punt-vox's VOICES dicts and loaded flags.
+_voices_lock = threading.Lock()
+
+_refreshes: set[threading.Thread] = set()
+_refreshes_lock = threading.Lock()
+
+
+class _Provider(Protocol):
+    @property
+    def name(self) -> str: ...
+
+
+def catalog_path(provider_name: str) -> Path:
+    """Default snapshot location: ``<cache dir>/voices/<provider>.json``."""
+    return default_cache_dir() / "voices" / f"{provider_name}.json"
+
+
+def merge_voices(
+    provider_name: str,
+    voices: Mapping[str, Any],  # pyright: ignore[reportExplicitAny]
+    *,
+    loaded: bool = True,
+) -> None:
+    """Add ``voices`` missing from punt-vox's ``VOICES`` in one update.
+
+    Existing entries (aliases, earlier lookups) are kept, as punt-vox's
+    own loader does. With ``loaded``, the catalog is marked as fetched
+    in full, so punt-vox does not fetch it again on a miss.
+    """
+    module = _MODULES[provider_name]
+    with _voices_lock:
+        target = cast("dict[str, Any]", module.VOICES)  # pyright: ignore[reportExplicitAny]
+        target.update({k: v for k, v in voices.items() if k not in target})
+        if loaded:
+            vars(module)["_voices_loaded"] = True
+
+
+def elevenlabs_voices(response: Any) -> dict[str, str]:  # pyright: ignore[reportExplicitAny]
+    """Map an ElevenLabs ``voices.get_all`` response to ``VOICES`` entries.
+
+    Each voice is keyed by its full lowercased name and by the short
+    name before ``" - "``, first voice winning, as in punt-vox.
+    """
+    voices: dict[str, str] = {}
+    for voice in response.voices:
+        full_name: str = voice.name.lower()
+        voices.setdefault(full_name, voice.voice_id)
+        voices.setdefault(full_name.split(" - ", 1)[0], voice.voice_id)
+    return voices
+
+
+def wait_for_refreshes(timeout: float | None = None) -> None:
+    """Join the background refreshes started so far, up to ``timeout`` each."""
+    with _refreshes_lock:
+        threads = list(_refreshes)
+    for thread in threads:
+        thread.join(timeout)
+
+
+def _encode(provider_name: str, voices: dict[str, Any]) -> dict[str, object]:  # pyright: ignore[reportExplicitAny]
+    if provider_name == "polly":
+        return {
+            name: {
+                "voice_id": cfg.voice_id,
+                "language_code": cfg.language_code,
+                "engine": cfg.engine,
+            }
+            for name, cfg in cast("dict[str, VoiceConfig]", voices).items()
+        }
+    return dict(voices)
+
+
+def _fetch(provider_name: str, client: Any) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+    """Fetch a provider's whole catalog without touching ``VOICES``."""
+    if provider_name == "elevenlabs":
+        return elevenlabs_voices(client.voices.get_all())
+    voices: dict[str, Any] = {}  # pyright: ignore[reportExplicitAny]
+    kwargs: dict[str, str] = {}
+    while True:
+        response = client.describe_voices(**kwargs)
+        for voice in response["Voices"]:
+            voices.setdefault(
+                voice["Id"].lower(),
+                VoiceConfig(
+                    voice_id=voice["Id"],
+                    language_code=voice["LanguageCode"],
+                    engine=_polly._best_engine(voice["SupportedEngines"]),  # pyright: ignore[reportPrivateUsage]
+                ),
+            )
+        next_token = response.get("NextToken")
+        if not next_token:
+            return voices
+        kwargs["NextToken"] = next_token
+
+
+def _decode(provider_name: str, raw: dict[str, Any]) -> dict[str, Any]:  # pyright: ignore[reportExplicitAny]
+    if provider_name == "polly":
+        return {name: VoiceConfig(**fields) for name, fields in raw.items()}
+    return {name: vid for name, vid in raw.items() if isinstance(vid, str)}
+
+
+class VoiceCatalog:
+    """On-disk snapshot of one provider's punt-vox voice catalog.
+
+    :meth:`load` and :meth:`save` need only the provider's name;
+    :meth:`refresh` calls the API through its synchronous client.
+    """
+
+    def __init__(
+        self,
+        provider: _Provider,
+        path: Path,
+        ttl_seconds: float = DEFAULT_TTL_SECONDS,
+    ) -> None:
+        if provider.name not in _MODULES:
+            msg = f"Provider {provider.name!r} has no voice catalog."
+            raise ValueError(msg)
+        self._provider = provider
+        self._module = _MODULES[provider.name]
+        self._path = path
+        self._ttl_seconds = ttl_seconds
+        self._refresh_lock = threading.Lock()
+
+    @property
+    def path(self) -> Path:
+        return self._path
+
+    def load(self) -> float | None:
+        """Seed punt-vox's ``VOICES`` from the snapshot.
+
+        Entries already present (aliases, earlier lookups) are kept, as
+        punt-vox itself does. Returns the snapshot's fetch time, or None
+        if there is no usable snapshot.
+        """
+        try:
+            raw = json.loads(self._path.read_text(encoding="utf-8"))
+            if raw.get("version") != _CATALOG_VERSION:
+                return None
+            fetched_at = float(raw["fetched_at"])
+            voices = _decode(self._provider.name, raw["voices"])
+        except FileNotFoundError:
+            return None
+        except (ValueError, KeyError, TypeError, AttributeError) as exc:
+            logger.warning("Ignoring unreadable voice catalog %s: %s", self._path, exc)
+            return None
+
+        merge_voices(self._provider.name, voices, loaded=False)
+        logger.debug(
+            "Loaded %d %s voices from %s", len(voices), self._provider.name, self._path
+        )
+        return fetched_at
+
+    def save(self) -> None:
+        """Write the current ``VOICES`` dict to the snapshot atomically."""
+        with _voices_lock:
+            voices = dict(cast("dict[str, Any]", self._module.VOICES))  # pyright: ignore[reportExplicitAny]
+        payload = {
+            "version": _CATALOG_VERSION,
+            "fetched_at": time.time(),
+            "voices": _encode(self._provider.name, voices),
+        }
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        staged = self._path.with_name(f".{self._path.name}.{uuid.uuid4().hex}.tmp")
+        staged.write_text(json.dumps(payload, sort_keys=True), encoding="utf-8")
+        os.replace(staged, self._path)
+
+    def refresh(self) -> None:
+        """Fetch the catalog from the provider API and snapshot it."""
+        with self._refresh_lock:
+            client = self._provider._client  # type: ignore[attr-defined]  # pyright: ignore[reportAttributeAccessIssue, reportUnknownMemberType]
+            merge_voices(self._provider.name, _fetch(self._provider.name, client))  # pyright: ignore[reportUnknownArgumentType]
+            self.save()
+        logger.info("Refreshed %s voice catalog", self._provider.name)
+
+    def refresh_async(self) -> threading.Thread:
+        """Refresh on a daemon thread; failures are logged, not raised.
+
+        The thread is tracked for :func:`wait_for_refreshes`.
+        """
+        thread = threading.Thread(
+            target=self._refresh_quietly,
+            name=f"langlearn-tts-voices-{self._provider.name}",
+            daemon=True,
+        )
+        with _refreshes_lock:
+            _refreshes.add(thread)
+        thread.start()
+        return thread
+
+    def warm(self) -> threading.Thread | None:
+        """Load the snapshot, refreshing in the background if stale or missing.
+
+        Returns the refresh thread, if one was started.
+        """
+        fetched_at = self.load()
+        if fetched_at is not None and time.time() - fetched_at < self._ttl_seconds:
+            return None
+        return self.refresh_async()
+
+    # -- Private helpers --------------------------------------------------
+
+    def _refresh_quietly(self) -> None:
+        try:
+            self.refresh()
+        except Exception:  # SDK and network errors vary by provider
+            logger.debug(
+                "Voice catalog refresh failed for %s",
+                self._provider.name,
+                exc_info=True,
+            )
+        finally:
+            with _refreshes_lock:
+                _refreshes.discard(threading.current_thread())
+
+
+def warm_voice_catalog(provider: _Provider) -> threading.Thread | None:
+    """Seed a provider's voices from disk and refresh them when stale.
+
+    Providers without a dynamic catalog (OpenAI) are left untouched.
+    The snapshot lives at :func:`catalog_path`.
+    """
+    if provider.name not in _MODULES:
+        return None
+    return VoiceCatalog(provider, catalog_path(provider.name)).warm()
@@ -15,6 +15,7 @@ from langlearn_tts.core import TTSClient
 from langlearn_tts.providers.elevenlabs import ElevenLabsProvider
 from langlearn_tts.providers.openai import OpenAIProvider
 from langlearn_tts.providers.polly import PollyProvider, VoiceConfig
+from langlearn_tts.ratelimit import clear_rate_limiters
 
 # Test voice configs — constructed directly, no API call needed.
 JOANNA = VoiceConfig(voice_id="Joanna", language_code="en-US", engine="neural")
@@ -52,6 +53,18 @@ def _populate_voice_cache() -> Iterator[None]:  # pyright: ignore[reportUnusedFu
     polly._voices_loaded = saved_loaded  # pyright: ignore[reportPrivateUsage]
 
 
+@pytest.fixture(autouse=True)
+def _unlimited_providers(monkeypatch: pytest.MonkeyPatch) -> Iterator[None]:  # pyright: ignore[reportUnusedFunction]
+    """Disable the default provider rate limits; mocked calls are free.
+
+    Tests that exercise rate limiting set ``TTS_RATE_LIMITS`` themselves.
+    """
+    monkeypatch.setenv("TTS_RATE_LIMITS", "polly=none; openai=none; elevenlabs=none")
+    clear_rate_limiters()
+    yield
+    clear_rate_limiters()
+
+
 @pytest.fixture
 def tmp_output_dir(tmp_path: Path) -> Path:
     """Provide a temporary output directory."""
@@ -81,10 +94,8 @@ def _get_valid_mp3_bytes() -> bytes:
 
 def _make_polly_response() -> dict[str, Any]:
     """Create a mock Polly synthesize_speech response with valid MP3."""
-    stream = MagicMock()
-    stream.read.return_value = _get_valid_mp3_bytes()
     return {
-        "AudioStream": stream,
+        "AudioStream": io.BytesIO(_get_valid_mp3_bytes()),
         "ContentType": "audio/mpeg",
         "RequestCharacters": 10,
     }
@@ -111,9 +122,15 @@ def tts_client(polly_provider: PollyProvider) -> TTSClient:
 
 
 def _make_openai_speech_response() -> MagicMock:
-    """Create a mock OpenAI audio.speech.create() response with valid MP3."""
+    """Create a mock OpenAI streaming speech response with valid MP3.
+
+    Mirrors ``audio.speech.with_streaming_response.create()``: a context
+    manager whose response yields the audio from ``iter_bytes``.
+    """
     response = MagicMock()
-    response.content = _get_valid_mp3_bytes()
+    response.__enter__.return_value.iter_bytes.side_effect = lambda *_: iter(  # pyright: ignore[reportUnknownLambdaType]
+        [_get_valid_mp3_bytes()]
+    )
     return response
 
 
@@ -121,7 +138,7 @@ def _make_openai_speech_response() -> MagicMock:
 def mock_openai_client() -> MagicMock:
     """Create a mock openai.OpenAI client that returns valid MP3 bytes."""
     client = MagicMock()
-    client.audio.speech.create.side_effect = (
+    client.audio.speech.with_streaming_response.create.side_effect = (
         lambda **kwargs: _make_openai_speech_response()  # pyright: ignore[reportUnknownLambdaType]
     )
     return client
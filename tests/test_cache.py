@@ -0,0 +1,483 @@
+"""Tests for langlearn_tts.cache."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from langlearn_tts.cache import (
+    SynthesisCache,
+    composite_key,
+    output_filename,
+    pair_key,
+    provider_model,
+    request_key,
+)
+from langlearn_tts.core import TTSClient
+from langlearn_tts.index import EntryMeta
+from langlearn_tts.providers.openai import OpenAIProvider
+from langlearn_tts.providers.polly import PollyProvider
+from langlearn_tts.types import MergeStrategy, SynthesisRequest
+
+
+class TestRequestKey:
+    def test_stable_for_equal_requests(self, polly_provider: PollyProvider) -> None:
+        a = SynthesisRequest(text="Haus", voice="hans", language="de", rate=85)
+        b = SynthesisRequest(text="Haus", voice="hans", language="de", rate=85)
+        assert request_key(a, polly_provider) == request_key(b, polly_provider)
+
+    def test_shared_prefix_does_not_collide(
+        self, polly_provider: PollyProvider
+    ) -> None:
+        prefix = "a" * 20
+        a = SynthesisRequest(text=f"{prefix} one", voice="joanna")
+        b = SynthesisRequest(text=f"{prefix} two", voice="joanna")
+        assert request_key(a, polly_provider) != request_key(b, polly_provider)
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            {"voice": "hans"},
+            {"language": "de"},
+            {"rate": 100},
+            {"stability": 0.5},
+            {"similarity": 0.5},
+            {"style": 0.5},
+            {"speaker_boost": True},
+        ],
+    )
+    def test_every_parameter_changes_key(
+        self, polly_provider: PollyProvider, change: dict[str, object]
+    ) -> None:
+        base: dict[str, object] = {"text": "hello", "voice": "joanna", "rate": 90}
+        a = SynthesisRequest(**base)  # type: ignore[arg-type]
+        b = SynthesisRequest(**{**base, **change})  # type: ignore[arg-type]
+        assert request_key(a, polly_provider) != request_key(b, polly_provider)
+
+    def test_model_changes_key(self, mock_openai_client: MagicMock) -> None:
+        request = SynthesisRequest(text="hello", voice="nova")
+        tts_1 = OpenAIProvider(model="tts-1", client=mock_openai_client)
+        tts_1_hd = OpenAIProvider(model="tts-1-hd", client=mock_openai_client)
+        assert request_key(request, tts_1) != request_key(request, tts_1_hd)
+
+    def test_provider_changes_key(
+        self, polly_provider: PollyProvider, mock_openai_client: MagicMock
+    ) -> None:
+        request = SynthesisRequest(text="hello", voice="nova")
+        openai = OpenAIProvider(client=mock_openai_client)
+        assert request_key(request, polly_provider) != request_key(request, openai)
+
+    def test_metadata_ignored(self, polly_provider: PollyProvider) -> None:
+        a = SynthesisRequest(text="hello", voice="joanna")
+        b = SynthesisRequest(
+            text="hello", voice="joanna", metadata={"output_dir": "/tmp/x"}
+        )
+        assert request_key(a, polly_provider) == request_key(b, polly_provider)
+
+    def test_missing_voice_uses_provider_default(
+        self, polly_provider: PollyProvider
+    ) -> None:
+        a = SynthesisRequest(text="hello")
+        b = SynthesisRequest(text="hello", voice="joanna")
+        assert request_key(a, polly_provider) == request_key(b, polly_provider)
+
+
+class TestCompositeKeys:
+    def test_order_matters(self) -> None:
+        assert composite_key("batch", ["a", "b"], 500) != composite_key(
+            "batch", ["b", "a"], 500
+        )
+
+    def test_pause_matters(self) -> None:
+        assert composite_key("pair", ["a", "b"], 500) != composite_key(
+            "pair", ["a", "b"], 800
+        )
+
+    def test_kind_matters(self) -> None:
+        assert composite_key("pair", ["a", "b"], 500) != composite_key(
+            "batch", ["a", "b"], 500
+        )
+
+    def test_pair_key_built_from_request_keys(
+        self, polly_provider: PollyProvider
+    ) -> None:
+        r1 = SynthesisRequest(text="house", voice="joanna")
+        r2 = SynthesisRequest(text="Haus", voice="hans")
+        expected = composite_key(
+            "pair",
+            [request_key(r1, polly_provider), request_key(r2, polly_provider)],
+            500,
+        )
+        assert pair_key(r1, r2, polly_provider, 500) == expected
+
+
+class TestProviderModel:
+    def test_polly_has_no_model(self, polly_provider: PollyProvider) -> None:
+        assert provider_model(polly_provider) is None
+
+    def test_openai_model(self, mock_openai_client: MagicMock) -> None:
+        provider = OpenAIProvider(model="tts-1-hd", client=mock_openai_client)
+        assert provider_model(provider) == "tts-1-hd"
+
+
+class TestOutputFilename:
+    def test_prefix_and_extension(self) -> None:
+        assert output_filename("abcdef" * 10, prefix="pair_") == (
+            "pair_abcdefabcdefabcd.mp3"
+        )
+
+
+class TestSynthesisCache:
+    def test_miss_returns_none(self, tmp_path: Path) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        assert cache.get("ab" * 32) is None
+
+    def test_put_then_get(self, tmp_path: Path) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        key = "ab" * 32
+        with cache.staging_path() as staged:
+            staged.write_bytes(b"audio")
+            entry = cache.put(key, staged)
+        assert cache.get(key) == entry
+        assert entry.read_bytes() == b"audio"
+        assert entry.parent.name == key[:2]
+
+    def test_staging_path_cleaned_up(self, tmp_path: Path) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        with cache.staging_path() as staged:
+            staged.write_bytes(b"partial")
+        assert not staged.exists()
+
+    def test_materialize_links_entry(self, tmp_path: Path) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        with cache.staging_path() as staged:
+            staged.write_bytes(b"audio")
+            entry = cache.put("cd" * 32, staged)
+        dest = tmp_path / "out" / "clip.mp3"
+
+        cache.materialize(entry, dest)
+
+        assert dest.read_bytes() == b"audio"
+        assert os.path.samefile(entry, dest)
+
+    def test_materialize_replaces_without_truncating_entry(
+        self, tmp_path: Path
+    ) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        with cache.staging_path() as staged:
+            staged.write_bytes(b"first")
+            first = cache.put("aa" * 32, staged)
+        with cache.staging_path() as staged:
+            staged.write_bytes(b"second")
+            second = cache.put("bb" * 32, staged)
+        dest = tmp_path / "clip.mp3"
+
+        cache.materialize(first, dest)
+        cache.materialize(second, dest)
+
+        assert dest.read_bytes() == b"second"
+        assert first.read_bytes() == b"first"
+
+    def test_key_for_entry(self, tmp_path: Path) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        key = "ef" * 32
+        assert cache.key_for(cache.path_for(key)) == key
+        assert cache.key_for(tmp_path / f"{key}.mp3") is None
+        assert cache.key_for(tmp_path / "clip.mp3") is None
+
+    def test_put_and_hits_are_indexed(self, tmp_path: Path) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        key = "12" * 32
+        with cache.staging_path() as staged:
+            staged.write_bytes(b"audio")
+            entry = cache.put(key, staged, EntryMeta(text="Haus", language="de"))
+
+        cache.get(key)
+        cache.get(key)
+
+        indexed = cache.index.get(key)
+        assert indexed is not None
+        assert indexed.path == entry
+        assert (indexed.text, indexed.language, indexed.size) == ("Haus", "de", 5)
+        assert indexed.hits == 2
+
+    def test_materialize_records_output(self, tmp_path: Path) -> None:
+        cache = SynthesisCache(tmp_path / "cache")
+        key = "34" * 32
+        with cache.staging_path() as staged:
+            staged.write_bytes(b"audio")
+            entry = cache.put(key, staged)
+        dest = tmp_path / "out" / "clip.mp3"
+
+        cache.materialize(entry, dest)
+
+        assert cache.index.outputs(key) == [dest]
+
+
+class TestCachedTTSClient:
+    @pytest.fixture
+    def cache(self, tmp_path: Path) -> SynthesisCache:
+        return SynthesisCache(tmp_path / "cache")
+
+    def test_repeat_synthesize_calls_provider_once(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        request = SynthesisRequest(text="Haus", voice="hans", rate=85)
+
+        first = client.synthesize(request, tmp_output_dir / "a.mp3")
+        second = client.synthesize(request, tmp_output_dir / "b.mp3")
+
+        assert mock_boto_client.synthesize_speech.call_count == 1
+        assert first.path.read_bytes() == second.path.read_bytes()
+        assert second.path == tmp_output_dir / "b.mp3"
+        assert second.text == "Haus"
+
+    def test_entries_are_indexed(
+        self,
+        polly_provider: PollyProvider,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        request = SynthesisRequest(text="Haus", voice="hans", language="de", rate=85)
+
+        client.synthesize(request, tmp_output_dir / "haus.mp3")
+
+        (segment,) = cache.index.find("Haus", language="de", rate=85)
+        assert (segment.voice, segment.provider) == ("hans", "polly")
+        assert segment.duration_ms == 50
+        (clip,) = cache.index.find("Haus", kind="clip")
+        # 50 ms + 150 ms trailing silence, whole 576-sample frames at 11 kHz.
+        assert clip.duration_ms is not None
+        assert abs(clip.duration_ms - 200) <= 576 * 1000 // 11025
+        assert cache.index.outputs(clip.key) == [tmp_output_dir / "haus.mp3"]
+
+    def test_changed_rate_is_a_miss(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        out = tmp_output_dir / "haus.mp3"
+
+        client.synthesize(SynthesisRequest(text="Haus", voice="hans", rate=85), out)
+        client.synthesize(SynthesisRequest(text="Haus", voice="hans", rate=100), out)
+
+        assert mock_boto_client.synthesize_speech.call_count == 2
+
+    def test_existing_output_is_not_a_hit(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        out = tmp_output_dir / "stale.mp3"
+        out.write_bytes(b"stale")
+        client = TTSClient(polly_provider, cache=cache)
+
+        client.synthesize(SynthesisRequest(text="hello", voice="joanna"), out)
+
+        assert mock_boto_client.synthesize_speech.call_count == 1
+        assert out.read_bytes() != b"stale"
+
+    def test_cache_shared_across_clients(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+        tmp_output_dir: Path,
+    ) -> None:
+        request = SynthesisRequest(text="hello", voice="joanna")
+        root = tmp_path / "cache"
+
+        TTSClient(polly_provider, cache=SynthesisCache(root)).synthesize(
+            request, tmp_output_dir / "a.mp3"
+        )
+        TTSClient(polly_provider, cache=SynthesisCache(root)).synthesize(
+            request, tmp_output_dir / "b.mp3"
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 1
+
+    def test_repeat_pair_is_a_hit(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        r1 = SynthesisRequest(text="house", voice="joanna")
+        r2 = SynthesisRequest(text="Haus", voice="hans")
+
+        client.synthesize_pair("house", r1, "Haus", r2, tmp_output_dir / "p1.mp3")
+        result = client.synthesize_pair(
+            "house", r1, "Haus", r2, tmp_output_dir / "p2.mp3"
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 2
+        assert result.text == "house | Haus"
+        assert result.voice == "joanna+hans"
+
+    def test_repeat_merged_batch_is_a_hit(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        requests = [
+            SynthesisRequest(text="one", voice="joanna"),
+            SynthesisRequest(text="two", voice="joanna"),
+        ]
+
+        first = client.synthesize_batch(
+            requests, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+        )
+        second = client.synthesize_batch(
+            requests, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 2
+        assert first[0].path == second[0].path
+        assert second[0].path.exists()
+
+    def test_separate_batch_cached_per_item(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        client.synthesize(
+            SynthesisRequest(text="one", voice="joanna"), tmp_output_dir / "1.mp3"
+        )
+
+        client.synthesize_batch(
+            [
+                SynthesisRequest(text="one", voice="joanna"),
+                SynthesisRequest(text="two", voice="joanna"),
+            ],
+            tmp_output_dir,
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 2
+
+    def test_pair_reuses_cached_single(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        house = SynthesisRequest(text="house", voice="joanna")
+        client.synthesize(house, tmp_output_dir / "house.mp3")
+
+        client.synthesize_pair(
+            "house",
+            house,
+            "Haus",
+            SynthesisRequest(text="Haus", voice="hans"),
+            tmp_output_dir / "pair.mp3",
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 2
+
+    def test_shared_half_synthesized_once_across_pairs(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        house = SynthesisRequest(text="house", voice="joanna")
+
+        client.synthesize_pair_batch(
+            [
+                (house, SynthesisRequest(text="Haus", voice="hans")),
+                (house, SynthesisRequest(text="дом", voice="tatyana")),
+            ],
+            tmp_output_dir,
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 3
+
+    def test_merged_batch_built_from_cached_items(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        requests = [
+            SynthesisRequest(text="one", voice="joanna"),
+            SynthesisRequest(text="two", voice="joanna"),
+        ]
+        client.synthesize_batch(requests, tmp_output_dir)
+
+        results = client.synthesize_batch(
+            [*requests, SynthesisRequest(text="three", voice="joanna")],
+            tmp_output_dir,
+            MergeStrategy.ONE_FILE_PER_BATCH,
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 3
+        assert results[0].path.exists()
+
+    def test_merged_pairs_built_from_cached_pairs(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        cache: SynthesisCache,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider, cache=cache)
+        pairs = [
+            (
+                SynthesisRequest(text="house", voice="joanna"),
+                SynthesisRequest(text="Haus", voice="hans"),
+            ),
+            (
+                SynthesisRequest(text="water", voice="joanna"),
+                SynthesisRequest(text="Wasser", voice="hans"),
+            ),
+        ]
+        client.synthesize_pair_batch(pairs, tmp_output_dir)
+
+        results = client.synthesize_pair_batch(
+            pairs, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 4
+        assert results[0].voice == "mixed"
+        assert results[0].path.exists()
+
+    def test_no_cache_always_calls_provider(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_output_dir: Path,
+    ) -> None:
+        client = TTSClient(polly_provider)
+        request = SynthesisRequest(text="hello", voice="joanna")
+
+        client.synthesize(request, tmp_output_dir / "a.mp3")
+        client.synthesize(request, tmp_output_dir / "a.mp3")
+
+        assert mock_boto_client.synthesize_speech.call_count == 2
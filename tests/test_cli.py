@@ -4,16 +4,22 @@ from __future__ import annotations
 
 import json
 import os
+from collections.abc import Iterable, Iterator
 from pathlib import Path
+from typing import Any
 from unittest.mock import MagicMock, patch
 
+import pytest
 from click.testing import CliRunner, Result
 
+from langlearn_tts.cache import SynthesisCache
 from langlearn_tts.cli import main
+from langlearn_tts.index import EntryMeta
 from langlearn_tts.types import (
     AudioProviderId,
     HealthCheck,
     MergeStrategy,
+    SynthesisRequest,
     SynthesisResult,
 )
 
@@ -248,10 +254,12 @@ class TestSynthesizeBatchCommand:
 
         mock_get_provider.return_value = _make_mock_provider()
         mock_instance = mock_client_cls.return_value
-        mock_instance.synthesize_batch.return_value = [
-            _mock_synthesize_result(out_dir / "a.mp3", "hello"),
-            _mock_synthesize_result(out_dir / "b.mp3", "world"),
-        ]
+        mock_instance.iter_batch.return_value = enumerate(
+            [
+                _mock_synthesize_result(out_dir / "a.mp3", "hello"),
+                _mock_synthesize_result(out_dir / "b.mp3", "world"),
+            ]
+        )
 
         runner = CliRunner()
         result = runner.invoke(
@@ -260,7 +268,12 @@ class TestSynthesizeBatchCommand:
         )
 
         assert result.exit_code == 0
-        mock_instance.synthesize_batch.assert_called_once()
+        mock_instance.iter_batch.assert_called_once()
+        mock_instance.synthesize_batch.assert_not_called()
+        assert result.output.split() == [
+            str(out_dir / "a.mp3"),
+            str(out_dir / "b.mp3"),
+        ]
 
     @patch(f"{_CLI}.TTSClient")
     @patch(f"{_CLI}.get_provider")
@@ -378,20 +391,22 @@ class TestSynthesizePairBatchCommand:
 
         mock_get_provider.return_value = _make_mock_provider()
         mock_instance = mock_client_cls.return_value
-        mock_instance.synthesize_pair_batch.return_value = [
-            SynthesisResult(
-                path=out_dir / "a.mp3",
-                text="strong | stark",
-                provider=AudioProviderId.polly,
-                voice="joanna+hans",
-            ),
-            SynthesisResult(
-                path=out_dir / "b.mp3",
-                text="house | Haus",
-                provider=AudioProviderId.polly,
-                voice="joanna+hans",
-            ),
-        ]
+        mock_instance.iter_pair_batch.return_value = enumerate(
+            [
+                SynthesisResult(
+                    path=out_dir / "a.mp3",
+                    text="strong | stark",
+                    provider=AudioProviderId.polly,
+                    voice="joanna+hans",
+                ),
+                SynthesisResult(
+                    path=out_dir / "b.mp3",
+                    text="house | Haus",
+                    provider=AudioProviderId.polly,
+                    voice="joanna+hans",
+                ),
+            ]
+        )
 
         runner = CliRunner()
         result = runner.invoke(
@@ -405,7 +420,220 @@ class TestSynthesizePairBatchCommand:
         )
 
         assert result.exit_code == 0
-        mock_instance.synthesize_pair_batch.assert_called_once()
+        mock_instance.iter_pair_batch.assert_called_once()
+        mock_instance.synthesize_pair_batch.assert_not_called()
+
+
+def _echo_batch(
+    requests: Iterable[SynthesisRequest], out: Path, *, ordered: bool = True
+) -> Iterator[tuple[int, SynthesisResult]]:
+    for index, request in enumerate(requests):
+        path = out / f"{request.text}.mp3"
+        yield index, _mock_synthesize_result(path, request.text)
+
+
+def _echo_pair_batch(
+    pairs: Iterable[tuple[SynthesisRequest, SynthesisRequest]],
+    out: Path,
+    pause_ms: int,
+    *,
+    ordered: bool = True,
+) -> Iterator[tuple[int, SynthesisResult]]:
+    for index, (first, second) in enumerate(pairs):
+        text = f"{first.text} | {second.text}"
+        path = out / f"{first.text}_{second.text}.mp3"
+        yield index, _mock_synthesize_result(path, text)
+
+
+@patch(f"{_CLI}.get_provider", return_value=_make_mock_provider())
+class TestBatchInputFormats:
+    def _run(self, args: list[str], tmp_path: Path, stdin: str | None = None) -> Result:
+        with patch(f"{_CLI}.TTSClient") as client_cls:
+            client = client_cls.return_value
+            client.iter_batch.side_effect = _echo_batch
+            client.iter_pair_batch.side_effect = _echo_pair_batch
+            return CliRunner().invoke(
+                main, ["--json", *args, "-d", str(tmp_path / "out")], input=stdin
+            )
+
+    def _texts(self, result: Result) -> list[str]:
+        assert result.exit_code == 0, result.output
+        return [item["text"] for item in json.loads(result.output)]
+
+    def test_jsonl(self, _provider: MagicMock, tmp_path: Path) -> None:
+        words = tmp_path / "words.jsonl"
+        words.write_text('"eins"\n\n"zwei"\n', encoding="utf-8")
+
+        result = self._run(["synthesize-batch", str(words)], tmp_path)
+
+        assert self._texts(result) == ["eins", "zwei"]
+
+    def test_tsv_uses_first_column(self, _provider: MagicMock, tmp_path: Path) -> None:
+        words = tmp_path / "words.tsv"
+        words.write_text("Haus\thouse\nMaus\tmouse\n", encoding="utf-8")
+
+        result = self._run(["synthesize-batch", str(words)], tmp_path)
+
+        assert self._texts(result) == ["Haus", "Maus"]
+
+    def test_csv_pairs_ignore_extra_columns(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        pairs = tmp_path / "pairs.csv"
+        pairs.write_text('strong,stark,adj\n"a, b",c\n', encoding="utf-8")
+
+        result = self._run(["synthesize-pair-batch", str(pairs)], tmp_path)
+
+        assert self._texts(result) == ["strong | stark", "a, b | c"]
+
+    def test_stdin_defaults_to_jsonl(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        result = self._run(
+            ["synthesize-pair-batch", "-"], tmp_path, stdin='["house", "Haus"]\n'
+        )
+
+        assert self._texts(result) == ["house | Haus"]
+
+    def test_format_option_overrides_extension(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        words = tmp_path / "words.txt"
+        words.write_text("Haus\nMaus\n", encoding="utf-8")
+
+        result = self._run(
+            ["synthesize-batch", "--format", "csv", str(words)], tmp_path
+        )
+
+        assert self._texts(result) == ["Haus", "Maus"]
+
+    def test_bad_line_reports_line_number(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        words = tmp_path / "words.jsonl"
+        words.write_text('"eins"\n{not json\n', encoding="utf-8")
+
+        result = self._run(["synthesize-batch", str(words)], tmp_path)
+
+        assert result.exit_code == 2
+        assert "Line 2 is not valid JSON" in result.output
+
+    def test_short_csv_row_rejected(self, _provider: MagicMock, tmp_path: Path) -> None:
+        pairs = tmp_path / "pairs.csv"
+        pairs.write_text("strong,stark\nhouse\n", encoding="utf-8")
+
+        result = self._run(["synthesize-pair-batch", str(pairs)], tmp_path)
+
+        assert result.exit_code == 2
+        assert "Line 2 must have 2 columns" in result.output
+
+    def test_json_element_type_checked(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        words = tmp_path / "words.json"
+        words.write_text(json.dumps(["eins", 2]), encoding="utf-8")
+
+        result = self._run(["synthesize-batch", str(words)], tmp_path)
+
+        assert result.exit_code == 2
+        assert "Element 1 must be a string" in result.output
+
+    @pytest.mark.parametrize(
+        ("command", "items", "error"),
+        [
+            ("synthesize-batch", ["eins", "zwei", 3], "Element 2 must be a string"),
+            (
+                "synthesize-pair-batch",
+                [["one", "eins"], ["two"]],
+                "Element 1 must be a [text1, text2] pair",
+            ),
+        ],
+    )
+    def test_bad_json_element_fails_before_any_synthesis(
+        self,
+        _provider: MagicMock,
+        tmp_path: Path,
+        command: str,
+        items: list[object],
+        error: str,
+    ) -> None:
+        words = tmp_path / "words.json"
+        words.write_text(json.dumps(items), encoding="utf-8")
+        synthesized: list[object] = []
+
+        def record(items: Iterable[object], *args: Any, **kwargs: Any) -> Iterator[Any]:
+            for item in items:
+                synthesized.append(item)
+                yield len(synthesized) - 1, MagicMock()
+
+        with patch(f"{_CLI}.TTSClient") as client_cls:
+            client_cls.return_value.iter_batch.side_effect = record
+            client_cls.return_value.iter_pair_batch.side_effect = record
+            result = CliRunner().invoke(
+                main, [command, str(words), "-d", str(tmp_path / "out")]
+            )
+
+        assert result.exit_code == 2
+        assert error in result.output
+        assert synthesized == []
+
+
+@patch(f"{_CLI}.get_provider", return_value=_make_mock_provider())
+class TestBatchStream:
+    def _invoke(self, args: list[str], tmp_path: Path) -> tuple[Result, MagicMock]:
+        words = tmp_path / "words.jsonl"
+        words.write_text('"eins"\n"zwei"\n', encoding="utf-8")
+        with patch(f"{_CLI}.TTSClient") as client_cls:
+            client = client_cls.return_value
+            client.iter_batch.return_value = iter(
+                [
+                    (1, _mock_synthesize_result(tmp_path / "zwei.mp3", "zwei")),
+                    (0, _mock_synthesize_result(tmp_path / "eins.mp3", "eins")),
+                ]
+            )
+            client.synthesize_batch.return_value = [
+                _mock_synthesize_result(tmp_path / "merged.mp3", "eins | zwei")
+            ]
+            result = CliRunner().invoke(
+                main, ["synthesize-batch", str(words), "--stream", *args]
+            )
+        return result, client
+
+    def test_one_json_line_per_result(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        result, client = self._invoke([], tmp_path)
+
+        assert result.exit_code == 0, result.output
+        lines = [json.loads(line) for line in result.output.splitlines()]
+        assert [(line["index"], line["text"]) for line in lines] == [
+            (1, "zwei"),
+            (0, "eins"),
+        ]
+        assert lines[0]["path"] == str(tmp_path / "zwei.mp3")
+        assert all(line["elapsed_seconds"] >= 0 for line in lines)
+        assert client.iter_batch.call_args.kwargs == {"ordered": False}
+
+    def test_merged_is_a_single_line(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        result, _ = self._invoke(["--merge"], tmp_path)
+
+        assert result.exit_code == 0, result.output
+        (line,) = result.output.splitlines()
+        assert json.loads(line)["index"] == 0
+
+    def test_without_stream_stays_in_input_order(
+        self, _provider: MagicMock, tmp_path: Path
+    ) -> None:
+        words = tmp_path / "words.jsonl"
+        words.write_text('"eins"\n', encoding="utf-8")
+        with patch(f"{_CLI}.TTSClient") as client_cls:
+            client = client_cls.return_value
+            client.iter_batch.side_effect = _echo_batch
+            CliRunner().invoke(main, ["synthesize-batch", str(words)])
+
+        assert client.iter_batch.call_args.kwargs == {"ordered": True}
 
 
 class TestMainGroup:
@@ -448,6 +676,100 @@ class TestMainGroup:
         assert result.exit_code == 0
         mock_get_provider.assert_called_once_with("polly", model=None)
 
+    @patch(f"{_CLI}.TTSClient")
+    @patch(f"{_CLI}.get_provider")
+    def test_waits_for_voice_catalog_refresh_at_exit(
+        self, mock_get_provider: MagicMock, mock_client_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        out = tmp_path / "test.mp3"
+        mock_get_provider.return_value = _make_mock_provider()
+        mock_client_cls.return_value.synthesize.return_value = _mock_synthesize_result(
+            out
+        )
+
+        with patch(f"{_CLI}.wait_for_refreshes") as wait:
+            result = CliRunner().invoke(main, ["synthesize", "hello", "-o", str(out)])
+
+        assert result.exit_code == 0
+        wait.assert_called_once()
+
+    @patch(f"{_CLI}.TTSClient")
+    @patch(f"{_CLI}.get_provider")
+    def test_cache_enabled_by_default(
+        self, mock_get_provider: MagicMock, mock_client_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        out = tmp_path / "test.mp3"
+        mock_get_provider.return_value = _make_mock_provider()
+        mock_client_cls.return_value.synthesize.return_value = _mock_synthesize_result(
+            out
+        )
+
+        runner = CliRunner()
+        with patch.dict(os.environ, {"TTS_CACHE_DIR": str(tmp_path / "cache")}):
+            result = runner.invoke(main, ["synthesize", "hello", "-o", str(out)])
+
+        assert result.exit_code == 0
+        cache = mock_client_cls.call_args.kwargs["cache"]
+        assert cache.root == tmp_path / "cache"
+
+    @patch(f"{_CLI}.TTSClient")
+    @patch(f"{_CLI}.get_provider")
+    def test_no_cache_flag(
+        self, mock_get_provider: MagicMock, mock_client_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        out = tmp_path / "test.mp3"
+        mock_get_provider.return_value = _make_mock_provider()
+        mock_client_cls.return_value.synthesize.return_value = _mock_synthesize_result(
+            out
+        )
+
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["--no-cache", "synthesize", "hello", "-o", str(out)]
+        )
+
+        assert result.exit_code == 0
+        assert mock_client_cls.call_args.kwargs["cache"] is None
+
+    @patch(f"{_CLI}.TTSClient")
+    @patch(f"{_CLI}.get_provider")
+    def test_jobs_option(
+        self, mock_get_provider: MagicMock, mock_client_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_get_provider.return_value = _make_mock_provider()
+        mock_client_cls.return_value.synthesize_batch.return_value = []
+        words = tmp_path / "words.json"
+        words.write_text('["eins", "zwei"]')
+
+        runner = CliRunner()
+        result = runner.invoke(
+            main, ["synthesize-batch", str(words), "--jobs", "4", "-d", str(tmp_path)]
+        )
+        rejected = runner.invoke(main, ["synthesize-batch", str(words), "-j", "0"])
+
+        assert result.exit_code == 0, result.output
+        assert mock_client_cls.call_args.kwargs["jobs"] == 4
+        assert rejected.exit_code != 0
+
+    @patch(f"{_CLI}.TTSClient")
+    @patch(f"{_CLI}.get_provider")
+    def test_default_output_names_do_not_collide(
+        self, mock_get_provider: MagicMock, mock_client_cls: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_get_provider.return_value = _make_mock_provider()
+        mock_instance = mock_client_cls.return_value
+        mock_instance.synthesize.return_value = _mock_synthesize_result(tmp_path)
+        prefix = "twenty characters!! "
+
+        runner = CliRunner()
+        with patch.dict(os.environ, {"TTS_OUTPUT_DIR": str(tmp_path)}):
+            runner.invoke(main, ["synthesize", f"{prefix}one"])
+            runner.invoke(main, ["synthesize", f"{prefix}two"])
+
+        first, second = (c.args[1] for c in mock_instance.synthesize.call_args_list)
+        assert first != second
+        assert first.parent == tmp_path
+
 
 # ---------------------------------------------------------------------------
 # doctor tests
@@ -958,3 +1280,82 @@ class TestInstallCommand:
         env = data["mcpServers"]["langlearn-tts"]["env"]
         assert env["TTS_PROVIDER"] == "elevenlabs"
         assert env["ELEVENLABS_API_KEY"] == "sk_test_key"
+
+
+# ---------------------------------------------------------------------------
+# cache tests
+# ---------------------------------------------------------------------------
+
+
+class TestCacheCommands:
+    @patch(f"{_CLI}.get_provider")
+    def test_prune_evicts_to_budget(
+        self, mock_get_provider: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_get_provider.return_value = _make_mock_provider()
+        for name in ("a.mp3", "b.mp3"):
+            clip = tmp_path / name
+            clip.write_bytes(b"x" * 1000)
+            os.utime(clip, (0, 0))
+
+        runner = CliRunner()
+        with patch.dict(os.environ, {"TTS_OUTPUT_DIR": str(tmp_path)}):
+            result = runner.invoke(
+                main, ["--json", "cache", "prune", "--max-size", "1500"]
+            )
+
+        assert result.exit_code == 0, result.output
+        payload = json.loads(result.output)
+        assert payload["evicted_files"] == 1
+        assert payload["remaining_bytes"] == 1000
+
+    @patch(f"{_CLI}.get_provider")
+    def test_prune_rejects_bad_size(
+        self, mock_get_provider: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_get_provider.return_value = _make_mock_provider()
+        runner = CliRunner()
+        with patch.dict(os.environ, {"TTS_OUTPUT_DIR": str(tmp_path)}):
+            result = runner.invoke(main, ["cache", "prune", "--max-size", "lots"])
+        assert result.exit_code != 0
+        assert "Invalid size" in result.output
+
+    @patch(f"{_CLI}.get_provider")
+    def test_pin_then_unpin(self, mock_get_provider: MagicMock, tmp_path: Path) -> None:
+        mock_get_provider.return_value = _make_mock_provider()
+        words = tmp_path / "words.json"
+        words.write_text('["Haus", "Katze"]')
+
+        runner = CliRunner()
+        with patch.dict(os.environ, {"TTS_OUTPUT_DIR": str(tmp_path)}):
+            pinned = runner.invoke(main, ["cache", "pin", str(words)])
+            unpinned = runner.invoke(main, ["cache", "pin", "--unpin", str(words)])
+
+        assert pinned.output.strip() == "Pinned 2 texts."
+        assert unpinned.output.strip() == "Unpinned 2 texts."
+
+    @patch(f"{_CLI}.get_provider")
+    def test_find_lists_cached_voices(
+        self, mock_get_provider: MagicMock, tmp_path: Path
+    ) -> None:
+        mock_get_provider.return_value = _make_mock_provider()
+        cache = SynthesisCache(tmp_path / ".cache")
+        for voice in ("hans", "vicki"):
+            with cache.staging_path() as staged:
+                staged.write_bytes(b"audio")
+                cache.put(
+                    voice * 8,
+                    staged,
+                    EntryMeta(text="Haus", voice=voice, language="de", rate=85),
+                )
+
+        runner = CliRunner()
+        with patch.dict(os.environ, {"TTS_OUTPUT_DIR": str(tmp_path)}):
+            found = runner.invoke(
+                main, ["--json", "cache", "find", "Haus", "--lang", "de"]
+            )
+            missing = runner.invoke(main, ["cache", "find", "Maus"])
+
+        assert found.exit_code == 0, found.output
+        assert {e["voice"] for e in json.loads(found.output)} == {"hans", "vicki"}
+        assert missing.output.strip() == "Not cached."
@@ -0,0 +1,191 @@
+"""Tests for langlearn_tts.codec."""
+
+from __future__ import annotations
+
+import subprocess
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+
+from langlearn_tts import codec, mp3
+from langlearn_tts.codec import CodecPool, decode_pcm, encode_mp3
+
+
+def _mp3(path: Path, seconds: float = 0.5, rate: int = 24000) -> bytes:
+    subprocess.run(
+        [
+            "ffmpeg",
+            "-y",
+            "-f",
+            "lavfi",
+            "-i",
+            f"sine=f=440:r={rate}",
+            "-t",
+            str(seconds),
+            "-ac",
+            "1",
+            "-c:a",
+            "libmp3lame",
+            str(path),
+        ],
+        capture_output=True,
+        check=True,
+    )
+    return path.read_bytes()
+
+
+def _wait_idle(pool: CodecPool, key: Any, count: int) -> None:
+    """Wait for the background top-ups to leave ``count`` idle processes."""
+    deadline = time.monotonic() + 5
+    while time.monotonic() < deadline:
+        idle = pool._idle.get(key)  # pyright: ignore[reportPrivateUsage, reportArgumentType]
+        if idle is not None and len(idle) >= count:
+            return
+        time.sleep(0.005)
+    msg = f"pool never held {count} idle processes for {key}"
+    raise AssertionError(msg)
+
+
+@pytest.fixture
+def pool() -> Iterator[CodecPool]:
+    processes = CodecPool(size=2)
+    yield processes
+    processes.close()
+
+
+class TestDecode:
+    def test_decodes_to_requested_format(self, pool: CodecPool, tmp_path: Path) -> None:
+        data = _mp3(tmp_path / "a.mp3")
+
+        pcm = pool.decode(data, 16000, 2)
+
+        # Half a second of 16-bit stereo at 16 kHz, give or take a frame.
+        assert abs(len(pcm) - 16000 * 4 // 2) < 1152 * 4
+        assert any(pcm)
+
+    def test_formats_have_separate_decoders(
+        self, pool: CodecPool, tmp_path: Path
+    ) -> None:
+        data = _mp3(tmp_path / "a.mp3")
+
+        mono = pool.decode(data, 24000, 1)
+        stereo = pool.decode(data, 24000, 2)
+
+        assert len(stereo) == 2 * len(mono)
+
+    def test_invalid_input_raises(self, pool: CodecPool) -> None:
+        with pytest.raises(RuntimeError, match="ffmpeg failed to decode"):
+            pool.decode(b"not audio at all", 24000, 1)
+
+
+class TestEncode:
+    def test_encodes_pcm_to_mp3(self, pool: CodecPool, tmp_path: Path) -> None:
+        out = tmp_path / "nested" / "out.mp3"
+
+        with pool.encode(out, 22050, 1) as pcm:
+            pcm.write(bytes(22050 * 2))  # one second of silence
+
+        duration = mp3.duration_ms(out)
+        assert duration is not None
+        assert abs(duration - 1000) < 60
+
+    def test_writes_nothing_on_failure(self, pool: CodecPool, tmp_path: Path) -> None:
+        out = tmp_path / "out.mp3"
+
+        with (
+            pytest.raises(ValueError, match="bad segment"),
+            pool.encode(out, 22050, 1),
+        ):
+            raise ValueError("bad segment")
+
+        assert not out.exists()
+
+    def test_failure_raises(self, pool: CodecPool, tmp_path: Path) -> None:
+        with (
+            patch("pydub.AudioSegment.converter", "false"),
+            pytest.raises(RuntimeError, match="ffmpeg failed to encode"),
+            pool.encode(tmp_path / "out.mp3", 22050, 1) as pcm,
+        ):
+            pcm.write(bytes(22050 * 2))
+
+    def test_error_in_block_kills_encoder(
+        self, pool: CodecPool, tmp_path: Path
+    ) -> None:
+        with (
+            pytest.raises(ValueError, match="bad segment"),
+            pool.encode(tmp_path / "out.mp3", 22050, 1) as pcm,
+        ):
+            pcm.write(bytes(100))
+            raise ValueError("bad segment")
+
+
+class TestPrewarming:
+    def test_jobs_take_prewarmed_processes(
+        self, pool: CodecPool, tmp_path: Path
+    ) -> None:
+        data = _mp3(tmp_path / "a.mp3")
+        pool.decode(data, 24000, 1)
+        spawned_on: list[threading.Thread] = []
+        spawn = codec._spawn  # pyright: ignore[reportPrivateUsage]
+
+        def record(key: Any) -> Any:
+            spawned_on.append(threading.current_thread())
+            return spawn(key)
+
+        with patch("langlearn_tts.codec._spawn", side_effect=record):
+            for _ in range(3):
+                _wait_idle(pool, ("decode", 24000, 1), 2)
+                pool.decode(data, 24000, 1)
+            _wait_idle(pool, ("decode", 24000, 1), 2)
+
+        # Each job took an idle decoder; replacements started elsewhere.
+        assert len(spawned_on) == 3
+        assert threading.main_thread() not in spawned_on
+
+    def test_spawns_happen_outside_the_lock(
+        self, pool: CodecPool, tmp_path: Path
+    ) -> None:
+        data = _mp3(tmp_path / "a.mp3")
+        spawn = codec._spawn  # pyright: ignore[reportPrivateUsage]
+        lock_held: list[bool] = []
+
+        def record(key: Any) -> Any:
+            lock_held.append(pool._lock.locked())  # pyright: ignore[reportPrivateUsage]
+            return spawn(key)
+
+        with patch("langlearn_tts.codec._spawn", side_effect=record):
+            pool.decode(data, 24000, 1)
+            _wait_idle(pool, ("decode", 24000, 1), 2)
+
+        # One process for the cold job, two top-ups; none under the lock.
+        assert lock_held == [False, False, False]
+
+    def test_close_kills_idle_processes(self, pool: CodecPool, tmp_path: Path) -> None:
+        data = _mp3(tmp_path / "a.mp3")
+        pool.decode(data, 24000, 1)
+        _wait_idle(pool, ("decode", 24000, 1), 2)
+        idle = list(pool._idle[("decode", 24000, 1)])  # pyright: ignore[reportPrivateUsage]
+
+        pool.close()
+
+        assert all(worker.process.poll() is not None for worker in idle)
+        assert pool.decode(data, 24000, 1)
+
+
+class TestSharedPool:
+    def test_round_trip(self, tmp_path: Path) -> None:
+        data = _mp3(tmp_path / "a.mp3", seconds=0.2)
+        out = tmp_path / "out.mp3"
+
+        pcm = decode_pcm(data, 24000, 1)
+        with encode_mp3(out, 24000, 1) as encoder:
+            encoder.write(pcm)
+
+        duration = mp3.duration_ms(out)
+        assert duration is not None
+        assert abs(duration - 200) < 60
@@ -0,0 +1,483 @@
+"""Tests for langlearn_tts.concurrency."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import CancelledError
+from unittest.mock import patch
+
+import pytest
+
+from langlearn_tts.concurrency import (
+    Cancellation,
+    RequestGate,
+    SingleFlight,
+    cancellable,
+    check_cancelled,
+    default_jobs,
+    gather_ordered,
+    imap_completed,
+    imap_ordered,
+    map_ordered,
+)
+from langlearn_tts.ratelimit import Priority, current_priority, priority
+
+
+class TestMapOrdered:
+    def test_preserves_input_order(self) -> None:
+        delays = [0.05, 0.0, 0.03, 0.01]
+
+        def slow_identity(i: int) -> int:
+            time.sleep(delays[i])
+            return i
+
+        assert map_ordered(slow_identity, range(4), jobs=4) == [0, 1, 2, 3]
+
+    def test_runs_concurrently(self) -> None:
+        barrier = threading.Barrier(3, timeout=5)
+
+        def meet(i: int) -> int:
+            barrier.wait()
+            return i * 2
+
+        assert map_ordered(meet, [1, 2, 3], jobs=3) == [2, 4, 6]
+
+    def test_bounded_by_jobs(self) -> None:
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def track(i: int) -> int:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return i
+
+        map_ordered(track, list(range(8)), jobs=2)
+
+        assert peak == 2
+
+    def test_single_job_runs_inline(self) -> None:
+        caller = threading.current_thread()
+        threads = map_ordered(lambda _: threading.current_thread(), [1, 2], jobs=1)
+        assert threads == [caller, caller]
+
+    def test_equal_keys_run_in_order_on_one_thread(self) -> None:
+        seen: list[tuple[str, int]] = []
+
+        def record(item: tuple[str, int]) -> str:
+            time.sleep(0.01 * (3 - item[1]))
+            seen.append(item)
+            return threading.current_thread().name
+
+        items = [("a", 0), ("b", 0), ("a", 1), ("a", 2)]
+        threads = map_ordered(record, items, jobs=4, key=lambda item: item[0])
+
+        assert [i for k, i in seen if k == "a"] == [0, 1, 2]
+        assert threads[0] == threads[2] == threads[3]
+
+    def test_error_propagates_and_cancels_pending(self) -> None:
+        started: list[int] = []
+
+        def fail_first(i: int) -> int:
+            started.append(i)
+            if i == 0:
+                raise RuntimeError("boom")
+            time.sleep(0.05)
+            return i
+
+        with pytest.raises(RuntimeError, match="boom"):
+            map_ordered(fail_first, list(range(20)), jobs=2)
+
+        assert len(started) < 20
+
+    @pytest.mark.parametrize("jobs", [1, 3])
+    def test_on_result_streams_in_order(self, jobs: int) -> None:
+        first_seen = threading.Event()
+        seen: list[int] = []
+
+        def work(i: int) -> int:
+            # The last item cannot finish until the first was reported.
+            if i == 3:
+                assert first_seen.wait(timeout=5)
+            time.sleep(0.01 * (3 - i))
+            return i
+
+        def report(result: int) -> None:
+            seen.append(result)
+            first_seen.set()
+
+        assert map_ordered(work, range(4), jobs, on_result=report) == [0, 1, 2, 3]
+        assert seen == [0, 1, 2, 3]
+
+    def test_on_result_stops_at_failure(self) -> None:
+        seen: list[int] = []
+
+        def work(i: int) -> int:
+            if i == 2:
+                raise RuntimeError("boom")
+            return i
+
+        with pytest.raises(RuntimeError, match="boom"):
+            map_ordered(work, range(5), 3, on_result=seen.append)
+
+        assert seen == list(range(len(seen)))
+        assert 2 not in seen
+
+    def test_workers_inherit_context(self) -> None:
+        with priority(Priority.BATCH):
+            levels = map_ordered(lambda _: current_priority(), range(4), jobs=4)
+
+        assert levels == [Priority.BATCH] * 4
+
+
+class TestImapOrdered:
+    def test_preserves_input_order(self) -> None:
+        delays = [0.05, 0.0, 0.03, 0.01]
+
+        def slow_identity(i: int) -> int:
+            time.sleep(delays[i])
+            return i
+
+        assert list(imap_ordered(slow_identity, range(4), jobs=4)) == [0, 1, 2, 3]
+
+    @pytest.mark.parametrize("jobs", [1, 3])
+    def test_reads_input_lazily(self, jobs: int) -> None:
+        read = 0
+
+        def items() -> Iterator[int]:
+            nonlocal read
+            for i in range(1000):
+                read += 1
+                yield i
+
+        results = imap_ordered(lambda i: i, items(), jobs)
+
+        assert next(results) == 0
+        assert read <= 2 * jobs
+        assert list(results) == list(range(1, 1000))
+
+    def test_first_failure_raised_in_order(self) -> None:
+        def fail_on_two(i: int) -> int:
+            if i == 2:
+                raise ValueError(i)
+            return i
+
+        seen: list[int] = []
+        with pytest.raises(ValueError, match="2"):
+            seen.extend(imap_ordered(fail_on_two, range(6), jobs=2))
+
+        assert seen == [0, 1]
+
+    def test_carries_context(self) -> None:
+        with priority(Priority.BATCH):
+            levels = list(imap_ordered(lambda _: current_priority(), range(4), 2))
+
+        assert levels == [Priority.BATCH] * 4
+
+
+class TestImapCompleted:
+    def test_yields_in_completion_order_with_index(self) -> None:
+        release = threading.Event()
+
+        def slow_first(i: int) -> int:
+            if i == 0:
+                release.wait(timeout=5)
+            return i * 10
+
+        results = imap_completed(slow_first, range(3), jobs=3)
+        first_two = [next(results), next(results)]
+        release.set()
+
+        assert sorted(first_two) == [(1, 10), (2, 20)]
+        assert list(results) == [(0, 0)]
+
+    @pytest.mark.parametrize("jobs", [1, 3])
+    def test_reads_input_lazily(self, jobs: int) -> None:
+        read = 0
+
+        def items() -> Iterator[int]:
+            nonlocal read
+            for i in range(100):
+                read += 1
+                yield i
+
+        results = imap_completed(lambda i: i, items(), jobs)
+
+        first = next(results)
+        assert read <= 2 * jobs
+        assert sorted([first, *results]) == [(i, i) for i in range(100)]
+
+    def test_failure_raised(self) -> None:
+        def fail_on_two(i: int) -> int:
+            if i == 2:
+                raise ValueError(i)
+            return i
+
+        with pytest.raises(ValueError, match="2"):
+            list(imap_completed(fail_on_two, range(6), jobs=2))
+
+
+class TestGatherOrdered:
+    def test_preserves_input_order(self) -> None:
+        async def slow_identity(i: int) -> int:
+            await asyncio.sleep(0.01 * (3 - i))
+            return i
+
+        assert asyncio.run(gather_ordered(slow_identity, [0, 1, 2, 3])) == [0, 1, 2, 3]
+
+    def test_equal_keys_run_sequentially(self) -> None:
+        active: dict[str, int] = {}
+        overlaps = 0
+
+        async def track(item: tuple[str, int]) -> int:
+            nonlocal overlaps
+            key = item[0]
+            active[key] = active.get(key, 0) + 1
+            overlaps += active[key] > 1
+            await asyncio.sleep(0.01)
+            active[key] -= 1
+            return item[1]
+
+        items = [("a", 0), ("b", 1), ("a", 2), ("a", 3)]
+        result = asyncio.run(gather_ordered(track, items, key=lambda item: item[0]))
+
+        assert result == [0, 1, 2, 3]
+        assert overlaps == 0
+
+    def test_error_cancels_others(self) -> None:
+        finished: list[int] = []
+
+        async def fail_first(i: int) -> int:
+            if i == 0:
+                raise RuntimeError("boom")
+            await asyncio.sleep(0.5)
+            finished.append(i)
+            return i
+
+        async def run() -> None:
+            with pytest.raises(RuntimeError, match="boom"):
+                await gather_ordered(fail_first, [0, 1, 2])
+            await asyncio.sleep(0.6)
+
+        asyncio.run(run())
+
+        assert finished == []
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self) -> None:
+        flights = SingleFlight[int]()
+        release = threading.Event()
+        calls = 0
+
+        def slow() -> int:
+            nonlocal calls
+            calls += 1
+            release.wait(timeout=5)
+            return 42
+
+        results: list[int] = []
+        threads = [
+            threading.Thread(target=lambda: results.append(flights.do("k", slow)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert calls == 1
+        assert results == [42, 42, 42, 42]
+
+    def test_distinct_keys_run_separately(self) -> None:
+        flights = SingleFlight[str]()
+
+        assert flights.do("a", lambda: "A") == "A"
+        assert flights.do("b", lambda: "B") == "B"
+
+    def test_key_forgotten_after_call(self) -> None:
+        flights = SingleFlight[int]()
+        counter = iter(range(10))
+
+        assert flights.do("k", lambda: next(counter)) == 0
+        assert flights.do("k", lambda: next(counter)) == 1
+
+    def test_waiters_receive_the_error(self) -> None:
+        flights = SingleFlight[int]()
+        release = threading.Event()
+        errors: list[BaseException] = []
+
+        def fail() -> int:
+            release.wait(timeout=5)
+            raise RuntimeError("boom")
+
+        def call() -> None:
+            try:
+                flights.do("k", fail)
+            except RuntimeError as exc:
+                errors.append(exc)
+
+        threads = [threading.Thread(target=call) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert len(errors) == 3
+        assert all(str(e) == "boom" for e in errors)
+
+    def test_waiters_rerun_after_cancelled_leader(self) -> None:
+        flights = SingleFlight[int]()
+        release = threading.Event()
+        cancellation = Cancellation()
+        calls = 0
+
+        def slow() -> int:
+            nonlocal calls
+            calls += 1
+            release.wait(timeout=5)
+            check_cancelled()
+            return 42
+
+        def lead() -> None:
+            with cancellable(cancellation), pytest.raises(CancelledError):
+                flights.do("k", slow)
+
+        results: list[int] = []
+        leader = threading.Thread(target=lead)
+        leader.start()
+        time.sleep(0.05)
+        follower = threading.Thread(
+            target=lambda: results.append(flights.do("k", slow))
+        )
+        follower.start()
+        time.sleep(0.05)
+        cancellation.cancel()
+        release.set()
+        leader.join()
+        follower.join()
+
+        assert results == [42]
+        assert calls == 2
+
+
+class TestCancellation:
+    def test_unscoped_check_is_noop(self) -> None:
+        check_cancelled()
+
+    def test_check_raises_once_cancelled(self) -> None:
+        cancellation = Cancellation()
+        with cancellable(cancellation):
+            check_cancelled()
+            cancellation.cancel()
+            with pytest.raises(CancelledError):
+                check_cancelled()
+        check_cancelled()
+
+    @pytest.mark.parametrize("jobs", [1, 2])
+    def test_map_ordered_skips_remaining_items(self, jobs: int) -> None:
+        cancellation = Cancellation()
+        started: list[int] = []
+
+        def work(i: int) -> int:
+            started.append(i)
+            if i == 1:
+                cancellation.cancel()
+            return i
+
+        with cancellable(cancellation), pytest.raises(CancelledError):
+            map_ordered(work, list(range(20)), jobs)
+
+        assert len(started) <= 1 + jobs
+
+
+class TestRequestGate:
+    def test_queued_requests_wait_their_turn(self) -> None:
+        gate = RequestGate(running=1, queued=2)
+        order: list[int] = []
+
+        async def request(i: int) -> None:
+            async with gate.admit():
+                order.append(i)
+                await asyncio.sleep(0.01)
+
+        async def run() -> None:
+            await asyncio.gather(*(request(i) for i in range(3)))
+
+        asyncio.run(run())
+
+        assert order == [0, 1, 2]
+
+    def test_rejects_when_queue_full(self) -> None:
+        gate = RequestGate(running=1, queued=1)
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with gate.admit():
+                await release.wait()
+
+        async def run() -> None:
+            running = asyncio.ensure_future(hold())
+            waiting = asyncio.ensure_future(hold())
+            await asyncio.sleep(0.01)
+            with pytest.raises(RuntimeError, match="Server busy"):
+                async with gate.admit():
+                    pass
+            release.set()
+            await asyncio.gather(running, waiting)
+            async with gate.admit():
+                pass
+
+        asyncio.run(run())
+
+    def test_cancelled_waiter_leaves_queue(self) -> None:
+        gate = RequestGate(running=1, queued=1)
+        release = asyncio.Event()
+
+        async def hold() -> None:
+            async with gate.admit():
+                await release.wait()
+
+        async def run() -> None:
+            running = asyncio.ensure_future(hold())
+            waiting = asyncio.ensure_future(hold())
+            await asyncio.sleep(0.01)
+            waiting.cancel()
+            await asyncio.sleep(0.01)
+            queued = asyncio.ensure_future(hold())
+            await asyncio.sleep(0.01)
+            release.set()
+            await asyncio.gather(running, queued)
+
+        asyncio.run(run())
+
+
+class TestDefaultJobs:
+    def test_default_is_one(self) -> None:
+        with patch.dict(os.environ, {}, clear=True):
+            assert default_jobs() == 1
+
+    def test_from_env(self) -> None:
+        with patch.dict(os.environ, {"TTS_JOBS": "6"}):
+            assert default_jobs() == 6
+
+    @pytest.mark.parametrize("raw", ["0", "-2", "many"])
+    def test_invalid(self, raw: str) -> None:
+        with (
+            patch.dict(os.environ, {"TTS_JOBS": raw}),
+            pytest.raises(ValueError, match="TTS_JOBS"),
+        ):
+            default_jobs()
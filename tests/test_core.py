@@ -2,16 +2,27 @@
 
 from __future__ import annotations
 
+import threading
+import time
+import wave
+from collections.abc import Callable, Iterator
 from pathlib import Path
-from unittest.mock import MagicMock
+from typing import Any
+from unittest.mock import MagicMock, patch
 
 import pytest
 
-from langlearn_tts.core import TTSClient, stitch_audio
+from langlearn_tts import mp3
+from langlearn_tts.cache import SynthesisCache
+from langlearn_tts.codec import CodecPool, decode_pcm, encode_mp3
+from langlearn_tts.core import BatchProgress, TTSClient, stitch_audio
+from langlearn_tts.providers.polly import PollyProvider
 from langlearn_tts.types import (
     MergeStrategy,
     SynthesisRequest,
+    SynthesisResult,
 )
+from punt_vox.core import TRAILING_SILENCE_MS
 
 
 class TestTTSClientSynthesize:
@@ -80,6 +91,129 @@ class TestTTSClientSynthesize:
         assert result.text == "안녕하세요"
         assert result.voice == "Seoyeon"
 
+    def test_synthesize_pads_without_decoding(
+        self, tts_client: TTSClient, tmp_output_dir: Path
+    ) -> None:
+        request = SynthesisRequest(text="hello", voice="joanna")
+        raw = tmp_output_dir / "raw.mp3"
+        tts_client._provider.synthesize(request, raw)  # pyright: ignore[reportPrivateUsage]
+        out = tmp_output_dir / "padded.mp3"
+
+        with patch("pydub.AudioSegment.from_file", side_effect=AssertionError):
+            tts_client.synthesize(request, out)
+
+        raw_ms, out_ms = mp3.duration_ms(raw), mp3.duration_ms(out)
+        assert raw_ms is not None
+        assert out_ms is not None
+        assert out_ms > raw_ms
+
+
+class TestTTSClientStitchWithoutDecoding:
+    """Stitch-bound paths copy provider MP3 frames; nothing is decoded."""
+
+    @pytest.fixture(autouse=True)
+    def no_decoding(self) -> Iterator[None]:
+        with (
+            patch("pydub.AudioSegment.from_file", side_effect=AssertionError),
+            patch("langlearn_tts.core._reencode_audio", side_effect=AssertionError),
+        ):
+            yield
+
+    def test_pair(self, tts_client: TTSClient, tmp_output_dir: Path) -> None:
+        en = SynthesisRequest(text="house", voice="joanna")
+        de = SynthesisRequest(text="Haus", voice="hans")
+
+        result = tts_client.synthesize_pair(
+            "house", en, "Haus", de, tmp_output_dir / "pair.mp3"
+        )
+
+        assert result.path.exists()
+
+    def test_merged_batch(self, tts_client: TTSClient, tmp_output_dir: Path) -> None:
+        requests = [SynthesisRequest(text=t, voice="hans") for t in "abc"]
+
+        results = tts_client.synthesize_batch(
+            requests, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+        )
+
+        assert results[0].path.exists()
+
+    def test_merged_pair_batch(
+        self, tts_client: TTSClient, tmp_output_dir: Path
+    ) -> None:
+        pairs = [
+            (
+                SynthesisRequest(text=f"en{i}", voice="joanna"),
+                SynthesisRequest(text=f"de{i}", voice="hans"),
+            )
+            for i in range(3)
+        ]
+
+        results = tts_client.synthesize_pair_batch(
+            pairs, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+        )
+
+        assert results[0].path.exists()
+
+
+class TestTTSClientStitchIsAtomic:
+    """An interrupted uncached stitch leaves nothing at the output path."""
+
+    @pytest.fixture(autouse=True)
+    def interrupted_stitch(self, tmp_output_dir: Path) -> Iterator[None]:
+        stitch = stitch_audio
+
+        def write_half_then_fail(
+            segments: list[Path], output_path: Path, pause_ms: int = 500
+        ) -> None:
+            if output_path.parent != tmp_output_dir:
+                stitch(segments, output_path, pause_ms)  # intermediate pairs
+                return
+            output_path.write_bytes(b"\xff\xfb" * 100)
+            raise RuntimeError("interrupted")
+
+        with patch("langlearn_tts.core.stitch_audio", side_effect=write_half_then_fail):
+            yield
+
+    def test_pair(self, tts_client: TTSClient, tmp_output_dir: Path) -> None:
+        en = SynthesisRequest(text="house", voice="joanna")
+        de = SynthesisRequest(text="Haus", voice="hans")
+
+        with pytest.raises(RuntimeError, match="interrupted"):
+            tts_client.synthesize_pair(
+                "house", en, "Haus", de, tmp_output_dir / "pair.mp3"
+            )
+
+        assert list(tmp_output_dir.iterdir()) == []
+
+    def test_merged_batch(self, tts_client: TTSClient, tmp_output_dir: Path) -> None:
+        requests = [SynthesisRequest(text=t, voice="hans") for t in "abc"]
+
+        with pytest.raises(RuntimeError, match="interrupted"):
+            tts_client.synthesize_batch(
+                requests, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+            )
+
+        assert list(tmp_output_dir.iterdir()) == []
+
+    def test_merged_pair_batch(
+        self, tts_client: TTSClient, tmp_output_dir: Path
+    ) -> None:
+        pairs = [
+            (
+                SynthesisRequest(text=f"en{i}", voice="joanna"),
+                SynthesisRequest(text=f"de{i}", voice="hans"),
+            )
+            for i in range(3)
+        ]
+
+        with pytest.raises(RuntimeError, match="interrupted"):
+            tts_client.synthesize_pair_batch(
+                pairs, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+            )
+
+        assert list(tmp_output_dir.iterdir()) == []
+
 
 class TestTTSClientSynthesizeBatch:
     def test_empty_batch_returns_empty(
@@ -134,6 +268,25 @@ class TestTTSClientSynthesizeBatch:
         assert len(results) == 1
         assert results[0].path.exists()
 
+    def test_batch_merged_uses_streaming_stitcher(
+        self, tts_client: TTSClient, tmp_output_dir: Path
+    ) -> None:
+        requests = [SynthesisRequest(text=t, voice="joanna") for t in "abc"]
+
+        with patch("langlearn_tts.core.stitch_audio", wraps=stitch_audio) as stitch:
+            results = tts_client.synthesize_batch(
+                requests, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH, 300
+            )
+
+        segments, out, pause_ms = stitch.call_args.args
+        assert len(segments) == 3
+        # Stitched beside the output, then renamed into place.
+        assert out.parent == results[0].path.parent
+        assert out.name.startswith(f".{results[0].path.name}.")
+        assert pause_ms == 300
+        assert not out.exists()
+        assert results[0].path.exists()
+
     def test_batch_merged_text_contains_all(
         self, tts_client: TTSClient, tmp_output_dir: Path
     ) -> None:
@@ -150,6 +303,146 @@ class TestTTSClientSynthesizeBatch:
         assert "world" in results[0].text
 
 
+class TestTTSClientConcurrentBatch:
+    @pytest.fixture
+    def barrier(self, mock_boto_client: MagicMock) -> threading.Barrier:
+        """Make every provider call wait until three calls are in flight."""
+        barrier = threading.Barrier(3, timeout=5)
+        respond = mock_boto_client.synthesize_speech.side_effect
+
+        def wait_then_respond(**kwargs: Any) -> Any:
+            barrier.wait()
+            return respond(**kwargs)
+
+        mock_boto_client.synthesize_speech.side_effect = wait_then_respond
+        return barrier
+
+    @pytest.mark.usefixtures("barrier")
+    def test_separate_batch_runs_concurrently_in_order(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=3)
+        texts = ["eins", "zwei", "drei"]
+        requests = [SynthesisRequest(text=t, voice="hans") for t in texts]
+
+        results = client.synthesize_batch(requests, tmp_output_dir)
+
+        assert [r.text for r in results] == texts
+        assert all(r.path.exists() for r in results)
+
+    @pytest.mark.usefixtures("barrier")
+    def test_merged_batch_fetches_segments_concurrently(
+        self, polly_provider: PollyProvider, tmp_path: Path, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, cache=SynthesisCache(tmp_path), jobs=3)
+        requests = [SynthesisRequest(text=t, voice="hans") for t in "abc"]
+
+        results = client.synthesize_batch(
+            requests, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+        )
+
+        assert results[0].text == "a | b | c"
+
+    @pytest.mark.usefixtures("barrier")
+    def test_uncached_merged_batch_fetches_segments_concurrently(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=3)
+        requests = [SynthesisRequest(text=t, voice="hans") for t in "abc"]
+
+        results = client.synthesize_batch(
+            requests, tmp_output_dir, MergeStrategy.ONE_FILE_PER_BATCH
+        )
+
+        assert results[0].text == "a | b | c"
+        assert results[0].path.exists()
+
+    def test_separate_pair_batch_in_order(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=4)
+        pairs = [
+            (
+                SynthesisRequest(text=f"en{i}", voice="joanna"),
+                SynthesisRequest(text=f"de{i}", voice="hans"),
+            )
+            for i in range(5)
+        ]
+
+        results = client.synthesize_pair_batch(pairs, tmp_output_dir)
+
+        assert [r.text for r in results] == [f"en{i} | de{i}" for i in range(5)]
+
+    def test_duplicate_texts_share_one_output(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=4)
+        requests = [SynthesisRequest(text="Haus", voice="hans") for _ in range(4)]
+
+        results = client.synthesize_batch(requests, tmp_output_dir)
+
+        assert len({r.path for r in results}) == 1
+        assert results[0].path.stat().st_size > 0
+
+
+class TestTTSClientSingleFlight:
+    @pytest.fixture
+    def release(self, mock_boto_client: MagicMock) -> threading.Event:
+        """Hold every provider call until the event is set."""
+        release = threading.Event()
+        respond = mock_boto_client.synthesize_speech.side_effect
+
+        def wait_then_respond(**kwargs: Any) -> Any:
+            release.wait(timeout=5)
+            return respond(**kwargs)
+
+        mock_boto_client.synthesize_speech.side_effect = wait_then_respond
+        return release
+
+    @pytest.mark.parametrize("cached", [True, False])
+    def test_identical_requests_share_one_call(
+        self,
+        cached: bool,
+        mock_boto_client: MagicMock,
+        polly_provider: PollyProvider,
+        release: threading.Event,
+        tmp_path: Path,
+        tmp_output_dir: Path,
+    ) -> None:
+        cache = SynthesisCache(tmp_path / "cache") if cached else None
+        request = SynthesisRequest(text="Haus", voice="hans")
+        out = tmp_output_dir / "haus.mp3"
+        # Separate clients, as separate MCP tool calls would use.
+        threads = [
+            threading.Thread(
+                target=TTSClient(polly_provider, cache=cache).synthesize,
+                args=(request, out),
+            )
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        assert mock_boto_client.synthesize_speech.call_count == 1
+        assert out.exists()
+
+    def test_different_requests_not_coalesced(
+        self, mock_boto_client: MagicMock, tts_client: TTSClient, tmp_output_dir: Path
+    ) -> None:
+        tts_client.synthesize(
+            SynthesisRequest(text="Haus", voice="hans"), tmp_output_dir / "a.mp3"
+        )
+        tts_client.synthesize(
+            SynthesisRequest(text="Maus", voice="hans"), tmp_output_dir / "b.mp3"
+        )
+
+        assert mock_boto_client.synthesize_speech.call_count == 2
+
+
 class TestTTSClientSynthesizePair:
     def test_pair_creates_file(
         self, tts_client: TTSClient, tmp_output_dir: Path
@@ -189,6 +482,48 @@ class TestTTSClientSynthesizePair:
 
         assert mock_boto_client.synthesize_speech.call_count == 2
 
+    @pytest.fixture
+    def barrier(self, mock_boto_client: MagicMock) -> threading.Barrier:
+        """Make each provider call wait until both halves are in flight."""
+        barrier = threading.Barrier(2, timeout=5)
+        respond = mock_boto_client.synthesize_speech.side_effect
+
+        def wait_then_respond(**kwargs: Any) -> Any:
+            barrier.wait()
+            return respond(**kwargs)
+
+        mock_boto_client.synthesize_speech.side_effect = wait_then_respond
+        return barrier
+
+    @pytest.mark.usefixtures("barrier")
+    def test_pair_halves_synthesized_concurrently(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        req1 = SynthesisRequest(text="strong", voice="joanna")
+        req2 = SynthesisRequest(text="stark", voice="hans")
+        out = tmp_output_dir / "pair.mp3"
+
+        result = TTSClient(polly_provider).synthesize_pair(
+            "strong", req1, "stark", req2, out
+        )
+
+        assert result.text == "strong | stark"
+        assert result.voice == "Joanna+Hans"
+        assert out.exists()
+
+    @pytest.mark.usefixtures("barrier")
+    def test_cached_pair_halves_synthesized_concurrently(
+        self, polly_provider: PollyProvider, tmp_path: Path, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, cache=SynthesisCache(tmp_path / "cache"))
+        req1 = SynthesisRequest(text="strong", voice="joanna")
+        req2 = SynthesisRequest(text="stark", voice="hans")
+        out = tmp_output_dir / "pair.mp3"
+
+        client.synthesize_pair("strong", req1, "stark", req2, out)
+
+        assert out.exists()
+
 
 class TestTTSClientSynthesizePairBatch:
     def test_empty_batch_returns_empty(
@@ -241,6 +576,171 @@ class TestTTSClientSynthesizePairBatch:
         assert results[0].path.exists()
 
 
+class TestTTSClientOnResult:
+    """Batch results are reported in order, each once its file exists."""
+
+    @pytest.fixture(params=[False, True], ids=["uncached", "cached"])
+    def client(
+        self,
+        request: pytest.FixtureRequest,
+        polly_provider: PollyProvider,
+        tmp_path: Path,
+    ) -> TTSClient:
+        cache = SynthesisCache(tmp_path / "cache") if request.param else None
+        return TTSClient(polly_provider, cache=cache, jobs=3)
+
+    @staticmethod
+    def _recorder(seen: list[SynthesisResult]) -> Callable[[SynthesisResult], None]:
+        def record(result: SynthesisResult) -> None:
+            assert result.path.exists()
+            seen.append(result)
+
+        return record
+
+    @pytest.mark.parametrize("strategy", list(MergeStrategy))
+    def test_batch(
+        self, client: TTSClient, tmp_output_dir: Path, strategy: MergeStrategy
+    ) -> None:
+        seen: list[SynthesisResult] = []
+        requests = [SynthesisRequest(text=t, voice="hans") for t in ["a", "b", "c"]]
+
+        results = client.synthesize_batch(
+            requests, tmp_output_dir, strategy, on_result=self._recorder(seen)
+        )
+
+        assert seen == results
+
+    @pytest.mark.parametrize("strategy", list(MergeStrategy))
+    def test_pair_batch(
+        self, client: TTSClient, tmp_output_dir: Path, strategy: MergeStrategy
+    ) -> None:
+        seen: list[SynthesisResult] = []
+        pairs = [
+            (
+                SynthesisRequest(text=f"en{i}", voice="joanna"),
+                SynthesisRequest(text=f"de{i}", voice="hans"),
+            )
+            for i in range(3)
+        ]
+
+        results = client.synthesize_pair_batch(
+            pairs, tmp_output_dir, strategy, on_result=self._recorder(seen)
+        )
+
+        assert seen == results
+
+
+class TestTTSClientProgress:
+    """Batches report progress per item, counting items served from cache."""
+
+    @staticmethod
+    def _words() -> list[SynthesisRequest]:
+        return [SynthesisRequest(text=t, voice="hans") for t in ["a", "b", "c"]]
+
+    @pytest.mark.parametrize("strategy", list(MergeStrategy))
+    def test_counts_up_to_total(
+        self,
+        polly_provider: PollyProvider,
+        tmp_path: Path,
+        tmp_output_dir: Path,
+        strategy: MergeStrategy,
+    ) -> None:
+        client = TTSClient(polly_provider, SynthesisCache(tmp_path / "c"), jobs=3)
+        seen: list[BatchProgress] = []
+
+        client.synthesize_batch(
+            self._words(), tmp_output_dir, strategy, on_progress=seen.append
+        )
+
+        assert [p.completed for p in seen] == [1, 2, 3]
+        assert {p.total for p in seen} == {3}
+        assert {p.current for p in seen} == {"a", "b", "c"}
+        assert seen[-1].cache_hits == 0
+
+    @pytest.mark.parametrize("strategy", list(MergeStrategy))
+    def test_repeat_batch_is_all_hits(
+        self,
+        polly_provider: PollyProvider,
+        tmp_path: Path,
+        tmp_output_dir: Path,
+        strategy: MergeStrategy,
+    ) -> None:
+        client = TTSClient(polly_provider, SynthesisCache(tmp_path / "c"), jobs=2)
+        client.synthesize_batch(self._words()[:2], tmp_output_dir, strategy)
+        seen: list[BatchProgress] = []
+
+        client.synthesize_batch(
+            self._words(), tmp_output_dir, strategy, on_progress=seen.append
+        )
+
+        assert seen[-1] == BatchProgress(3, 3, 2, seen[-1].current)
+
+    def test_pair_batch(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=1)
+        seen: list[BatchProgress] = []
+        pairs = [
+            (
+                SynthesisRequest(text=f"en{i}", voice="joanna"),
+                SynthesisRequest(text=f"de{i}", voice="hans"),
+            )
+            for i in range(2)
+        ]
+
+        client.synthesize_pair_batch(pairs, tmp_output_dir, on_progress=seen.append)
+
+        assert seen == [
+            BatchProgress(1, 2, 0, "en0 | de0"),
+            BatchProgress(2, 2, 0, "en1 | de1"),
+        ]
+
+
+class TestTTSClientIterBatch:
+    def test_batch_matches_synthesize_batch(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=2)
+        requests = [SynthesisRequest(text=t, voice="hans") for t in ["a", "b", "c"]]
+
+        streamed = list(client.iter_batch(iter(requests), tmp_output_dir))
+
+        assert streamed == list(
+            enumerate(client.synthesize_batch(requests, tmp_output_dir))
+        )
+        assert all(r.path.exists() for _, r in streamed)
+
+    def test_unordered_yields_every_index_once(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=3)
+        requests = [SynthesisRequest(text=f"w{i}", voice="hans") for i in range(7)]
+
+        streamed = client.iter_batch(iter(requests), tmp_output_dir, ordered=False)
+
+        by_index = dict(streamed)
+        assert sorted(by_index) == list(range(7))
+        assert [by_index[i].text for i in range(7)] == [r.text for r in requests]
+
+    def test_pair_batch_matches_synthesize_pair_batch(
+        self, polly_provider: PollyProvider, tmp_output_dir: Path
+    ) -> None:
+        client = TTSClient(polly_provider, jobs=2)
+        pairs = [
+            (
+                SynthesisRequest(text=f"en{i}", voice="joanna"),
+                SynthesisRequest(text=f"de{i}", voice="hans"),
+            )
+            for i in range(3)
+        ]
+
+        streamed = list(client.iter_pair_batch(iter(pairs), tmp_output_dir, 300))
+
+        assert streamed == list(
+            enumerate(client.synthesize_pair_batch(pairs, tmp_output_dir, pause_ms=300))
+        )
+
+
 class TestStitchAudio:
     def _write_fake_mp3(self, path: Path) -> None:
         """Write minimal valid MP3 bytes using ffmpeg."""
@@ -298,6 +798,115 @@ class TestStitchAudio:
         with pytest.raises(FileNotFoundError, match=r"nonexistent\.mp3"):
             stitch_audio([missing], out)
 
+    def test_compatible_segments_skip_reencode(self, tmp_path: Path) -> None:
+        seg1 = tmp_path / "a.mp3"
+        seg2 = tmp_path / "b.mp3"
+        self._write_fake_mp3(seg1)
+        self._write_fake_mp3(seg2)
+        out = tmp_path / "stitched.mp3"
+
+        with patch("langlearn_tts.core._reencode_audio") as reencode:
+            stitch_audio([seg1, seg2], out, pause_ms=200)
+
+        reencode.assert_not_called()
+        assert out.stat().st_size > seg1.stat().st_size
+
+    def test_mixed_formats_fall_back_to_reencode(self, tmp_path: Path) -> None:
+        seg1 = tmp_path / "a.mp3"
+        seg2 = tmp_path / "b.wav"
+        self._write_fake_mp3(seg1)
+        with wave.open(str(seg2), "wb") as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(22050)
+            wav.writeframes(bytes(4410))
+        out = tmp_path / "stitched.mp3"
+
+        with patch("langlearn_tts.core._reencode_audio") as reencode:
+            stitch_audio([seg1, seg2], out, pause_ms=200)
+
+        reencode.assert_called_once_with([seg1, seg2], out, 200)
+
+    def _write_wav(self, path: Path, ms: int, rate: int = 44100) -> None:
+        with wave.open(str(path), "wb") as wav:
+            wav.setnchannels(2)
+            wav.setsampwidth(2)
+            wav.setframerate(rate)
+            wav.writeframes(bytes(rate * ms // 1000 * 4))
+
+    def test_reencode_lays_out_segments_and_pauses(self, tmp_path: Path) -> None:
+        seg1 = tmp_path / "a.mp3"
+        seg2 = tmp_path / "b.wav"
+        self._write_fake_mp3(seg1)
+        self._write_wav(seg2, 300)
+        out = tmp_path / "stitched.mp3"
+
+        stitch_audio([seg1, seg2], out, pause_ms=200)
+
+        duration = mp3.duration_ms(out)
+        # 100 + 200 + 300 ms plus the trailing silence, within a frame or two.
+        assert duration is not None
+        assert abs(duration - (600 + TRAILING_SILENCE_MS)) < 120
+
+    def test_reencode_never_chains_segments(self, tmp_path: Path) -> None:
+        segments = [tmp_path / f"{i}.wav" for i in range(20)]
+        for path in segments:
+            self._write_wav(path, 50, rate=22050)
+        out = tmp_path / "stitched.mp3"
+
+        with (
+            patch("pydub.AudioSegment.__add__", side_effect=AssertionError),
+            patch("pydub.AudioSegment.append", side_effect=AssertionError),
+        ):
+            stitch_audio(segments, out, pause_ms=100)
+
+        assert out.exists()
+
+    def test_reencode_streams_into_one_encoder(self, tmp_path: Path) -> None:
+        segments = [tmp_path / f"{i}.wav" for i in range(20)]
+        for path in segments:
+            self._write_wav(path, 50, rate=22050)
+        out = tmp_path / "stitched.mp3"
+
+        with (
+            patch("langlearn_tts.core.encode_mp3", wraps=encode_mp3) as encode,
+            patch("langlearn_tts.core.decode_pcm") as decode,
+        ):
+            stitch_audio(segments, out, pause_ms=100)
+
+        # WAV segments decode in process; one encoder takes all the PCM.
+        encode.assert_called_once_with(out, 22050, 2)
+        decode.assert_not_called()
+        duration = mp3.duration_ms(out)
+        assert duration is not None
+        assert abs(duration - (20 * 150 - 100 + TRAILING_SILENCE_MS)) < 120
+
+    def test_reencode_decodes_mp3_on_the_codec_pool(self, tmp_path: Path) -> None:
+        seg1 = tmp_path / "a.wav"
+        seg2 = tmp_path / "b.mp3"
+        self._write_wav(seg1, 100, rate=22050)
+        self._write_fake_mp3(seg2)
+
+        with patch("langlearn_tts.core.decode_pcm", wraps=decode_pcm) as decode:
+            stitch_audio([seg1, seg2], tmp_path / "stitched.mp3", pause_ms=100)
+
+        decode.assert_called_once_with(seg2.read_bytes(), 22050, 2)
+
+    def test_reencode_failure_raises(self, tmp_path: Path) -> None:
+        seg = tmp_path / "a.wav"
+        self._write_wav(seg, 50)
+        pool = CodecPool()
+
+        try:
+            with (
+                patch("langlearn_tts.codec._pool", pool),
+                patch("pydub.AudioSegment.converter", "false"),
+                pytest.raises(RuntimeError, match="ffmpeg failed"),
+            ):
+                stitch_audio([seg], tmp_path / "stitched.mp3")
+        finally:
+            pool.close()
+
     def test_stitch_creates_parent_dirs(self, tmp_path: Path) -> None:
         seg = tmp_path / "a.mp3"
         self._write_fake_mp3(seg)
@@ -2,14 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+from collections.abc import Callable, Coroutine, Iterator
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
 import pytest
 
-from langlearn_tts.providers.elevenlabs import ElevenLabsProvider
+import punt_vox.providers.elevenlabs as vox_elevenlabs
+from langlearn_tts.providers.elevenlabs import (
+    AsyncElevenLabsProvider,
+    ElevenLabsProvider,
+)
+from langlearn_tts.ratelimit import limiter_for
 from langlearn_tts.types import SynthesisRequest
+from punt_vox.types import VoiceNotFoundError
 
 
 class TestElevenLabsProviderName:
@@ -108,6 +118,24 @@ class TestElevenLabsProviderSynthesize:
         assert out.exists()
         assert out.stat().st_size > 0
 
+    def test_interrupted_stream_leaves_no_file(
+        self,
+        mock_elevenlabs_client: MagicMock,
+        elevenlabs_provider: ElevenLabsProvider,
+        tmp_output_dir: Path,
+    ) -> None:
+        def broken_stream(**kwargs: object) -> Iterator[bytes]:
+            yield b"partial"
+            raise ConnectionError("reset")
+
+        mock_elevenlabs_client.text_to_speech.stream.side_effect = broken_stream
+        out = tmp_output_dir / "cut.mp3"
+
+        with pytest.raises(ConnectionError):
+            elevenlabs_provider.synthesize(SynthesisRequest(text="x"), out)
+
+        assert list(tmp_output_dir.iterdir()) == []
+
     def test_synthesize_result_metadata(
         self,
         elevenlabs_provider: ElevenLabsProvider,
@@ -199,6 +227,23 @@ class TestElevenLabsProviderSynthesize:
         assert out.exists()
         assert mock_elevenlabs_client.text_to_speech.stream.call_count > 1
 
+    def test_chunked_text_paces_each_api_call(
+        self,
+        mock_elevenlabs_client: MagicMock,
+        tmp_output_dir: Path,
+    ) -> None:
+        provider = ElevenLabsProvider(
+            model="eleven_turbo_v2", client=mock_elevenlabs_client
+        )
+        request = SynthesisRequest(text=("Hello. " * 2000).strip(), voice="matilda")
+
+        with patch("langlearn_tts.providers.elevenlabs.limiter_for") as limiter_for:
+            provider.synthesize(request, tmp_output_dir / "chunked.mp3")
+
+        stream = mock_elevenlabs_client.text_to_speech.stream
+        assert stream.call_count > 1
+        assert limiter_for.return_value.acquire.call_count == stream.call_count
+
 
 class TestElevenLabsProviderCheckHealth:
     @patch.dict("os.environ", {"ELEVENLABS_API_KEY": "test-key"})
@@ -350,3 +395,166 @@ class TestElevenLabsProviderLanguageSupport:
         request = SynthesisRequest(text="hello", voice="matilda", rate=100)
         result = elevenlabs_provider.synthesize(request, tmp_output_dir / "test.mp3")
         assert result.language is None
+
+
+class TestAsyncElevenLabsProvider:
+    """Runs against an in-process HTTP stand-in for the ElevenLabs API."""
+
+    @pytest.fixture(autouse=True)
+    def cache_dir(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+        """Keep voice catalog snapshots out of the real cache directory."""
+        monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path / "cache"))
+        return tmp_path / "cache"
+
+    @staticmethod
+    def _cold_catalog(monkeypatch: pytest.MonkeyPatch) -> None:
+        """A fresh process: the account's voices have not been fetched."""
+        monkeypatch.setattr(vox_elevenlabs, "_voices_loaded", False)
+
+    @staticmethod
+    def _provider(
+        handler: Callable[[httpx.Request], Coroutine[None, None, httpx.Response]],
+    ) -> AsyncElevenLabsProvider:
+        from elevenlabs import AsyncElevenLabs  # pyright: ignore[reportMissingTypeStubs]
+
+        client = AsyncElevenLabs(  # pyright: ignore[reportUnknownVariableType]
+            api_key="test-key",
+            httpx_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        return AsyncElevenLabsProvider(model="eleven_v3", client=client)
+
+    def test_synthesize_streams_to_file(self, tmp_path: Path) -> None:
+        seen: list[tuple[str, dict[str, object]]] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            seen.append((request.url.path, json.loads(request.content)))
+            return httpx.Response(200, content=b"mp3-bytes")
+
+        provider = self._provider(handler)
+        out = tmp_path / "hallo.mp3"
+        request = SynthesisRequest(text="Hallo", voice="matilda", stability=0.3)
+
+        result = asyncio.run(provider.synthesize(request, out))
+
+        assert out.read_bytes() == b"mp3-bytes"
+        assert result.voice == "matilda"
+        path, body = seen[0]
+        assert path == "/v1/text-to-speech/XrExE9yKIg1WjnnlVkGX/stream"
+        assert body["model_id"] == "eleven_v3"
+        assert body["voice_settings"] == {"stability": 0.3}
+
+    def test_unknown_name_loads_voices_once(
+        self, tmp_path: Path, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        self._cold_catalog(monkeypatch)
+        paths: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            if request.url.path == "/v1/voices":
+                voice = {"voice_id": "B" * 20, "name": "Bella - warm"}
+                return httpx.Response(200, json={"voices": [voice]})
+            return httpx.Response(200, content=b"x")
+
+        provider = self._provider(handler)
+
+        asyncio.run(
+            provider.synthesize(
+                SynthesisRequest(text="Hi", voice="Bella"), tmp_path / "a.mp3"
+            )
+        )
+
+        assert paths == ["/v1/voices", f"/v1/text-to-speech/{'B' * 20}/stream"]
+        saved = json.loads((cache_dir / "voices" / "elevenlabs.json").read_text())
+        assert saved["voices"]["bella"] == "B" * 20
+
+    def test_catalog_is_loaded_once_per_process(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        self._cold_catalog(monkeypatch)
+        paths: list[str] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            paths.append(request.url.path)
+            return httpx.Response(200, json={"voices": []})
+
+        provider = self._provider(handler)
+
+        async def resolve_twice() -> None:
+            for name in ("nobody", "nobody else"):
+                with pytest.raises(VoiceNotFoundError):
+                    await provider.resolve_voice(name)
+
+        asyncio.run(resolve_twice())
+
+        assert paths == ["/v1/voices"]
+
+    def test_unknown_name_resolves_from_snapshot(
+        self, cache_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        self._cold_catalog(monkeypatch)
+        snapshot = cache_dir / "voices" / "elevenlabs.json"
+        snapshot.parent.mkdir(parents=True)
+        snapshot.write_text(
+            json.dumps({"version": 1, "fetched_at": 0, "voices": {"bella": "B" * 20}})
+        )
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError(request.url.path)
+
+        provider = self._provider(handler)
+
+        assert asyncio.run(provider.resolve_voice("Bella")) == "B" * 20
+
+    def test_voice_list_call_is_rate_limited(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        self._cold_catalog(monkeypatch)
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            if request.url.path == "/v1/voices":
+                voice = {"voice_id": "B" * 20, "name": "Bella"}
+                return httpx.Response(200, json={"voices": [voice]})
+            return httpx.Response(200, content=b"x")
+
+        provider = self._provider(handler)
+
+        with patch(
+            "langlearn_tts.providers.elevenlabs.limiter_for", wraps=limiter_for
+        ) as limiter:
+            asyncio.run(
+                provider.synthesize(
+                    SynthesisRequest(text="Hi", voice="Bella"), tmp_path / "a.mp3"
+                )
+            )
+
+        # One slot for the voice list, one for the speech call.
+        assert limiter.call_count == 2
+
+    def test_concurrency_capped_by_limiter(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TTS_RATE_LIMITS", "elevenlabs=concurrency=3")
+        in_flight = 0
+        peak = 0
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, content=b"x")
+
+        provider = self._provider(handler)
+        requests = [
+            SynthesisRequest(
+                text=f"w{i}", voice="drew", metadata={"output_dir": str(tmp_path)}
+            )
+            for i in range(12)
+        ]
+
+        results = asyncio.run(provider.generate_audios(requests))
+
+        assert peak == 3
+        assert [r.text for r in results] == [f"w{i}" for i in range(12)]
@@ -0,0 +1,300 @@
+"""Tests for langlearn_tts.eviction."""
+
+from __future__ import annotations
+
+import os
+import time
+from contextlib import AbstractContextManager
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from langlearn_tts.cache import SynthesisCache
+from langlearn_tts.eviction import (
+    CacheManager,
+    EvictionPolicy,
+    parse_size,
+)
+
+_OLD = time.time() - 3600
+
+
+def _at(timestamp: float) -> AbstractContextManager[object]:
+    """Pin the index clock, so recorded accesses look ``timestamp`` old."""
+    return patch("langlearn_tts.index.time.time", return_value=timestamp)
+
+
+def _entry(cache: SynthesisCache, key: str, size: int, age: float = 0) -> Path:
+    with cache.staging_path() as staged, _at(_OLD - age):
+        staged.write_bytes(b"x" * size)
+        entry = cache.put(key, staged)
+    os.utime(entry, (_OLD - age, _OLD - age))
+    return entry
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> SynthesisCache:
+    return SynthesisCache(tmp_path / "out" / ".cache")
+
+
+@pytest.fixture
+def output_dir(tmp_path: Path) -> Path:
+    return tmp_path / "out"
+
+
+class TestParseSize:
+    @pytest.mark.parametrize(
+        ("raw", "expected"),
+        [
+            ("1024", 1024),
+            ("500M", 500 * 1024**2),
+            ("2G", 2 * 1024**3),
+            ("2gb", 2 * 1024**3),
+            ("1.5GiB", int(1.5 * 1024**3)),
+            ("10 KB", 10 * 1024),
+        ],
+    )
+    def test_valid(self, raw: str, expected: int) -> None:
+        assert parse_size(raw) == expected
+
+    @pytest.mark.parametrize("raw", ["", "big", "-1G", "2X"])
+    def test_invalid(self, raw: str) -> None:
+        with pytest.raises(ValueError, match="Invalid size"):
+            parse_size(raw)
+
+
+class TestSweep:
+    def test_under_budget_evicts_nothing(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        entry = _entry(cache, "aa" * 32, 100)
+        report = CacheManager(cache, output_dir, 1000).sweep()
+        assert report.evicted_files == 0
+        assert report.total_bytes == 100
+        assert entry.exists()
+
+    def test_lru_evicts_oldest_first(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        oldest = _entry(cache, "aa" * 32, 100, age=300)
+        older = _entry(cache, "bb" * 32, 100, age=200)
+        newest = _entry(cache, "cc" * 32, 100, age=100)
+
+        report = CacheManager(cache, output_dir, 250, low_water=0.8).sweep()
+
+        assert report.evicted_files == 1
+        assert report.remaining_bytes == 200
+        assert not oldest.exists()
+        assert older.exists()
+        assert newest.exists()
+
+    def test_lfu_evicts_least_hit_first(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        popular = _entry(cache, "aa" * 32, 100, age=300)
+        rare = _entry(cache, "bb" * 32, 100, age=100)
+        with _at(_OLD - 300):
+            for _ in range(3):
+                cache.get("aa" * 32)
+        os.utime(popular, (_OLD - 300, _OLD - 300))
+
+        CacheManager(cache, output_dir, 150, EvictionPolicy.LFU).sweep()
+
+        assert popular.exists()
+        assert not rare.exists()
+
+    def test_hard_links_counted_and_evicted_together(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        entry = _entry(cache, "aa" * 32, 100, age=200)
+        keep = _entry(cache, "bb" * 32, 100, age=100)
+        linked = output_dir / "hallo.mp3"
+        cache.materialize(entry, linked)
+
+        report = CacheManager(cache, output_dir, 150).sweep()
+
+        assert report.total_bytes == 200
+        assert not entry.exists()
+        assert not linked.exists()
+        assert keep.exists()
+
+    def test_pinned_entries_survive(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        pinned = _entry(cache, "aa" * 32, 100, age=300)
+        other = _entry(cache, "bb" * 32, 100, age=100)
+        manager = CacheManager(cache, output_dir, 150)
+        manager.pin(["aa" * 32])
+
+        manager.sweep()
+
+        assert pinned.exists()
+        assert not other.exists()
+
+    def test_recent_entries_are_in_grace(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        entry = _entry(cache, "aa" * 32, 100)
+        cache.get("aa" * 32)
+
+        report = CacheManager(cache, output_dir, 50).sweep()
+
+        assert report.evicted_files == 0
+        assert entry.exists()
+
+    def test_sweep_is_incremental(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        for i in range(4):
+            _entry(cache, f"{i:02d}" * 32, 100, age=100 * i)
+        manager = CacheManager(cache, output_dir, 100, max_evictions=2, low_water=1.0)
+
+        first = manager.sweep()
+        second = manager.sweep()
+
+        assert (first.evicted_files, first.limited) == (2, True)
+        assert (second.evicted_files, second.limited) == (1, False)
+        assert second.remaining_bytes == 100
+
+    def test_stale_staging_removed(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        cache.staging_root.mkdir(parents=True)
+        stale = cache.staging_root / "leftover.mp3"
+        stale.write_bytes(b"x" * 100)
+        os.utime(stale, (0, 0))
+
+        report = CacheManager(cache, output_dir, 1000).sweep()
+
+        assert report.total_bytes == 0
+        assert not stale.exists()
+
+    def test_evicted_entries_leave_the_index(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        _entry(cache, "aa" * 32, 100, age=200)
+        _entry(cache, "bb" * 32, 100, age=100)
+
+        CacheManager(cache, output_dir, 150).sweep()
+
+        assert cache.index.get("aa" * 32) is None
+        assert cache.index.get("bb" * 32) is not None
+
+    def test_deleted_files_leave_the_index(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        _entry(cache, "aa" * 32, 100).unlink()
+
+        CacheManager(cache, output_dir, 1000).sweep()
+
+        assert cache.index.get("aa" * 32) is None
+
+
+class TestIndexedSweeps:
+    def test_sweeps_between_reconciles_read_only_the_index(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        manager = CacheManager(cache, output_dir, 150, reconcile_every=10)
+        manager.sweep()
+        entry = _entry(cache, "aa" * 32, 100, age=200)
+        keep = _entry(cache, "bb" * 32, 100, age=100)
+        linked = output_dir / "hallo.mp3"
+        cache.materialize(entry, linked)
+
+        with patch("langlearn_tts.eviction.os.walk", side_effect=AssertionError):
+            report = manager.sweep()
+
+        assert (report.total_bytes, report.evicted_files) == (200, 1)
+        assert not entry.exists()
+        assert not linked.exists()
+        assert keep.exists()
+        assert cache.index.get("aa" * 32) is None
+
+    def test_outputs_outside_the_managed_roots_are_kept(
+        self, cache: SynthesisCache, output_dir: Path, tmp_path: Path
+    ) -> None:
+        manager = CacheManager(cache, output_dir, 50, reconcile_every=10)
+        manager.sweep()
+        entry = _entry(cache, "aa" * 32, 100, age=200)
+        elsewhere = tmp_path / "lesson" / "hallo.mp3"
+        elsewhere.parent.mkdir()
+        cache.materialize(entry, elsewhere)
+
+        report = manager.sweep()
+
+        assert report.evicted_files == 1
+        assert not entry.exists()
+        assert elsewhere.read_bytes() == b"x" * 100
+
+    def test_replaced_output_is_kept(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        manager = CacheManager(cache, output_dir, 50, reconcile_every=10)
+        manager.sweep()
+        entry = _entry(cache, "aa" * 32, 100, age=200)
+        output = output_dir / "hallo.mp3"
+        cache.materialize(entry, output)
+        output.unlink()
+        output.write_bytes(b"unrelated")
+
+        manager.sweep()
+
+        assert not entry.exists()
+        assert output.read_bytes() == b"unrelated"
+
+    def test_walks_every_reconcile_interval(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        manager = CacheManager(cache, output_dir, 1000, reconcile_every=2)
+
+        with patch("langlearn_tts.eviction.os.walk", wraps=os.walk) as walk:
+            for _ in range(3):
+                manager.sweep()
+
+        roots = len({call.args[0] for call in walk.call_args_list})
+        assert walk.call_count == 2 * roots
+
+    def test_untracked_files_counted_between_reconciles(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        _entry(cache, "aa" * 32, 100)
+        untracked = output_dir / "uncached.mp3"
+        untracked.write_bytes(b"x" * 50)
+        manager = CacheManager(cache, output_dir, 1000, reconcile_every=10)
+
+        first = manager.sweep()
+        second = manager.sweep()
+
+        assert first.total_bytes == second.total_bytes == 150
+
+
+class TestPinning:
+    def test_pin_and_unpin(self, cache: SynthesisCache, output_dir: Path) -> None:
+        manager = CacheManager(cache, output_dir, 0)
+        assert manager.pin(["aa" * 32, "bb" * 32]) == 2
+        assert manager.pin(["aa" * 32]) == 0
+        assert manager.unpin(["aa" * 32, "cc" * 32]) == 1
+        assert manager.pinned() == {"bb" * 32}
+
+    def test_pins_shared_across_managers(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        CacheManager(cache, output_dir, 0).pin(["aa" * 32])
+        assert CacheManager(cache, output_dir, 0).pinned() == {"aa" * 32}
+
+
+class TestBackgroundThread:
+    def test_start_sweeps_and_stop_joins(
+        self, cache: SynthesisCache, output_dir: Path
+    ) -> None:
+        entry = _entry(cache, "aa" * 32, 100)
+        manager = CacheManager(cache, output_dir, 50)
+
+        manager.start(interval=60)
+        deadline = time.time() + 5
+        while entry.exists() and time.time() < deadline:
+            time.sleep(0.01)
+        manager.stop()
+
+        assert not entry.exists()
@@ -0,0 +1,107 @@
+"""Tests for langlearn_tts.index."""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from langlearn_tts.index import AudioIndex, EntryMeta
+
+
+def _file(tmp_path: Path, name: str, size: int = 10) -> Path:
+    path = tmp_path / name
+    path.write_bytes(b"x" * size)
+    return path
+
+
+class TestAudioIndex:
+    def test_record_and_get(self, tmp_path: Path) -> None:
+        index = AudioIndex(tmp_path / "index.db")
+        path = _file(tmp_path, "a.mp3", 42)
+        meta = EntryMeta(
+            text="Haus", voice="hans", language="de", rate=85, provider="polly"
+        )
+
+        index.record("a" * 64, path, meta)
+        entry = index.get("a" * 64)
+
+        assert entry is not None
+        assert entry.path == path
+        assert (entry.text, entry.voice, entry.language, entry.rate) == (
+            "Haus",
+            "hans",
+            "de",
+            85,
+        )
+        assert entry.size == 42
+        assert entry.hits == 0
+        assert entry.duration_ms is None
+
+    def test_missing_key(self, tmp_path: Path) -> None:
+        assert AudioIndex(tmp_path / "index.db").get("a" * 64) is None
+
+    def test_touch_counts_hits(self, tmp_path: Path) -> None:
+        index = AudioIndex(tmp_path / "index.db")
+        index.record("a" * 64, _file(tmp_path, "a.mp3"))
+        index.touch("a" * 64)
+        index.touch("a" * 64)
+        entry = index.get("a" * 64)
+        assert entry is not None
+        assert entry.hits == 2
+        assert index.usage()["a" * 64][0] == 2
+
+    def test_find_any_voice(self, tmp_path: Path) -> None:
+        index = AudioIndex(tmp_path / "index.db")
+        for key, voice, rate in (
+            ("a", "hans", 85),
+            ("b", "vicki", 85),
+            ("c", "hans", 90),
+        ):
+            meta = EntryMeta(text="Haus", voice=voice, language="de", rate=rate)
+            index.record(key * 64, _file(tmp_path, f"{key}.mp3"), meta)
+        index.record(
+            "d" * 64,
+            _file(tmp_path, "d.mp3"),
+            EntryMeta(kind="clip", text="Haus", language="de", rate=85),
+        )
+
+        found = index.find("Haus", language="de", rate=85)
+
+        assert {e.voice for e in found} == {"hans", "vicki"}
+        assert [e.key for e in index.find("Haus", voice="hans", rate=90)] == ["c" * 64]
+        assert index.find("Maus") == []
+
+    def test_outputs_and_remove(self, tmp_path: Path) -> None:
+        index = AudioIndex(tmp_path / "index.db")
+        index.record("a" * 64, _file(tmp_path, "a.mp3"))
+        out = tmp_path / "out" / "hallo.mp3"
+        index.record_output(out, "a" * 64)
+        assert index.outputs("a" * 64) == [out]
+
+        index.remove(["a" * 64])
+
+        assert index.get("a" * 64) is None
+        assert index.outputs("a" * 64) == []
+
+    def test_entries_with_outputs(self, tmp_path: Path) -> None:
+        index = AudioIndex(tmp_path / "index.db")
+        index.record("a" * 64, _file(tmp_path, "a.mp3", size=30))
+        index.record("b" * 64, _file(tmp_path, "b.mp3"))
+        first, second = tmp_path / "out" / "1.mp3", tmp_path / "out" / "2.mp3"
+        index.record_output(first, "a" * 64)
+        index.record_output(second, "a" * 64)
+
+        groups = {e.key: (e.size, sorted(o)) for e, o in index.entries_with_outputs()}
+
+        assert groups == {"a" * 64: (30, [first, second]), "b" * 64: (10, [])}
+
+    def test_persists_in_wal_mode(self, tmp_path: Path) -> None:
+        db = tmp_path / "index.db"
+        index = AudioIndex(db)
+        index.record("a" * 64, _file(tmp_path, "a.mp3"))
+        index.close()
+
+        assert AudioIndex(db).get("a" * 64) is not None
+        with sqlite3.connect(db) as conn:
+            mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
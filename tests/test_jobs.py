@@ -0,0 +1,182 @@
+"""Tests for langlearn_tts.jobs."""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from langlearn_tts.jobs import Job, JobQueue, JobStatus
+
+
+def _wait_for(queue: JobQueue, job_id: str, timeout: float = 5.0) -> Job:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = queue.get(job_id)
+        if job.status.finished:
+            return job
+        time.sleep(0.01)
+    msg = f"job {job_id} did not finish"
+    raise AssertionError(msg)
+
+
+def _echo(tool: str, arguments: dict[str, Any]) -> str:
+    return f"{tool}:{arguments['n']}"
+
+
+@pytest.fixture
+def queue(tmp_path: Path) -> Iterator[JobQueue]:
+    jobs = JobQueue(tmp_path / "jobs", _echo)
+    jobs.start()
+    yield jobs
+    jobs.stop()
+
+
+class TestJobQueue:
+    def test_submit_returns_queued_job(self, tmp_path: Path) -> None:
+        jobs = JobQueue(tmp_path / "jobs", _echo)
+
+        job = jobs.submit("synthesize_batch", {"n": 1})
+
+        assert job.status == JobStatus.QUEUED
+        assert jobs.get(job.id) is job
+        assert (tmp_path / "jobs" / f"{job.id}.json").exists()
+
+    def test_runs_to_done(self, queue: JobQueue) -> None:
+        job = queue.submit("synthesize_batch", {"n": 7})
+
+        done = _wait_for(queue, job.id)
+
+        assert done.status == JobStatus.DONE
+        assert done.result == "synthesize_batch:7"
+        assert done.started_at is not None
+        assert done.finished_at is not None
+
+    def test_failure_recorded(self, tmp_path: Path) -> None:
+        def fail(tool: str, arguments: dict[str, Any]) -> str:
+            raise ValueError("Unknown voice 'nobody'")
+
+        jobs = JobQueue(tmp_path / "jobs", fail)
+        jobs.start()
+        try:
+            job = _wait_for(jobs, jobs.submit("synthesize_batch", {}).id)
+        finally:
+            jobs.stop()
+
+        assert job.status == JobStatus.FAILED
+        assert job.error == "Unknown voice 'nobody'"
+
+    def test_runs_in_submission_order(self, tmp_path: Path) -> None:
+        order: list[int] = []
+        release = threading.Event()
+
+        def record(tool: str, arguments: dict[str, Any]) -> str:
+            release.wait(timeout=5)
+            order.append(arguments["n"])
+            return ""
+
+        jobs = JobQueue(tmp_path / "jobs", record)
+        jobs.start()
+        try:
+            ids = [jobs.submit("synthesize_batch", {"n": n}).id for n in range(4)]
+            release.set()
+            for job_id in ids:
+                _wait_for(jobs, job_id)
+        finally:
+            jobs.stop()
+
+        assert order == [0, 1, 2, 3]
+
+    def test_unknown_job(self, queue: JobQueue) -> None:
+        with pytest.raises(ValueError, match="Unknown job"):
+            queue.get("nope")
+
+
+class TestJobPersistence:
+    def test_finished_job_survives_restart(self, tmp_path: Path) -> None:
+        first = JobQueue(tmp_path / "jobs", _echo)
+        first.start()
+        job_id = first.submit("synthesize_batch", {"n": 3}).id
+        _wait_for(first, job_id)
+        first.stop()
+
+        second = JobQueue(tmp_path / "jobs", _echo)
+        second.start()
+        try:
+            job = second.get(job_id)
+        finally:
+            second.stop()
+
+        assert job.status == JobStatus.DONE
+        assert job.result == "synthesize_batch:3"
+
+    def test_unfinished_jobs_resume(self, tmp_path: Path) -> None:
+        # Submitted but never started, as if the server stopped.
+        pending = JobQueue(tmp_path / "jobs", _echo)
+        job_id = pending.submit("synthesize_pair_batch", {"n": 5}).id
+
+        resumed = JobQueue(tmp_path / "jobs", _echo)
+        resumed.start()
+        try:
+            job = _wait_for(resumed, job_id)
+        finally:
+            resumed.stop()
+
+        assert job.result == "synthesize_pair_batch:5"
+
+    def test_interrupted_running_job_requeued(self, tmp_path: Path) -> None:
+        root = tmp_path / "jobs"
+        root.mkdir()
+        stale = Job(id="abc", tool="synthesize_batch", arguments={"n": 9})
+        stale.status = JobStatus.RUNNING
+        stale.started_at = time.time()
+        (root / "abc.json").write_text(
+            json.dumps(
+                {
+                    **stale.__dict__,
+                    "status": str(stale.status),
+                }
+            )
+        )
+
+        jobs = JobQueue(root, _echo)
+        jobs.start()
+        try:
+            job = _wait_for(jobs, "abc")
+        finally:
+            jobs.stop()
+
+        assert job.result == "synthesize_batch:9"
+
+    def test_expired_jobs_dropped(self, tmp_path: Path) -> None:
+        first = JobQueue(tmp_path / "jobs", _echo)
+        first.start()
+        job_id = first.submit("synthesize_batch", {"n": 1}).id
+        _wait_for(first, job_id)
+        first.stop()
+
+        second = JobQueue(tmp_path / "jobs", _echo, retention_seconds=0)
+        time.sleep(0.01)
+        second.start()
+        second.stop()
+
+        with pytest.raises(ValueError, match="Unknown job"):
+            second.get(job_id)
+        assert not (tmp_path / "jobs" / f"{job_id}.json").exists()
+
+    def test_unreadable_file_ignored(self, tmp_path: Path) -> None:
+        root = tmp_path / "jobs"
+        root.mkdir()
+        (root / "bad.json").write_text("{not json")
+
+        jobs = JobQueue(root, _echo)
+        jobs.start()
+        jobs.stop()
+
+        with pytest.raises(ValueError, match="Unknown job"):
+            jobs.get("bad")
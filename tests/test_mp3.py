@@ -0,0 +1,108 @@
+"""Tests for langlearn_tts.mp3."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydub import AudioSegment
+
+from langlearn_tts.mp3 import concat, duration_ms, stream_format
+
+
+class TestDurationMs:
+    @pytest.mark.parametrize("frame_rate", [16000, 22050, 24000, 44100])
+    @pytest.mark.parametrize("length_ms", [50, 1000, 3210])
+    def test_matches_decoded_length(
+        self, tmp_path: Path, frame_rate: int, length_ms: int
+    ) -> None:
+        path = tmp_path / "clip.mp3"
+        silence = AudioSegment.silent(duration=length_ms, frame_rate=frame_rate)
+        silence.export(path, format="mp3")  # pyright: ignore[reportUnknownMemberType]
+        assert duration_ms(path) == length_ms
+
+    def test_not_mp3(self, tmp_path: Path) -> None:
+        path = tmp_path / "clip.mp3"
+        path.write_bytes(b"not audio at all")
+        assert duration_ms(path) is None
+
+    def test_empty(self, tmp_path: Path) -> None:
+        path = tmp_path / "clip.mp3"
+        path.write_bytes(b"")
+        assert duration_ms(path) is None
+
+
+def _export(path: Path, length_ms: int, frame_rate: int = 22050, **kwargs: Any) -> Path:
+    silence = AudioSegment.silent(duration=length_ms, frame_rate=frame_rate)
+    silence.export(path, format="mp3", **kwargs)  # pyright: ignore[reportUnknownMemberType]
+    return path
+
+
+class TestConcat:
+    # One 576-sample frame at 22.05 kHz, the rounding unit for silence.
+    _FRAME_MS = 27
+
+    def test_length_matches_decoded_stitch(self, tmp_path: Path) -> None:
+        first = _export(tmp_path / "a.mp3", 500)
+        second = _export(tmp_path / "b.mp3", 300)
+        out = tmp_path / "out.mp3"
+
+        assert concat([first, second], out, pause_ms=200, trailing_ms=150)
+
+        decoded = AudioSegment.from_mp3(out)  # pyright: ignore[reportUnknownMemberType, reportUnknownVariableType]
+        decoded_ms = len(decoded)  # pyright: ignore[reportUnknownArgumentType]
+        assert abs(decoded_ms - 1150) <= 2 * self._FRAME_MS
+        measured = duration_ms(out)
+        assert measured is not None
+        assert abs(measured - 1150) <= 2 * self._FRAME_MS
+
+    def test_copies_frames_and_drops_tags(self, tmp_path: Path) -> None:
+        tagged = _export(tmp_path / "a.mp3", 300, tags={"title": "Haus"})
+        assert tagged.read_bytes().startswith(b"ID3")
+        out = tmp_path / "out.mp3"
+
+        assert concat([tagged], out)
+
+        data = out.read_bytes()
+        assert data[0] == 0xFF
+        assert b"Info" not in data
+        assert b"Xing" not in data
+        assert b"Haus" not in data
+
+    def test_mixed_sample_rates_rejected(self, tmp_path: Path) -> None:
+        first = _export(tmp_path / "a.mp3", 100, frame_rate=22050)
+        second = _export(tmp_path / "b.mp3", 100, frame_rate=24000)
+        out = tmp_path / "out.mp3"
+
+        assert not concat([first, second], out, pause_ms=200)
+        assert not out.exists()
+
+    def test_not_mp3_rejected(self, tmp_path: Path) -> None:
+        junk = tmp_path / "a.mp3"
+        junk.write_bytes(b"not audio at all")
+
+        assert not concat([junk], tmp_path / "out.mp3")
+
+    def test_missing_segment(self, tmp_path: Path) -> None:
+        with pytest.raises(FileNotFoundError):
+            concat([tmp_path / "missing.mp3"], tmp_path / "out.mp3")
+
+
+class TestStreamFormat:
+    @pytest.mark.parametrize("frame_rate", [16000, 22050, 44100])
+    def test_mono(self, tmp_path: Path, frame_rate: int) -> None:
+        path = _export(tmp_path / "a.mp3", 100, frame_rate)
+        assert stream_format(path.read_bytes()) == (frame_rate, 1)
+
+    def test_stereo(self, tmp_path: Path) -> None:
+        path = _export(tmp_path / "a.mp3", 100, 44100, parameters=["-ac", "2"])
+        assert stream_format(path.read_bytes()) == (44100, 2)
+
+    def test_with_id3_tag(self, tmp_path: Path) -> None:
+        path = _export(tmp_path / "a.mp3", 100, tags={"title": "Haus"})
+        assert stream_format(path.read_bytes()) == (22050, 1)
+
+    def test_not_mp3(self) -> None:
+        assert stream_format(b"RIFF\x00\x00\x00\x00WAVEfmt ") is None
+        assert stream_format(b"") is None
@@ -2,12 +2,17 @@
 
 from __future__ import annotations
 
+import asyncio
+import json
+from collections.abc import Callable, Coroutine
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
+import httpx
+import openai
 import pytest
 
-from langlearn_tts.providers.openai import OpenAIProvider
+from langlearn_tts.providers.openai import AsyncOpenAIProvider, OpenAIProvider
 from langlearn_tts.types import SynthesisRequest
 from punt_vox.core import (
     _split_at_words,  # pyright: ignore[reportPrivateUsage]
@@ -166,7 +171,8 @@ class TestOpenAIProviderSynthesize:
 
         openai_provider.synthesize(request, out)
 
-        call_kwargs = mock_openai_client.audio.speech.create.call_args.kwargs
+        create = mock_openai_client.audio.speech.with_streaming_response.create
+        call_kwargs = create.call_args.kwargs
         assert call_kwargs["speed"] == pytest.approx(0.9)  # pyright: ignore[reportUnknownMemberType]
 
     def test_synthesize_rate_clamped_low(
@@ -181,7 +187,8 @@ class TestOpenAIProviderSynthesize:
 
         openai_provider.synthesize(request, out)
 
-        call_kwargs = mock_openai_client.audio.speech.create.call_args.kwargs
+        create = mock_openai_client.audio.speech.with_streaming_response.create
+        call_kwargs = create.call_args.kwargs
         assert call_kwargs["speed"] == pytest.approx(0.25)  # pyright: ignore[reportUnknownMemberType]
 
     def test_synthesize_rate_clamped_high(
@@ -196,7 +203,8 @@ class TestOpenAIProviderSynthesize:
 
         openai_provider.synthesize(request, out)
 
-        call_kwargs = mock_openai_client.audio.speech.create.call_args.kwargs
+        create = mock_openai_client.audio.speech.with_streaming_response.create
+        call_kwargs = create.call_args.kwargs
         assert call_kwargs["speed"] == pytest.approx(4.0)  # pyright: ignore[reportUnknownMemberType]
 
     def test_synthesize_passes_model(
@@ -210,7 +218,8 @@ class TestOpenAIProviderSynthesize:
 
         provider.synthesize(request, out)
 
-        call_kwargs = mock_openai_client.audio.speech.create.call_args.kwargs
+        create = mock_openai_client.audio.speech.with_streaming_response.create
+        call_kwargs = create.call_args.kwargs
         assert call_kwargs["model"] == "tts-1-hd"
 
     def test_synthesize_passes_voice(
@@ -224,7 +233,8 @@ class TestOpenAIProviderSynthesize:
 
         openai_provider.synthesize(request, out)
 
-        call_kwargs = mock_openai_client.audio.speech.create.call_args.kwargs
+        create = mock_openai_client.audio.speech.with_streaming_response.create
+        call_kwargs = create.call_args.kwargs
         assert call_kwargs["voice"] == "coral"
 
     def test_synthesize_result_metadata(
@@ -257,7 +267,25 @@ class TestOpenAIProviderSynthesize:
         assert result.path == out
         assert out.exists()
         # Should have been called multiple times (chunked).
-        assert mock_openai_client.audio.speech.create.call_count > 1
+        assert (
+            mock_openai_client.audio.speech.with_streaming_response.create.call_count
+            > 1
+        )
+
+    def test_chunked_text_paces_each_api_call(
+        self,
+        mock_openai_client: MagicMock,
+        tmp_output_dir: Path,
+    ) -> None:
+        provider = OpenAIProvider(client=mock_openai_client)
+        request = SynthesisRequest(text=("Hello. " * 1000).strip(), voice="alloy")
+
+        with patch("langlearn_tts.providers.openai.limiter_for") as limiter_for:
+            provider.synthesize(request, tmp_output_dir / "chunked.mp3")
+
+        create = mock_openai_client.audio.speech.with_streaming_response.create
+        assert create.call_count > 1
+        assert limiter_for.return_value.acquire.call_count == create.call_count
 
 
 class TestOpenAIProviderDefaultModel:
@@ -389,3 +417,98 @@ class TestOpenAIProviderLanguageSupport:
         request = SynthesisRequest(text="hello", voice="nova")
         result = openai_provider.synthesize(request, tmp_output_dir / "test.mp3")
         assert result.language is None
+
+
+class TestAsyncOpenAIProvider:
+    """Runs against an in-process HTTP stand-in for the OpenAI API."""
+
+    @staticmethod
+    def _provider(
+        handler: Callable[[httpx.Request], Coroutine[None, None, httpx.Response]],
+        model: str = "tts-1",
+    ) -> AsyncOpenAIProvider:
+        client = openai.AsyncOpenAI(
+            api_key="test-key",
+            http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+        )
+        return AsyncOpenAIProvider(model=model, client=client)
+
+    def test_synthesize_posts_speech_request(self, tmp_path: Path) -> None:
+        seen: list[dict[str, object]] = []
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            assert request.url.path.endswith("/audio/speech")
+            seen.append(json.loads(request.content))
+            return httpx.Response(200, content=b"mp3-bytes")
+
+        provider = self._provider(handler, model="tts-1-hd")
+        out = tmp_path / "hallo.mp3"
+
+        result = asyncio.run(
+            provider.synthesize(
+                SynthesisRequest(text="Hallo", voice="Onyx", rate=80), out
+            )
+        )
+
+        assert out.read_bytes() == b"mp3-bytes"
+        assert result.voice == "onyx"
+        assert seen == [
+            {
+                "model": "tts-1-hd",
+                "voice": "onyx",
+                "input": "Hallo",
+                "speed": 0.8,
+                "response_format": "mp3",
+            }
+        ]
+
+    def test_many_requests_in_flight_on_one_loop(self, tmp_path: Path) -> None:
+        in_flight = 0
+        peak = 0
+        all_arrived = asyncio.Event()
+
+        async def handler(request: httpx.Request) -> httpx.Response:
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            if in_flight == 50:
+                all_arrived.set()
+            await asyncio.wait_for(all_arrived.wait(), timeout=5)
+            in_flight -= 1
+            return httpx.Response(200, content=json.loads(request.content)["input"])
+
+        provider = self._provider(handler)
+        requests = [
+            SynthesisRequest(text=f"word{i}", metadata={"output_dir": str(tmp_path)})
+            for i in range(50)
+        ]
+
+        results = asyncio.run(provider.generate_audios(requests))
+
+        assert peak == 50
+        assert [r.text for r in results] == [f"word{i}" for i in range(50)]
+        assert results[7].path.read_bytes() == b"word7"
+
+    def test_unknown_voice(self, tmp_path: Path) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            raise AssertionError("no request expected")
+
+        provider = self._provider(handler)
+
+        with pytest.raises(VoiceNotFoundError):
+            asyncio.run(
+                provider.synthesize(
+                    SynthesisRequest(text="x", voice="nobody"), tmp_path / "x.mp3"
+                )
+            )
+
+    def test_api_error_propagates(self, tmp_path: Path) -> None:
+        async def handler(request: httpx.Request) -> httpx.Response:
+            return httpx.Response(400, json={"error": {"message": "bad input"}})
+
+        provider = self._provider(handler)
+
+        with pytest.raises(openai.BadRequestError):
+            asyncio.run(
+                provider.synthesize(SynthesisRequest(text="x"), tmp_path / "x.mp3")
+            )
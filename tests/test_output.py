@@ -2,10 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import io
+import threading
+from collections.abc import AsyncIterator, Buffer
 from pathlib import Path
 from unittest.mock import patch
 
-from langlearn_tts.output import default_output_dir, expand_path, resolve_output_path
+import pytest
+
+from langlearn_tts.output import (
+    default_cache_dir,
+    default_output_dir,
+    expand_path,
+    resolve_output_path,
+    staged_output,
+    write_chunks,
+    write_chunks_async,
+)
 from langlearn_tts.types import SynthesisRequest
 
 
@@ -58,6 +72,22 @@ class TestDefaultOutputDir:
         assert result == Path.home() / "langlearn-audio"
 
 
+class TestDefaultCacheDir:
+    def test_returns_env_var_when_set(self, tmp_path: Path) -> None:
+        custom = str(tmp_path / "tts-cache")
+        with patch.dict("os.environ", {"TTS_CACHE_DIR": custom}):
+            result = default_cache_dir()
+        assert result == Path(custom)
+
+    def test_falls_back_under_output_dir(self, tmp_path: Path) -> None:
+        with patch.dict("os.environ", {"TTS_OUTPUT_DIR": str(tmp_path)}):
+            import os
+
+            os.environ.pop("TTS_CACHE_DIR", None)
+            result = default_cache_dir()
+        assert result == tmp_path / ".cache"
+
+
 class TestResolveOutputPath:
     def test_uses_explicit_output_path(self, tmp_path: Path) -> None:
         explicit = tmp_path / "explicit.mp3"
@@ -105,3 +135,75 @@ class TestResolveOutputPath:
             request = SynthesisRequest(text="hello", voice="joanna")
             result = resolve_output_path(request)
         assert result.parent == tmp_path / "audio"
+
+
+class TestStagedOutput:
+    def test_moves_into_place(self, tmp_path: Path) -> None:
+        out = tmp_path / "sub" / "a.mp3"
+
+        with staged_output(out) as staged:
+            assert staged.parent == out.parent
+            assert not out.exists()
+            staged.write_bytes(b"new")
+
+        assert out.read_bytes() == b"new"
+        assert list(out.parent.iterdir()) == [out]
+
+    def test_failure_keeps_previous_file(self, tmp_path: Path) -> None:
+        out = tmp_path / "a.mp3"
+        out.write_bytes(b"old")
+
+        with pytest.raises(RuntimeError), staged_output(out) as staged:
+            staged.write_bytes(b"partial")
+            raise RuntimeError
+
+        assert out.read_bytes() == b"old"
+        assert list(tmp_path.iterdir()) == [out]
+
+
+class TestWriteChunks:
+    def test_writes_chunks_in_order(self, tmp_path: Path) -> None:
+        out = tmp_path / "a.mp3"
+
+        write_chunks(out, iter([b"ab", b"", b"cd"]))
+
+        assert out.read_bytes() == b"abcd"
+
+
+class _RecordingFile(io.BytesIO):
+    """Remembers which threads wrote to it and its contents at close."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.writers: list[threading.Thread] = []
+        self.contents = b""
+
+    def write(self, data: Buffer, /) -> int:
+        self.writers.append(threading.current_thread())
+        return super().write(data)
+
+    def close(self) -> None:
+        self.contents = self.getvalue()
+        super().close()
+
+
+class TestWriteChunksAsync:
+    def test_writes_off_the_event_loop(self, tmp_path: Path) -> None:
+        out = tmp_path / "nested" / "a.mp3"
+        f = _RecordingFile()
+
+        async def chunks() -> AsyncIterator[bytes]:
+            for chunk in (b"ab", b"", b"cd"):
+                yield chunk
+
+        async def run() -> threading.Thread:
+            await write_chunks_async(out, chunks())
+            return threading.current_thread()
+
+        with patch.object(Path, "open", return_value=f):
+            loop_thread = asyncio.run(run())
+
+        assert f.contents == b"abcd"
+        assert f.writers
+        assert loop_thread not in f.writers
+        assert out.parent.is_dir()
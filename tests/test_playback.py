@@ -0,0 +1,77 @@
+"""Tests for langlearn_tts.playback."""
+
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import patch
+
+from langlearn_tts.playback import AudioPlayer
+from langlearn_tts.ratelimit import Priority
+
+
+class TestAudioPlayer:
+    def test_plays_in_order_without_overlap(self) -> None:
+        lock = threading.Lock()
+        spans: list[tuple[str, float, float]] = []
+
+        def fake_run(args: list[str], **kwargs: Any) -> None:
+            start = time.monotonic()
+            time.sleep(0.02)
+            with lock:
+                spans.append((args[-1], start, time.monotonic()))
+
+        player = AudioPlayer()
+        with patch("langlearn_tts.playback.subprocess.run", side_effect=fake_run):
+            for name in ("a.mp3", "b.mp3", "c.mp3"):
+                player.play(Path(name))
+            player.wait()
+
+        assert [name for name, _, _ in spans] == ["a.mp3", "b.mp3", "c.mp3"]
+        for (_, _, end), (_, start, _) in itertools.pairwise(spans):
+            assert start >= end
+
+    def test_interactive_plays_ahead_of_queued_batch(self) -> None:
+        playing = threading.Event()
+        release = threading.Event()
+        played: list[str] = []
+
+        def fake_run(args: list[str], **kwargs: Any) -> None:
+            played.append(args[-1])
+            playing.set()
+            release.wait(timeout=5)
+
+        player = AudioPlayer()
+        with patch("langlearn_tts.playback.subprocess.run", side_effect=fake_run):
+            for name in ("b1.mp3", "b2.mp3", "b3.mp3"):
+                player.play(Path(name), Priority.BATCH)
+            assert playing.wait(timeout=5)
+            player.play(Path("i1.mp3"))
+            player.play(Path("i2.mp3"), Priority.INTERACTIVE)
+            release.set()
+            player.wait()
+
+        # b1 was already playing and finishes; the interactive clips go next.
+        assert played == ["b1.mp3", "i1.mp3", "i2.mp3", "b2.mp3", "b3.mp3"]
+
+    def test_uses_command(self) -> None:
+        player = AudioPlayer(command=["play", "-q"])
+        with patch("langlearn_tts.playback.subprocess.run") as run:
+            player.play(Path("a.mp3"))
+            player.wait()
+
+        assert run.call_args.args[0] == ["play", "-q", "a.mp3"]
+
+    def test_missing_player_warns_and_continues(self) -> None:
+        player = AudioPlayer(command=["definitely-not-a-player"])
+
+        with patch("langlearn_tts.playback.logger") as logger:
+            player.play(Path("a.mp3"))
+            player.play(Path("b.mp3"))
+            player.wait()
+
+        assert logger.warning.call_count == 2
+        assert logger.warning.call_args.args[1] == "definitely-not-a-player"
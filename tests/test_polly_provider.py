@@ -2,12 +2,14 @@
 
 from __future__ import annotations
 
+import io
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from langlearn_tts.output import STREAM_CHUNK_BYTES
 from langlearn_tts.providers.polly import PollyProvider, VoiceConfig
 from langlearn_tts.types import SynthesisRequest
 from punt_vox.providers.polly import (
@@ -199,6 +201,43 @@ class TestPollyProviderSynthesize:
         assert result.text == "안녕하세요"
         assert result.voice == "Seoyeon"
 
+    def test_streams_audio_in_chunks(
+        self,
+        mock_boto_client: MagicMock,
+        polly_provider: PollyProvider,
+        tmp_output_dir: Path,
+    ) -> None:
+        audio = bytes(range(256)) * 1024
+        stream = MagicMock()
+        stream.read.side_effect = io.BytesIO(audio).read
+        mock_boto_client.synthesize_speech.side_effect = None
+        mock_boto_client.synthesize_speech.return_value = {"AudioStream": stream}
+        out = tmp_output_dir / "long.mp3"
+
+        polly_provider.synthesize(SynthesisRequest(text="lang", voice="hans"), out)
+
+        assert out.read_bytes() == audio
+        assert all(
+            call.args[0] == STREAM_CHUNK_BYTES for call in stream.read.call_args_list
+        )
+
+    def test_interrupted_stream_leaves_no_file(
+        self,
+        mock_boto_client: MagicMock,
+        polly_provider: PollyProvider,
+        tmp_output_dir: Path,
+    ) -> None:
+        stream = MagicMock()
+        stream.read.side_effect = [b"partial", ConnectionError("reset")]
+        mock_boto_client.synthesize_speech.side_effect = None
+        mock_boto_client.synthesize_speech.return_value = {"AudioStream": stream}
+        out = tmp_output_dir / "cut.mp3"
+
+        with pytest.raises(ConnectionError):
+            polly_provider.synthesize(SynthesisRequest(text="x", voice="hans"), out)
+
+        assert list(tmp_output_dir.iterdir()) == []
+
 
 class TestPollyProviderName:
     def test_name(self) -> None:
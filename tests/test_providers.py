@@ -0,0 +1,67 @@
+"""Tests for langlearn_tts.providers."""
+
+from __future__ import annotations
+
+import os
+from collections.abc import Iterator
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from langlearn_tts.providers import clear_shared_providers, shared_provider
+
+_GET = "langlearn_tts.providers.get_provider"
+
+
+@pytest.fixture(autouse=True)
+def _clear_registry() -> Iterator[None]:  # pyright: ignore[reportUnusedFunction]
+    clear_shared_providers()
+    yield
+    clear_shared_providers()
+
+
+class TestSharedProvider:
+    @patch(_GET)
+    def test_reuses_instance(self, mock_get: MagicMock) -> None:
+        mock_get.side_effect = lambda name, **kwargs: MagicMock()  # pyright: ignore[reportUnknownLambdaType]
+        assert shared_provider("polly") is shared_provider("POLLY")
+        mock_get.assert_called_once_with("polly")
+
+    @patch(_GET)
+    def test_keyed_by_name_and_kwargs(self, mock_get: MagicMock) -> None:
+        mock_get.side_effect = lambda name, **kwargs: MagicMock()  # pyright: ignore[reportUnknownLambdaType]
+        tts1 = shared_provider("openai", model="tts-1")
+        hd = shared_provider("openai", model="tts-1-hd")
+        polly = shared_provider("polly")
+        assert len({id(tts1), id(hd), id(polly)}) == 3
+        assert shared_provider("openai", model="tts-1") is tts1
+
+    @patch(_GET)
+    def test_auto_detect_uses_same_key(self, mock_get: MagicMock) -> None:
+        mock_get.side_effect = lambda name, **kwargs: MagicMock()  # pyright: ignore[reportUnknownLambdaType]
+        with patch.dict(os.environ, {"TTS_PROVIDER": "polly"}):
+            assert shared_provider() is shared_provider("polly")
+
+    @pytest.mark.parametrize(
+        "var", ["AWS_PROFILE", "OPENAI_API_KEY", "ELEVENLABS_API_KEY", "TTS_MODEL"]
+    )
+    @patch(_GET)
+    def test_env_change_invalidates(self, mock_get: MagicMock, var: str) -> None:
+        mock_get.side_effect = lambda name, **kwargs: MagicMock()  # pyright: ignore[reportUnknownLambdaType]
+        with patch.dict(os.environ, {var: "before"}):
+            before = shared_provider("polly")
+        with patch.dict(os.environ, {var: "after"}):
+            after = shared_provider("polly")
+            assert shared_provider("polly") is after
+        assert before is not after
+
+    @patch(_GET)
+    def test_unrelated_env_change_keeps_instance(self, mock_get: MagicMock) -> None:
+        mock_get.side_effect = lambda name, **kwargs: MagicMock()  # pyright: ignore[reportUnknownLambdaType]
+        first = shared_provider("polly")
+        with patch.dict(os.environ, {"TTS_OUTPUT_DIR": "/tmp/elsewhere"}):
+            assert shared_provider("polly") is first
+
+    def test_unknown_provider(self) -> None:
+        with pytest.raises(ValueError, match="Unknown provider"):
+            shared_provider("nope")
@@ -0,0 +1,315 @@
+"""Tests for langlearn_tts.ratelimit."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from concurrent.futures import CancelledError
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from langlearn_tts.concurrency import Cancellation, cancellable
+from langlearn_tts.providers.elevenlabs import ElevenLabsProvider
+from langlearn_tts.ratelimit import (
+    DEFAULT_RATE_LIMITS,
+    Priority,
+    RateLimit,
+    RateLimiter,
+    current_priority,
+    limiter_for,
+    parse_rate_limit,
+    priority,
+    rate_limits_from_env,
+)
+from langlearn_tts.types import SynthesisRequest
+
+
+class TestParseRateLimit:
+    @pytest.mark.parametrize(
+        ("spec", "rate"),
+        [("80/s", 80.0), ("120/m", 2.0), ("3600/h", 1.0), (" 5 / S ", 5.0)],
+    )
+    def test_rate_units(self, spec: str, rate: float) -> None:
+        assert parse_rate_limit(spec).rate == rate
+
+    def test_all_parts(self) -> None:
+        limit = parse_rate_limit("100/m, burst=5, concurrency=4")
+
+        assert limit == RateLimit(rate=100 / 60, burst=5, concurrency=4)
+
+    def test_concurrency_only(self) -> None:
+        assert parse_rate_limit("concurrency=3") == RateLimit(concurrency=3)
+
+    @pytest.mark.parametrize(
+        "spec", ["", "80", "80/d", "0/s", "-1/s", "burst=0", "concurrency=x", "x=1"]
+    )
+    def test_invalid(self, spec: str) -> None:
+        with pytest.raises(ValueError, match="Invalid rate limit"):
+            parse_rate_limit(spec)
+
+    def test_capacity_defaults_to_one_second_of_rate(self) -> None:
+        assert RateLimit(rate=8.0).capacity == 8
+        assert RateLimit(rate=0.5).capacity == 1
+        assert RateLimit(rate=8.0, burst=2).capacity == 2
+
+
+class TestRateLimitsFromEnv:
+    def test_defaults(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.delenv("TTS_RATE_LIMITS")
+
+        assert rate_limits_from_env() == DEFAULT_RATE_LIMITS
+
+    def test_overrides_and_model_entries(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv(
+            "TTS_RATE_LIMITS", "polly=80/s; openai:tts-1-hd=10/m;elevenlabs=none"
+        )
+
+        limits = rate_limits_from_env()
+
+        assert limits["polly"] == RateLimit(rate=80.0)
+        assert limits["openai:tts-1-hd"] == RateLimit(rate=10 / 60)
+        assert limits["openai"] == DEFAULT_RATE_LIMITS["openai"]
+        assert limits["elevenlabs"] == RateLimit()
+
+    def test_malformed_entry(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TTS_RATE_LIMITS", "polly")
+
+        with pytest.raises(ValueError, match="TTS_RATE_LIMITS"):
+            rate_limits_from_env()
+
+
+class TestRateLimiter:
+    def test_burst_then_paced(self) -> None:
+        limiter = RateLimiter(RateLimit(rate=20.0, burst=2))
+        start = time.monotonic()
+
+        for _ in range(4):
+            with limiter.acquire():
+                pass
+
+        # Two calls from the burst, then two more at 20/s.
+        assert time.monotonic() - start >= 0.09
+
+    def test_unlimited_does_not_wait(self) -> None:
+        limiter = RateLimiter(RateLimit())
+        start = time.monotonic()
+
+        for _ in range(100):
+            with limiter.acquire():
+                pass
+
+        assert time.monotonic() - start < 0.5
+
+    def test_concurrency_cap(self) -> None:
+        limiter = RateLimiter(RateLimit(concurrency=2))
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def call() -> None:
+            nonlocal active, peak
+            with limiter.acquire():
+                with lock:
+                    active += 1
+                    peak = max(peak, active)
+                time.sleep(0.02)
+                with lock:
+                    active -= 1
+
+        threads = [threading.Thread(target=call) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 2
+
+    def test_cancelled_waiter_gives_up(self) -> None:
+        limiter = RateLimiter(RateLimit(concurrency=1))
+        cancellation = Cancellation()
+        errors: list[BaseException] = []
+
+        def wait_for_slot() -> None:
+            with cancellable(cancellation):
+                try:
+                    with limiter.acquire():
+                        pass
+                except CancelledError as exc:
+                    errors.append(exc)
+
+        with limiter.acquire():
+            waiter = threading.Thread(target=wait_for_slot)
+            waiter.start()
+            time.sleep(0.02)
+            cancellation.cancel()
+            waiter.join(timeout=1)
+
+            assert not waiter.is_alive()
+        assert len(errors) == 1
+
+    def test_slot_released_on_error(self) -> None:
+        limiter = RateLimiter(RateLimit(concurrency=1))
+
+        with pytest.raises(RuntimeError), limiter.acquire():
+            raise RuntimeError
+
+        with limiter.acquire():
+            pass
+
+
+def _admitted_within(
+    limiter: RateLimiter, level: Priority, timeout: float = 0.05
+) -> bool:
+    """Whether a call at ``level`` is admitted within ``timeout`` seconds."""
+
+    async def attempt() -> None:
+        with priority(level):
+            async with limiter.acquire_async():
+                pass
+
+    async def bounded() -> bool:
+        try:
+            await asyncio.wait_for(attempt(), timeout)
+        except TimeoutError:
+            return False
+        return True
+
+    return asyncio.run(bounded())
+
+
+class TestPriority:
+    def test_default_is_interactive(self) -> None:
+        assert current_priority() == Priority.INTERACTIVE
+
+    def test_context_restored(self) -> None:
+        with priority(Priority.BATCH):
+            assert current_priority() == Priority.BATCH
+        assert current_priority() == Priority.INTERACTIVE
+
+    def test_interactive_waiter_goes_first(self) -> None:
+        limiter = RateLimiter(RateLimit(concurrency=1))
+        order: list[str] = []
+        holding = limiter.acquire()
+        holding.__enter__()
+
+        def call(name: str, level: Priority) -> None:
+            with priority(level), limiter.acquire():
+                order.append(name)
+
+        batch = threading.Thread(target=call, args=("batch", Priority.BATCH))
+        batch.start()
+        time.sleep(0.05)
+        interactive = threading.Thread(
+            target=call, args=("interactive", Priority.INTERACTIVE)
+        )
+        interactive.start()
+        time.sleep(0.05)
+        holding.__exit__(None, None, None)
+        batch.join(5)
+        interactive.join(5)
+
+        assert order == ["interactive", "batch"]
+
+    def test_slot_kept_for_interactive(self) -> None:
+        limiter = RateLimiter(RateLimit(concurrency=4))
+        held = [limiter.acquire() for _ in range(3)]
+        with priority(Priority.BATCH):
+            for slot in held:
+                slot.__enter__()
+
+        try:
+            assert not _admitted_within(limiter, Priority.BATCH)
+            assert _admitted_within(limiter, Priority.INTERACTIVE)
+        finally:
+            for slot in held:
+                slot.__exit__(None, None, None)
+
+    def test_tokens_kept_for_interactive(self) -> None:
+        limiter = RateLimiter(RateLimit(rate=0.001, burst=3))
+
+        assert _admitted_within(limiter, Priority.BATCH)
+        assert not _admitted_within(limiter, Priority.BATCH)
+        # Both halves of a pair still start at once.
+        assert _admitted_within(limiter, Priority.INTERACTIVE)
+        assert _admitted_within(limiter, Priority.INTERACTIVE)
+
+    def test_single_slot_shared(self) -> None:
+        limiter = RateLimiter(RateLimit(concurrency=1))
+
+        assert _admitted_within(limiter, Priority.BATCH)
+        assert _admitted_within(limiter, Priority.INTERACTIVE)
+
+
+class TestLimiterFor:
+    def test_shared_per_provider(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TTS_RATE_LIMITS", "polly=80/s")
+
+        assert limiter_for("polly") is limiter_for("polly")
+        assert limiter_for("polly").limit == RateLimit(rate=80.0)
+
+    def test_model_entry_wins(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TTS_RATE_LIMITS", "openai=100/m; openai:tts-1-hd=10/m")
+
+        hd = limiter_for("openai", "tts-1-hd")
+        standard = limiter_for("openai", "tts-1")
+
+        assert hd.limit == RateLimit(rate=10 / 60)
+        assert standard.limit == RateLimit(rate=100 / 60)
+        assert hd is not standard
+
+    def test_replaced_when_env_changes(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setenv("TTS_RATE_LIMITS", "polly=80/s")
+        before = limiter_for("polly")
+        monkeypatch.setenv("TTS_RATE_LIMITS", "polly=10/s")
+
+        after = limiter_for("polly")
+
+        assert after is not before
+        assert after.limit == RateLimit(rate=10.0)
+
+
+class TestProvidersUseLimiter:
+    def test_elevenlabs_concurrency_capped(
+        self,
+        mock_elevenlabs_client: MagicMock,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        monkeypatch.setenv("TTS_RATE_LIMITS", "elevenlabs=concurrency=1")
+        provider = ElevenLabsProvider(client=mock_elevenlabs_client)
+        respond = mock_elevenlabs_client.text_to_speech.stream.side_effect
+        lock = threading.Lock()
+        active = 0
+        peak = 0
+
+        def track(**kwargs: object) -> list[bytes]:
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return respond(**kwargs)  # type: ignore[no-any-return]
+
+        mock_elevenlabs_client.text_to_speech.stream.side_effect = track
+        threads = [
+            threading.Thread(
+                target=provider.synthesize,
+                args=(
+                    SynthesisRequest(text=f"t{i}", voice="matilda"),
+                    tmp_path / f"{i}.mp3",
+                ),
+            )
+            for i in range(3)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert peak == 1
+        assert mock_elevenlabs_client.text_to_speech.stream.call_count == 3
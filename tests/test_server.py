@@ -0,0 +1,463 @@
+"""Tests for langlearn_tts.server."""
+
+from __future__ import annotations
+
+import ast
+import asyncio
+import inspect
+import threading
+import time
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any, cast
+from unittest.mock import MagicMock, patch
+
+import anyio
+import pytest
+
+from langlearn_tts import server
+from langlearn_tts.providers.polly import PollyProvider
+from langlearn_tts.ratelimit import Priority, current_priority
+
+_TOOLS = [
+    "synthesize",
+    "synthesize_batch",
+    "synthesize_pair",
+    "synthesize_pair_batch",
+    "submit_batch",
+    "job_status",
+    "job_result",
+]
+
+
+def _parse(raw: str) -> Any:
+    """Tools return ``str()`` of a dict or list; read it back."""
+    return ast.literal_eval(raw)
+
+
+@pytest.fixture
+def server_env(
+    polly_provider: PollyProvider,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> Iterator[Path]:
+    """Point the server at a mocked Polly provider and temp directories."""
+    output_dir = tmp_path / "output"
+    monkeypatch.setenv("TTS_OUTPUT_DIR", str(output_dir))
+    monkeypatch.setenv("TTS_CACHE_DIR", str(tmp_path / "cache"))
+    server._synthesis_cache.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    server._job_queue.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    server._request_gate.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    with patch.object(server, "shared_provider", return_value=polly_provider):
+        yield output_dir
+        server._job_queue().stop()  # pyright: ignore[reportPrivateUsage]
+    server._job_queue.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    server._request_gate.cache_clear()  # pyright: ignore[reportPrivateUsage]
+    server._synthesis_cache.cache_clear()  # pyright: ignore[reportPrivateUsage]
+
+
+@pytest.fixture
+def blocked_provider(mock_boto_client: MagicMock) -> Iterator[threading.Event]:
+    """Hold every provider call until the returned event is set."""
+    release = threading.Event()
+    respond = mock_boto_client.synthesize_speech.side_effect
+
+    def wait_then_respond(**kwargs: Any) -> Any:
+        release.wait(timeout=5)
+        return respond(**kwargs)
+
+    mock_boto_client.synthesize_speech.side_effect = wait_then_respond
+    yield release
+    release.set()
+
+
+class TestAsyncTools:
+    @pytest.mark.parametrize("name", _TOOLS)
+    def test_tools_are_coroutines(self, name: str) -> None:
+        assert inspect.iscoroutinefunction(getattr(server, name))
+
+    @pytest.mark.parametrize("name", _TOOLS)
+    def test_registered_as_async_with_schema(self, name: str) -> None:
+        tool = server.mcp._tool_manager.get_tool(name)  # pyright: ignore[reportPrivateUsage]
+
+        assert tool is not None
+        assert tool.is_async
+        assert tool.parameters["properties"]
+
+    @pytest.mark.usefixtures("server_env")
+    def test_synthesize_returns_result(self) -> None:
+        raw = asyncio.run(server.synthesize("Haus", voice="hans", auto_play=False))
+
+        result = _parse(raw)
+        assert result["text"] == "Haus"
+        assert Path(result["path"]).exists()
+
+    def test_calls_overlap_on_event_loop(
+        self, server_env: Path, mock_boto_client: MagicMock
+    ) -> None:
+        # Each provider call waits until the other is in flight, which
+        # only happens if neither tool call blocks the event loop.
+        barrier = threading.Barrier(2, timeout=5)
+        respond = mock_boto_client.synthesize_speech.side_effect
+
+        def wait_then_respond(**kwargs: Any) -> Any:
+            barrier.wait()
+            return respond(**kwargs)
+
+        mock_boto_client.synthesize_speech.side_effect = wait_then_respond
+
+        async def both() -> tuple[str, str]:
+            return cast(
+                "tuple[str, str]",
+                await asyncio.gather(
+                    server.synthesize("Haus", voice="hans", auto_play=False),
+                    server.synthesize_batch(["Maus"], voice="hans", auto_play=False),
+                ),
+            )
+
+        single, batch = asyncio.run(both())
+
+        assert _parse(single)["text"] == "Haus"
+        assert _parse(batch)[0]["text"] == "Maus"
+        assert len(list(server_env.iterdir())) == 2
+
+    @pytest.mark.usefixtures("server_env")
+    @pytest.mark.parametrize(
+        ("tool", "args", "level"),
+        [
+            ("synthesize", ("Haus",), Priority.INTERACTIVE),
+            ("synthesize_pair", ("house", "Haus"), Priority.INTERACTIVE),
+            ("synthesize_batch", (["Haus", "Maus"],), Priority.BATCH),
+            ("synthesize_pair_batch", ([["house", "Haus"]],), Priority.BATCH),
+        ],
+    )
+    def test_provider_call_priority(
+        self,
+        mock_boto_client: MagicMock,
+        tool: str,
+        args: tuple[Any, ...],
+        level: Priority,
+    ) -> None:
+        seen: list[Priority] = []
+        respond = mock_boto_client.synthesize_speech.side_effect
+
+        def record_then_respond(**kwargs: Any) -> Any:
+            seen.append(current_priority())
+            return respond(**kwargs)
+
+        mock_boto_client.synthesize_speech.side_effect = record_then_respond
+
+        asyncio.run(getattr(server, tool)(*args, auto_play=False))
+
+        assert seen
+        assert set(seen) == {level}
+
+
+@pytest.mark.usefixtures("server_env")
+class TestAutoPlay:
+    def test_batch_plays_each_item_once_ready(
+        self, mock_boto_client: MagicMock, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TTS_JOBS", "1")
+        events: list[str] = []
+        respond = mock_boto_client.synthesize_speech.side_effect
+
+        def record_then_respond(**kwargs: Any) -> Any:
+            events.append("synthesize")
+            return respond(**kwargs)
+
+        mock_boto_client.synthesize_speech.side_effect = record_then_respond
+
+        def record_play(path: Path, level: Priority) -> None:
+            events.append("play")
+
+        with patch.object(server, "_play_audio", side_effect=record_play) as play:
+            raw = asyncio.run(
+                server.synthesize_batch(["eins", "zwei", "drei"], voice="hans")
+            )
+
+        assert events == ["synthesize", "play"] * 3
+        paths = [Path(r["path"]) for r in _parse(raw)]
+        assert [call.args[0] for call in play.call_args_list] == paths
+
+    def test_pair_batch_plays_in_input_order(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TTS_JOBS", "4")
+        pairs = [[f"en{i}", f"de{i}"] for i in range(6)]
+
+        with patch.object(server, "_play_audio") as play:
+            raw = asyncio.run(server.synthesize_pair_batch(pairs, voice2="hans"))
+
+        paths = [Path(r["path"]) for r in _parse(raw)]
+        assert [call.args[0] for call in play.call_args_list] == paths
+
+    def test_play_audio_queues_on_shared_player(self) -> None:
+        with patch.object(server, "_audio_player") as player:
+            server._play_audio(Path("a.mp3"))  # pyright: ignore[reportPrivateUsage]
+
+        player.return_value.play.assert_called_once_with(
+            Path("a.mp3"), Priority.INTERACTIVE
+        )
+
+    def test_interactive_tools_play_ahead_of_batches(self) -> None:
+        with patch.object(server, "_audio_player") as player:
+            asyncio.run(server.synthesize_batch(["eins", "zwei"], voice="hans"))
+            asyncio.run(server.synthesize_pair_batch([["one", "eins"]], voice2="hans"))
+            asyncio.run(server.synthesize("Haus", voice="hans"))
+            asyncio.run(server.synthesize_pair("house", "Haus", voice2="hans"))
+
+        levels = [call.args[1] for call in player.return_value.play.call_args_list]
+        assert levels == [Priority.BATCH] * 3 + [Priority.INTERACTIVE] * 2
+
+
+class _RecordingContext:
+    """Stands in for FastMCP's Context, recording progress notifications."""
+
+    def __init__(self) -> None:
+        self.progress: list[tuple[float, float | None, str | None]] = []
+
+    async def report_progress(
+        self, progress: float, total: float | None = None, message: str | None = None
+    ) -> None:
+        self.progress.append((progress, total, message))
+
+
+@pytest.mark.usefixtures("server_env")
+class TestProgress:
+    @pytest.mark.parametrize(
+        ("tool", "args"),
+        [
+            ("synthesize_batch", (["eins", "zwei", "drei"],)),
+            (
+                "synthesize_pair_batch",
+                ([["one", "eins"], ["two", "zwei"], ["x", "y"]],),
+            ),
+        ],
+    )
+    @pytest.mark.parametrize("merge", [False, True])
+    def test_batch_reports_each_item(
+        self, tool: str, args: tuple[Any, ...], merge: bool
+    ) -> None:
+        ctx = _RecordingContext()
+
+        async def run() -> None:
+            await getattr(server, tool)(*args, merge=merge, auto_play=False, ctx=ctx)
+            # Let notifications scheduled from the worker thread run.
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+
+        assert [(done, total) for done, total, _ in ctx.progress] == [
+            (1, 3),
+            (2, 3),
+            (3, 3),
+        ]
+        last = ctx.progress[-1][2]
+        assert last is not None
+        assert last.startswith("3/3 done, 0 from cache; last: ")
+
+    def test_repeat_reports_cache_hits(self) -> None:
+        ctx = _RecordingContext()
+
+        async def run() -> None:
+            await server.synthesize_batch(["eins"], voice="hans", auto_play=False)
+            await server.synthesize_batch(
+                ["eins", "zwei"], voice="hans", auto_play=False, ctx=ctx
+            )
+            await asyncio.sleep(0.05)
+
+        asyncio.run(run())
+
+        assert ctx.progress[-1][2] is not None
+        assert ctx.progress[-1][2].startswith("2/2 done, 1 from cache")
+
+    def test_background_jobs_report_nothing(self) -> None:
+        assert server._progress_reporter(None) is None  # pyright: ignore[reportPrivateUsage]
+
+
+def _call(tool: Any, *args: Any, **kwargs: Any) -> Any:
+    return _parse(cast("str", asyncio.run(tool(*args, **kwargs))))
+
+
+def _wait_done(job_id: str) -> dict[str, Any]:
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        status = _call(server.job_status, job_id)
+        if status["status"] in ("done", "failed"):
+            return cast("dict[str, Any]", status)
+        time.sleep(0.02)
+    raise AssertionError(job_id)
+
+
+@pytest.mark.usefixtures("server_env")
+class TestBatchJobs:
+    def test_submit_poll_and_fetch(self) -> None:
+        submitted = _call(
+            server.submit_batch,
+            "synthesize_pair_batch",
+            {"pairs": [["strong", "stark"], ["house", "Haus"]], "voice2": "hans"},
+        )
+
+        # The worker may pick the job up before the summary is built.
+        assert submitted["status"] in ("queued", "running")
+        assert _wait_done(submitted["job_id"])["status"] == "done"
+        results = _call(server.job_result, submitted["job_id"])
+        assert [r["text"] for r in results] == ["strong | stark", "house | Haus"]
+        assert all(Path(r["path"]).exists() for r in results)
+
+    def test_never_plays_audio(self) -> None:
+        with patch.object(server, "_play_audio") as play:
+            job = _call(
+                server.submit_batch,
+                "synthesize_batch",
+                {"texts": ["Haus"], "voice": "hans", "auto_play": True},
+            )
+            _wait_done(job["job_id"])
+
+        play.assert_not_called()
+
+    def test_failed_job_reports_error(self) -> None:
+        job = _call(
+            server.submit_batch,
+            "synthesize_batch",
+            {"texts": ["x"], "stability": 5.0},
+        )
+
+        status = _wait_done(job["job_id"])
+
+        assert status["status"] == "failed"
+        assert "stability" in status["error"]
+        with pytest.raises(ValueError, match="failed"):
+            _call(server.job_result, job["job_id"])
+
+    def test_unknown_tool_rejected(self) -> None:
+        with pytest.raises(ValueError, match="Unknown batch tool"):
+            _call(server.submit_batch, "synthesize", {"text": "x"})
+
+    def test_bad_arguments_rejected(self) -> None:
+        with pytest.raises(ValueError, match="Invalid arguments"):
+            _call(server.submit_batch, "synthesize_batch", {"words": ["x"]})
+
+    def test_result_before_done(self, mock_boto_client: MagicMock) -> None:
+        release = threading.Event()
+        respond = mock_boto_client.synthesize_speech.side_effect
+
+        def wait_then_respond(**kwargs: Any) -> Any:
+            release.wait(timeout=5)
+            return respond(**kwargs)
+
+        mock_boto_client.synthesize_speech.side_effect = wait_then_respond
+        job = _call(server.submit_batch, "synthesize_batch", {"texts": ["x"]})
+        try:
+            with pytest.raises(ValueError, match="still"):
+                _call(server.job_result, job["job_id"])
+        finally:
+            release.set()
+        _wait_done(job["job_id"])
+
+    def test_unknown_job(self) -> None:
+        with pytest.raises(ValueError, match="Unknown job"):
+            _call(server.job_status, "nope")
+
+
+@pytest.mark.usefixtures("server_env")
+class TestCancellation:
+    def test_cancelled_batch_stops_remaining_items(
+        self, blocked_provider: threading.Event, mock_boto_client: MagicMock
+    ) -> None:
+        async def cancel_midway() -> None:
+            task = asyncio.ensure_future(
+                server.synthesize_batch(
+                    [f"Wort {i}" for i in range(10)], voice="hans", auto_play=False
+                )
+            )
+            await asyncio.sleep(0.1)
+            task.cancel()
+            await asyncio.sleep(0)  # the tool flags its worker to stop
+            blocked_provider.set()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_midway())
+
+        assert mock_boto_client.synthesize_speech.call_count == 1
+
+    def test_cancelled_call_holds_its_slot_until_the_thread_returns(
+        self, blocked_provider: threading.Event, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TTS_MAX_REQUESTS", "1")
+        monkeypatch.setenv("TTS_MAX_QUEUED", "0")
+        server._request_gate.cache_clear()  # pyright: ignore[reportPrivateUsage]
+
+        async def cancel_then_retry() -> None:
+            first = asyncio.ensure_future(
+                server.synthesize("Haus", voice="hans", auto_play=False)
+            )
+            await asyncio.sleep(0.05)
+            first.cancel()
+            await asyncio.sleep(0.05)
+            # Its thread is still blocked in the provider call.
+            assert not first.done()
+            with pytest.raises(RuntimeError, match="Server busy"):
+                await server.synthesize("Maus", voice="hans", auto_play=False)
+            blocked_provider.set()
+            with pytest.raises(asyncio.CancelledError):
+                await first
+            await server.synthesize("Maus", voice="hans", auto_play=False)
+
+        asyncio.run(cancel_then_retry())
+
+    def test_cancel_scope_waits_for_the_thread_without_spinning(
+        self, blocked_provider: threading.Event
+    ) -> None:
+        # MCP cancels requests through an anyio CancelScope, which keeps
+        # re-cancelling the task until it finishes.
+        async def cancel_in_scope() -> bool:
+            with anyio.move_on_after(0.05) as scope:
+                await server.synthesize("Haus", voice="hans", auto_play=False)
+            assert scope.cancelled_caught
+            return blocked_provider.is_set()
+
+        release = threading.Timer(0.3, blocked_provider.set)
+        release.start()
+        with patch("langlearn_tts.server.asyncio.wait", wraps=asyncio.wait) as wait:
+            released = anyio.run(cancel_in_scope)
+        release.join()
+
+        assert released  # returned only once the provider call could finish
+        assert wait.call_count == 1
+
+    def test_busy_server_rejects_with_clear_error(
+        self, blocked_provider: threading.Event, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setenv("TTS_MAX_REQUESTS", "1")
+        monkeypatch.setenv("TTS_MAX_QUEUED", "0")
+        server._request_gate.cache_clear()  # pyright: ignore[reportPrivateUsage]
+
+        async def overload() -> str:
+            first = asyncio.ensure_future(
+                server.synthesize("Haus", voice="hans", auto_play=False)
+            )
+            await asyncio.sleep(0.05)
+            with pytest.raises(RuntimeError, match="Server busy"):
+                await server.synthesize("Maus", voice="hans", auto_play=False)
+            # Job polling is not gated.
+            with pytest.raises(ValueError, match="Unknown job"):
+                await server.job_status("nope")
+            blocked_provider.set()
+            return cast("str", await first)
+
+        assert _parse(asyncio.run(overload()))["text"] == "Haus"
+
+    @pytest.mark.parametrize(
+        ("name", "raw"), [("TTS_MAX_REQUESTS", "0"), ("TTS_MAX_QUEUED", "x")]
+    )
+    def test_invalid_limits(
+        self, monkeypatch: pytest.MonkeyPatch, name: str, raw: str
+    ) -> None:
+        monkeypatch.setenv(name, raw)
+        server._request_gate.cache_clear()  # pyright: ignore[reportPrivateUsage]
+
+        with pytest.raises(ValueError, match=name):
+            asyncio.run(server.synthesize("Haus", voice="hans", auto_play=False))
@@ -0,0 +1,283 @@
+"""Tests for langlearn_tts.voices."""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import punt_vox.providers.elevenlabs as elevenlabs
+import punt_vox.providers.polly as polly
+from langlearn_tts.providers import get_provider
+from langlearn_tts.providers.elevenlabs import ElevenLabsProvider
+from langlearn_tts.providers.openai import OpenAIProvider
+from langlearn_tts.providers.polly import PollyProvider, VoiceConfig
+from langlearn_tts.voices import VoiceCatalog, wait_for_refreshes, warm_voice_catalog
+
+
+def _cold_start(module: object) -> None:
+    """Simulate a fresh process: empty catalog, nothing fetched yet."""
+    vars(module)["VOICES"].clear()
+    vars(module)["_voices_loaded"] = False
+
+
+class TestVoiceCatalog:
+    def test_polly_snapshot_round_trip(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        catalog = VoiceCatalog(polly_provider, tmp_path / "polly.json")
+        catalog.save()
+        _cold_start(polly)
+
+        assert catalog.load() is not None
+        assert polly_provider.resolve_voice("hans", "de") == "Hans"
+        assert polly.VOICES["hans"] == VoiceConfig(
+            voice_id="Hans", language_code="de-DE", engine="standard"
+        )
+        mock_boto_client.describe_voices.assert_not_called()
+
+    def test_elevenlabs_snapshot_round_trip(
+        self,
+        elevenlabs_provider: ElevenLabsProvider,
+        mock_elevenlabs_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        catalog = VoiceCatalog(elevenlabs_provider, tmp_path / "elevenlabs.json")
+        catalog.save()
+        _cold_start(elevenlabs)
+
+        catalog.load()
+
+        assert elevenlabs_provider.resolve_voice("Drew") == "drew"
+        mock_elevenlabs_client.voices.get_all.assert_not_called()
+
+    def test_load_keeps_existing_entries(
+        self, polly_provider: PollyProvider, tmp_path: Path
+    ) -> None:
+        catalog = VoiceCatalog(polly_provider, tmp_path / "polly.json")
+        catalog.save()
+        alias = VoiceConfig(voice_id="Vicki", language_code="de-DE", engine="neural")
+        polly.VOICES["hans"] = alias
+
+        catalog.load()
+
+        assert polly.VOICES["hans"] is alias
+
+    def test_unknown_voice_still_falls_back_to_api(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        catalog = VoiceCatalog(polly_provider, tmp_path / "polly.json")
+        catalog.save()
+        _cold_start(polly)
+        catalog.load()
+        mock_boto_client.describe_voices.return_value = {
+            "Voices": [
+                {
+                    "Id": "Daniel",
+                    "LanguageCode": "de-DE",
+                    "SupportedEngines": ["neural"],
+                }
+            ]
+        }
+
+        assert polly_provider.resolve_voice("daniel") == "Daniel"
+        mock_boto_client.describe_voices.assert_called_once()
+
+    @pytest.mark.parametrize(
+        "content", ["not json", "[]", '{"version": 99}', '{"version": 1}']
+    )
+    def test_unusable_snapshot_is_ignored(
+        self, polly_provider: PollyProvider, tmp_path: Path, content: str
+    ) -> None:
+        path = tmp_path / "polly.json"
+        path.write_text(content)
+        assert VoiceCatalog(polly_provider, path).load() is None
+
+    def test_missing_snapshot(
+        self, polly_provider: PollyProvider, tmp_path: Path
+    ) -> None:
+        assert VoiceCatalog(polly_provider, tmp_path / "polly.json").load() is None
+
+    def test_refresh_fetches_and_saves(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_boto_client.describe_voices.return_value = {
+            "Voices": [
+                {
+                    "Id": "Daniel",
+                    "LanguageCode": "de-DE",
+                    "SupportedEngines": ["neural"],
+                }
+            ]
+        }
+        path = tmp_path / "polly.json"
+
+        VoiceCatalog(polly_provider, path).refresh()
+
+        saved = json.loads(path.read_text())
+        assert saved["voices"]["daniel"]["voice_id"] == "Daniel"
+        assert "hans" in saved["voices"]
+
+    def test_lookups_during_refresh_see_the_loaded_catalog(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        seen: list[object] = []
+
+        def describe_voices(**kwargs: Any) -> dict[str, Any]:
+            # A worker resolving a known voice mid-refresh: no reload.
+            seen.append(polly_provider.resolve_voice("hans", "de"))
+            seen.append(polly._voices_loaded)  # pyright: ignore[reportPrivateUsage]
+            return {
+                "Voices": [
+                    {
+                        "Id": "Daniel",
+                        "LanguageCode": "de-DE",
+                        "SupportedEngines": ["neural"],
+                    }
+                ]
+            }
+
+        mock_boto_client.describe_voices.side_effect = describe_voices
+
+        VoiceCatalog(polly_provider, tmp_path / "polly.json").refresh()
+
+        assert seen == ["Hans", True]
+        mock_boto_client.describe_voices.assert_called_once()
+        assert polly.VOICES["daniel"].voice_id == "Daniel"
+        assert polly._voices_loaded  # pyright: ignore[reportPrivateUsage]
+
+    def test_refresh_keeps_existing_entries(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        alias = VoiceConfig(voice_id="Vicki", language_code="de-DE", engine="neural")
+        polly.VOICES["hans"] = alias
+        mock_boto_client.describe_voices.return_value = {
+            "Voices": [
+                {
+                    "Id": "Hans",
+                    "LanguageCode": "de-DE",
+                    "SupportedEngines": ["standard"],
+                }
+            ]
+        }
+
+        VoiceCatalog(polly_provider, tmp_path / "polly.json").refresh()
+
+        assert polly.VOICES["hans"] is alias
+
+    def test_openai_has_no_catalog(
+        self, openai_provider: OpenAIProvider, tmp_path: Path
+    ) -> None:
+        with pytest.raises(ValueError, match="no voice catalog"):
+            VoiceCatalog(openai_provider, tmp_path / "openai.json")
+
+
+class TestWarm:
+    def test_fresh_snapshot_skips_refresh(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        catalog = VoiceCatalog(polly_provider, tmp_path / "polly.json")
+        catalog.save()
+
+        assert catalog.warm() is None
+        mock_boto_client.describe_voices.assert_not_called()
+
+    def test_stale_snapshot_refreshes_in_background(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_boto_client.describe_voices.return_value = {"Voices": []}
+        path = tmp_path / "polly.json"
+        catalog = VoiceCatalog(polly_provider, path, ttl_seconds=60)
+        catalog.save()
+        stale = time.time() - 3600
+        payload = json.loads(path.read_text())
+        payload["fetched_at"] = stale
+        path.write_text(json.dumps(payload))
+
+        thread = catalog.warm()
+        assert thread is not None
+        thread.join(timeout=5)
+
+        mock_boto_client.describe_voices.assert_called_once()
+        assert json.loads(path.read_text())["fetched_at"] > stale
+
+    def test_failed_refresh_is_quiet(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        mock_boto_client.describe_voices.side_effect = RuntimeError("no credentials")
+        path = tmp_path / "polly.json"
+
+        thread = VoiceCatalog(polly_provider, path).warm()
+        assert thread is not None
+        thread.join(timeout=5)
+
+        assert not path.exists()
+
+    def test_wait_for_refreshes_joins_background_refresh(
+        self,
+        polly_provider: PollyProvider,
+        mock_boto_client: MagicMock,
+        tmp_path: Path,
+    ) -> None:
+        def slow_describe(**kwargs: Any) -> dict[str, Any]:
+            time.sleep(0.1)
+            return {"Voices": []}
+
+        mock_boto_client.describe_voices.side_effect = slow_describe
+        path = tmp_path / "polly.json"
+
+        thread = VoiceCatalog(polly_provider, path).warm()
+        wait_for_refreshes(timeout=5)
+
+        assert thread is not None
+        assert not thread.is_alive()
+        assert path.exists()
+
+    def test_warm_skips_openai(self, openai_provider: OpenAIProvider) -> None:
+        assert warm_voice_catalog(openai_provider) is None
+
+    def test_get_provider_seeds_from_snapshot(
+        self, polly_provider: PollyProvider, tmp_path: Path
+    ) -> None:
+        VoiceCatalog(polly_provider, tmp_path / "voices" / "polly.json").save()
+        _cold_start(polly)
+
+        with (
+            patch.dict(os.environ, {"TTS_CACHE_DIR": str(tmp_path)}),
+            patch(
+                "langlearn_tts.providers.polly.PollyProvider.__init__",
+                return_value=None,
+            ),
+        ):
+            get_provider("polly")
+
+        assert "hans" in polly.VOICES